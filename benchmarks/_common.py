@@ -0,0 +1,29 @@
+"""Shared helpers for the NL-Alert benchmark scripts."""
+from __future__ import annotations
+
+import importlib
+import importlib.util
+import sys
+from pathlib import Path
+from typing import Any
+
+COMPONENT_DIR = Path(__file__).resolve().parent.parent / "custom_components" / "nl_alert"
+
+# The NumPy paths interpolate sigma in _dispersion_tables, the scalar reference
+# uses the closed form; check_dispersion_tables asserts the table error stays
+# below this, so comparisons between the two paths use it as tolerance
+TABLE_RTOL = 1e-3
+
+
+def load_module(name: str) -> Any:
+    """Import a module of the integration without running its __init__.
+
+    The package __init__ imports Home Assistant, which the pure computation
+    modules do not need, so an empty package is registered in its place.
+    """
+    if "nl_alert" not in sys.modules:
+        spec = importlib.util.spec_from_loader("nl_alert", loader=None, is_package=True)
+        package = importlib.util.module_from_spec(spec)
+        package.__path__ = [str(COMPONENT_DIR)]
+        sys.modules["nl_alert"] = package
+    return importlib.import_module(f"nl_alert.{name}")
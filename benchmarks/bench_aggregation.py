@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark the per-refresh alert aggregation.
+
+The legacy path is reproduced as it ran before the single-pass engine: the
+coordinator called get_severity_counts() three times plus has_severe_alerts(),
+and every call re-filtered the raw alert dicts by parsing each "expires"
+timestamp. The new path builds Alert records once and calls
+summarize_alerts() a single time (without a classifier, since the legacy
+path did not count hazard categories).
+"""
+from __future__ import annotations
+
+import time
+from datetime import datetime, timedelta, timezone
+
+from _common import load_module
+
+SIZES = [10, 100, 1_000, 10_000]
+SEVERITIES = ["Minor", "Moderate", "Severe", "Extreme"]
+
+
+def make_alerts(count: int) -> list[dict]:
+    """Create raw CAP alert dicts, a quarter of them already expired."""
+    now = datetime.now(timezone.utc)
+    alerts = []
+    for i in range(count):
+        expires = now + timedelta(hours=1) if i % 4 else now - timedelta(hours=1)
+        alerts.append({
+            "identifier": f"NL-ALERT-{i:06d}",
+            "expires": expires.isoformat(),
+            "info": [{
+                "severity": SEVERITIES[i % 4],
+                "headline": "Brand met rookontwikkeling" if i % 3 == 0 else "Wateroverlast",
+                "description": "Sluit ramen en deuren.",
+            }],
+        })
+    return alerts
+
+
+def legacy_active(alerts: list[dict], now: datetime) -> list[dict]:
+    """Return active alerts the way get_active_alerts() used to."""
+    active = []
+    for alert in alerts:
+        expires = alert.get("expires")
+        if expires:
+            if datetime.fromisoformat(expires.replace("Z", "+00:00")) > now:
+                active.append(alert)
+        else:
+            active.append(alert)
+    return active
+
+
+def legacy_severity_counts(alerts: list[dict], now: datetime) -> dict[str, int]:
+    """Return severity counts the way get_severity_counts() used to."""
+    counts = {severity: 0 for severity in SEVERITIES}
+    for alert in legacy_active(alerts, now):
+        info = alert["info"][0] if isinstance(alert.get("info"), list) else alert.get("info", {})
+        severity = info.get("severity", "Unknown")
+        if severity in counts:
+            counts[severity] += 1
+    return counts
+
+
+def legacy_refresh(alerts: list[dict]) -> None:
+    """One refresh worth of legacy aggregation calls."""
+    now = datetime.now(timezone.utc)
+    legacy_active(alerts, now)
+    legacy_severity_counts(alerts, now)
+    legacy_severity_counts(alerts, now).get("Severe", 0) + legacy_severity_counts(alerts, now).get("Extreme", 0)
+    counts = legacy_severity_counts(alerts, now)
+    counts["Severe"] > 0 or counts["Extreme"] > 0
+
+
+def best_of(func, repeat: int = 7) -> float:
+    """Return the fastest of repeat runs in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main() -> None:
+    models = load_module("models")
+    aggregation = load_module("aggregation")
+
+    print(f"{'alerts':>8} | {'legacy ms':>10} | {'single-pass ms':>14} | {'speed-up':>8}")
+    for size in SIZES:
+        raw = make_alerts(size)
+        records = [models.Alert.from_dict(alert) for alert in raw]
+        legacy_ms = best_of(lambda: legacy_refresh(raw))
+        single_ms = best_of(
+            lambda: aggregation.summarize_alerts(records, datetime.now(timezone.utc))
+        )
+        print(f"{size:>8} | {legacy_ms:>10.3f} | {single_ms:>14.3f} | {legacy_ms / single_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark batch risk evaluation against the scalar risk function.
+
+Evaluates risk for a set of receptor sites against a set of incidents with
+calculate_risk_matrix() and with calculate_risk_percentage() once per pair,
+checks that both agree and reports the speed-up. Also times the
+superposition of many simultaneous incidents at a single home location.
+"""
+from __future__ import annotations
+
+import random
+import time
+
+import numpy as np
+
+from _common import TABLE_RTOL, load_module
+
+RECEPTORS = 50
+INCIDENTS = 20
+SUPERPOSED_INCIDENTS = 50
+
+
+def random_points(count: int, rng: random.Random) -> tuple[list[float], list[float]]:
+    """Return random coordinates around the Randstad."""
+    lats = [rng.uniform(51.8, 52.6) for _ in range(count)]
+    lons = [rng.uniform(4.2, 5.3) for _ in range(count)]
+    return lats, lons
+
+
+def main() -> None:
+    atmospheric_model = load_module("_atmospheric_model")
+    batch_risk = load_module("_batch_risk")
+    rng = random.Random(7)
+
+    receptor_lats, receptor_lons = random_points(RECEPTORS, rng)
+    incident_lats, incident_lons = random_points(INCIDENTS, rng)
+    wind_directions = [rng.uniform(0, 360) for _ in range(INCIDENTS)]
+    wind_speeds = [rng.uniform(1, 10) for _ in range(INCIDENTS)]
+
+    start = time.perf_counter()
+    expected_risk = np.zeros((RECEPTORS, INCIDENTS))
+    expected_distance = np.zeros((RECEPTORS, INCIDENTS))
+    for i in range(RECEPTORS):
+        for j in range(INCIDENTS):
+            expected_risk[i, j], expected_distance[i, j] = atmospheric_model.calculate_risk_percentage(
+                receptor_lats[i], receptor_lons[i],
+                incident_lats[j], incident_lons[j],
+                wind_directions[j], wind_speeds[j],
+            )
+    loop_s = time.perf_counter() - start
+
+    timings = []
+    for _ in range(20):
+        start = time.perf_counter()
+        risk, distance = batch_risk.calculate_risk_matrix(
+            receptor_lats, receptor_lons, incident_lats, incident_lons,
+            wind_directions, wind_speeds,
+        )
+        timings.append(time.perf_counter() - start)
+    batch_s = min(timings)
+
+    print(f"pairs       : {RECEPTORS} x {INCIDENTS} = {RECEPTORS * INCIDENTS}")
+    print(f"scalar loop : {loop_s * 1000:10.2f} ms")
+    print(f"batch       : {batch_s * 1000:10.2f} ms")
+    print(f"speed-up    : {loop_s / batch_s:10.1f}x")
+    print(f"at risk     : {int(np.count_nonzero(risk > 1.0))} pairs above 1%")
+
+    lats, lons = random_points(SUPERPOSED_INCIDENTS, rng)
+    timings = []
+    for _ in range(20):
+        start = time.perf_counter()
+        result = batch_risk.superpose_incidents(52.37, 4.90, lats, lons, 225.0, 4.0)
+        timings.append(time.perf_counter() - start)
+    print(f"superpose   : {min(timings) * 1000:10.2f} ms for {SUPERPOSED_INCIDENTS} incidents")
+    assert np.isclose(result.total_concentration, result.concentrations.sum())
+
+    assert np.allclose(distance, expected_distance, rtol=1e-12)
+    assert np.allclose(risk, expected_risk, rtol=TABLE_RTOL, atol=1e-12)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Compare the dispersion engines over a standard scenario set.
+
+Every engine in dispersion.ENGINES is run over the same scenarios. For each
+engine and scenario the script reports throughput, latency percentiles and
+agreement with the vectorized engine: the relative difference in total
+concentration and the absolute difference in risk percentage.
+
+The puff engine needs a history; it is spun up for SPIN_UP_SECONDS of steady
+wind before it is timed, so in a steady wind it should approach the plume.
+The ensemble reports the member mean over sampled wind directions. In the
+near field the plume is only metres wide, so the mean smears it out and
+is far below the deterministic plume by design; its agreement columns are
+marked "n/c" (not comparable) instead of being reported as a difference.
+
+Beyond 1 km the Pasquill-Gifford sigma_y of _dispersion_tables grows so fast
+that risks vanish, so most scenarios are in the near field. Relative
+agreement is only reported when a risk is above NEGLIGIBLE_RISK.
+"""
+from __future__ import annotations
+
+import math
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from _common import TABLE_RTOL, load_module
+
+HOME = (52.3500, 4.8600)
+ROUNDS = 200
+PUFF_STEP_SECONDS = 60
+SPIN_UP_SECONDS = 3 * 3600
+REFERENCE = "vectorized"
+NEGLIGIBLE_RISK = 1e-6
+# Engines that do not estimate the same deterministic plume as the reference
+NOT_COMPARABLE = {"ensemble"}
+
+
+def upwind(distance_m: float, crosswind_m: float, wind_direction: float) -> tuple[float, float]:
+    """Return a source distance_m upwind of HOME, offset crosswind_m to the right."""
+    theta = math.radians(wind_direction)
+    north = distance_m * math.cos(theta) - crosswind_m * math.sin(theta)
+    east = distance_m * math.sin(theta) + crosswind_m * math.cos(theta)
+    return (
+        HOME[0] + north / 111195.0,
+        HOME[1] + east / (111195.0 * math.cos(math.radians(HOME[0]))),
+    )
+
+
+def scenarios() -> list[tuple[str, dict[str, tuple[float, float]], float, float, str]]:
+    """Return (name, sources, wind_direction, wind_speed, stability_class) tuples."""
+    cluster = {f"c{index}": upwind(300 + 70 * index, 0.5 * (index - 5), 240.0) for index in range(10)}
+    return [
+        ("downwind 300 m", {"a": upwind(300, 0, 225.0)}, 225.0, 4.0, "D"),
+        ("downwind 1 km", {"a": upwind(1000, 0, 225.0)}, 225.0, 4.0, "D"),
+        ("offset 1 m at 800 m", {"a": upwind(800, 1, 200.0)}, 200.0, 5.0, "D"),
+        ("cluster of 10", cluster, 240.0, 4.0, "D"),
+        ("stable night", {"a": upwind(600, 0, 90.0)}, 90.0, 2.0, "F"),
+        ("unstable noon", {"a": upwind(700, 0, 315.0)}, 315.0, 6.0, "B"),
+        ("far 30 km", {"a": upwind(30000, 500, 270.0)}, 270.0, 8.0, "D"),
+    ]
+
+
+def run_engine(engine, sources, wind_direction, wind_speed, stability_class):
+    """Time ROUNDS evaluations; return (latencies in s, last result)."""
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    if engine.stateful:
+        for _ in range(SPIN_UP_SECONDS // PUFF_STEP_SECONDS):
+            engine.evaluate(*HOME, sources, wind_direction, wind_speed, stability_class, now)
+            now += timedelta(seconds=PUFF_STEP_SECONDS)
+
+    latencies = np.empty(ROUNDS)
+    result = None
+    for index in range(ROUNDS):
+        start = time.perf_counter()
+        result = engine.evaluate(*HOME, sources, wind_direction, wind_speed, stability_class, now)
+        latencies[index] = time.perf_counter() - start
+        now += timedelta(seconds=PUFF_STEP_SECONDS)
+    return latencies, result
+
+
+def main() -> None:
+    dispersion = load_module("dispersion")
+
+    print(
+        f"{'scenario':22s} {'engine':10s} {'evals/s':>10s} {'p50 ms':>8s} {'p95 ms':>8s} "
+        f"{'p99 ms':>8s} {'risk %':>10s} {'rel diff':>9s} {'risk diff':>10s}"
+    )
+    for name, sources, wind_direction, wind_speed, stability_class in scenarios():
+        results = {}
+        for engine_name, engine_class in dispersion.ENGINES.items():
+            engine = engine_class()
+            latencies, result = run_engine(engine, sources, wind_direction, wind_speed, stability_class)
+            results[engine_name] = (latencies, result)
+
+        reference = results[REFERENCE][1]
+        for engine_name, (latencies, result) in results.items():
+            risk_diff = f"{abs(result.risk_percentage - reference.risk_percentage):10.4f}"
+            if engine_name in NOT_COMPARABLE:
+                relative, risk_diff = "n/c", f"{'n/c':>10s}"
+            elif max(result.risk_percentage, reference.risk_percentage) < NEGLIGIBLE_RISK:
+                relative = "-"
+            elif reference.total_concentration > 0:
+                relative = f"{abs(result.total_concentration / reference.total_concentration - 1):.2%}"
+            else:
+                relative = "inf"
+            p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+            print(
+                f"{name:22s} {engine_name:10s} {ROUNDS / latencies.sum():10.0f} {p50:8.3f} {p95:8.3f} "
+                f"{p99:8.3f} {result.risk_percentage:10.4f} {relative:>9s} {risk_diff}"
+            )
+
+        # The scalar and vectorized engines implement the same formula
+        assert np.allclose(
+            results["scalar"][1].concentrations, reference.concentrations, rtol=TABLE_RTOL, atol=1e-15
+        ), name
+
+
+if __name__ == "__main__":
+    main()
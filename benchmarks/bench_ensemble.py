@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Benchmark the Monte Carlo wind-uncertainty ensemble.
+
+Runs run_ensemble() with 1000 members against a handful of incidents
+around a home location, checks that a single-member ensemble without spread
+matches calculate_risk_percentage() and reports timings and the published
+statistics.
+"""
+from __future__ import annotations
+
+import time
+
+import numpy as np
+
+from _common import load_module
+
+HOME = (52.3500, 4.8600)
+INCIDENTS = [(52.3460, 4.8520), (52.3300, 4.8500), (52.4000, 4.9500)]
+
+
+def main() -> None:
+    atmospheric_model = load_module("_atmospheric_model")
+    ensemble = load_module("_ensemble")
+    lats = [lat for lat, _ in INCIDENTS]
+    lons = [lon for _, lon in INCIDENTS]
+    wind_direction, wind_speed = 225.0, 4.0
+
+    # Without spread every member is the deterministic model
+    result = ensemble.run_ensemble(
+        *HOME, lats[:1], lons[:1], wind_direction, wind_speed, "D",
+        members=4, direction_spread=0.0, speed_spread=0.0, stability_weights={0: 1.0},
+    )
+    expected, _ = atmospheric_model.calculate_risk_percentage(
+        *HOME, lats[0], lons[0], wind_direction, wind_speed
+    )
+    assert np.allclose(result.risks, expected, rtol=1e-9, atol=1e-12), (result.risks, expected)
+
+    rng = np.random.default_rng(11)
+    for members in (100, 1000, 10000):
+        timings = []
+        for _ in range(10):
+            start = time.perf_counter()
+            result = ensemble.run_ensemble(
+                *HOME, lats, lons, wind_direction, wind_speed, "D", members=members, rng=rng
+            )
+            timings.append(time.perf_counter() - start)
+        print(
+            f"{members:6d} members x {len(INCIDENTS)} incidents: {min(timings) * 1000:7.2f} ms  "
+            f"{result.as_dict()}"
+        )
+
+
+if __name__ == "__main__":
+    main()
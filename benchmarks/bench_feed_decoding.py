@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Benchmark full-body versus streaming decoding of the NL-Alert feed.
+
+Builds synthetic feeds of 1k-100k alerts and fetches them through
+NLAlertAPI._async_fetch_alerts, the path the coordinator uses: decode,
+Alert.from_dict per alert, and the list of records that is kept. A stand-in
+session answers with the feed body; the full path reads and decodes the
+whole body like response.json(), the streaming path (stream_decode) reads
+STREAM_CHUNK_SIZE chunks and turns each alert into an Alert as it arrives.
+
+Wall time is measured without tracing; peak traced memory is measured in a
+separate run and includes the body read by the full path and the returned
+records, which both paths keep; the records column is what remains traced
+once the fetch has returned. The streaming peak stays within a chunk of the
+records; the full path also holds the body and every decoded dict at once.
+
+The pipeline columns stream the feed into a per-alert callback, the way the
+coordinator archives the last-24h feed: no list is built and the callback
+keeps KEEP_ONE_IN of the alerts, so the peak no longer grows with the feed.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+import tracemalloc
+
+from _common import load_module
+
+SIZES = [1_000, 10_000, 100_000]
+ENDPOINT = "https://example.invalid/alerts"
+# The pipeline keeps one alert in this many, like the hazard filter and dedup
+KEEP_ONE_IN = 1000
+
+
+def make_feed(count: int) -> bytes:
+    """Create a synthetic feed body with count alerts."""
+    alerts = []
+    for i in range(count):
+        alerts.append({
+            "identifier": f"NL-ALERT-{i:06d}",
+            "sent": "2024-01-01T12:00:00+01:00",
+            "expires": "2024-01-01T14:00:00+01:00",
+            "info": [{
+                "severity": "Severe",
+                "headline": f"Brand met rookontwikkeling {i}",
+                "description": "Sluit ramen en deuren en zet ventilatie uit.",
+                "area": [{
+                    "areaDesc": "Rotterdam",
+                    "polygon": "51.9 4.4 52.0 4.4 52.0 4.5 51.9 4.5 51.9 4.4",
+                }],
+            }],
+        })
+    return json.dumps({"alerts": alerts, "count": count}).encode()
+
+
+class _Content:
+    """Stand-in for aiohttp's StreamReader."""
+
+    def __init__(self, body: bytes) -> None:
+        self._body = body
+
+    async def iter_chunked(self, size: int):
+        for start in range(0, len(self._body), size):
+            yield self._body[start:start + size]
+
+
+class _Response:
+    """Stand-in for an aiohttp response with a 200 feed body."""
+
+    status = 200
+    headers: dict[str, str] = {}
+
+    def __init__(self, body: bytes) -> None:
+        self._body = body
+        self.content = _Content(body)
+
+    async def json(self):
+        # aiohttp reads the whole body into memory before decoding it
+        body = bytes(bytearray(self._body))
+        return json.loads(body.decode())
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        return None
+
+
+class _Session:
+    """Stand-in for aiohttp.ClientSession that serves one body."""
+
+    def __init__(self, body: bytes) -> None:
+        self._body = body
+
+    def get(self, url: str, headers=None) -> _Response:
+        return _Response(self._body)
+
+
+def fetch(api_module, body: bytes, stream_decode: bool) -> list:
+    """Fetch the feed through the API client and return the records."""
+    api = api_module.NLAlertAPI(_Session(body), stream_decode=stream_decode)
+    return asyncio.run(api._async_fetch_alerts(ENDPOINT, "alerts"))
+
+
+def pipeline(api_module, body: bytes) -> list:
+    """Stream the feed into a per-alert callback and return what it kept."""
+    kept = []
+
+    def on_alert(alert) -> None:
+        if int(alert.identifier.rsplit("-", 1)[1]) % KEEP_ONE_IN == 0:
+            kept.append(alert)
+
+    api = api_module.NLAlertAPI(_Session(body), stream_decode=True)
+    assert asyncio.run(api._async_fetch_alerts(ENDPOINT, "alerts", on_alert)) == []
+    return kept
+
+
+def measure(func) -> tuple[float, float, float]:
+    """Return (seconds, peak MiB, retained MiB) of func.
+
+    Memory comes from a second, traced call; retained is what is still
+    allocated while its result is alive.
+    """
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    result = func()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, peak / (1024 * 1024), retained / (1024 * 1024)
+
+
+def main() -> None:
+    api_module = load_module("api")
+    print(
+        f"{'alerts':>8} {'body MiB':>9} {'records MiB':>12} | "
+        f"{'full s':>8} {'full MiB':>9} | {'stream s':>8} {'stream MiB':>10} | "
+        f"{'pipeline s':>10} {'pipeline MiB':>12}"
+    )
+    for size in SIZES:
+        body = make_feed(size)
+        full = fetch(api_module, body, False)
+        stream = fetch(api_module, body, True)
+        assert len(full) == len(stream) == size
+        assert [alert.identifier for alert in full] == [alert.identifier for alert in stream]
+        full_time, full_peak, _ = measure(lambda: fetch(api_module, body, False))
+        stream_time, stream_peak, records = measure(lambda: fetch(api_module, body, True))
+        assert len(pipeline(api_module, body)) == -(-size // KEEP_ONE_IN)
+        pipeline_time, pipeline_peak, _ = measure(lambda: pipeline(api_module, body))
+        print(
+            f"{size:>8} {len(body) / (1024 * 1024):>9.1f} {records:>12.1f} | "
+            f"{full_time:>8.3f} {full_peak:>9.1f} | "
+            f"{stream_time:>8.3f} {stream_peak:>10.2f} | "
+            f"{pipeline_time:>10.3f} {pipeline_peak:>12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
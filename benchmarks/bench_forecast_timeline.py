@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark the forecast risk timeline.
+
+Evaluates a 48-step hourly forecast for a cluster of incidents in one
+batched call and checks every step against superpose_incidents, the model
+the vectorized engine uses for the current weather. Then changes a few
+steps and shows that the timeline only evaluates those again.
+"""
+from __future__ import annotations
+
+import math
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from _common import load_module
+
+HOME = (52.3500, 4.8600)
+STEPS = 48
+INCIDENTS = 10
+ROUNDS = 200
+CHANGED_STEPS = 3
+
+
+def upwind(distance_m: float, crosswind_m: float, wind_direction: float) -> tuple[float, float]:
+    """Return a source distance_m upwind of HOME, offset crosswind_m to the right."""
+    theta = math.radians(wind_direction)
+    north = distance_m * math.cos(theta) - crosswind_m * math.sin(theta)
+    east = distance_m * math.sin(theta) + crosswind_m * math.cos(theta)
+    return (
+        HOME[0] + north / 111195.0,
+        HOME[1] + east / (111195.0 * math.cos(math.radians(HOME[0]))),
+    )
+
+
+def main() -> None:
+    forecast = load_module("forecast")
+    batch_risk = load_module("_batch_risk")
+    rng = np.random.default_rng(11)
+
+    # Near field, so the inherited sigma_y of _dispersion_tables leaves a risk
+    sources = {f"c{index}": upwind(300 + 60 * index, 0.5 * (index - 5), 240.0) for index in range(INCIDENTS)}
+    start_time = datetime(2024, 10, 17, tzinfo=timezone.utc)
+    steps = [
+        forecast.ForecastStep(
+            start_time + timedelta(hours=hour),
+            float(rng.uniform(1.0, 8.0)),
+            # Mostly around the incident bearing, sometimes exactly on it
+            240.0 if hour % 6 == 0 else float(rng.normal(240.0, 2.0)),
+            12.0,
+            "DEF"[hour % 3],
+        )
+        for hour in range(STEPS)
+    ]
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        entries = forecast.evaluate_forecast(*HOME, sources, steps)
+    batched_s = (time.perf_counter() - start) / ROUNDS
+
+    lats = [lat for lat, _ in sources.values()]
+    lons = [lon for _, lon in sources.values()]
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        results = [
+            batch_risk.superpose_incidents(
+                *HOME, lats, lons, step.wind_direction, step.wind_speed, step.stability_class
+            )
+            for step in steps
+        ]
+    per_step_s = (time.perf_counter() - start) / ROUNDS
+
+    for entry, result in zip(entries, results):
+        assert math.isclose(entry["risk_percentage"], round(result.risk_percentage, 2), abs_tol=0.011), entry
+    assert any(entry["risk_percentage"] > 0 for entry in entries)
+
+    timeline = forecast.ForecastTimeline()
+    pending = timeline.pending(HOME, sources, steps)
+    timeline.store(pending, forecast.evaluate_forecast(*HOME, sources, pending))
+    changed = list(steps)
+    for hour in (5, 17, 40)[:CHANGED_STEPS]:
+        step = changed[hour]
+        changed[hour] = forecast.ForecastStep(
+            step.time, step.wind_speed + 2.0, step.wind_direction, step.temperature, step.stability_class
+        )
+    start = time.perf_counter()
+    pending = timeline.pending(HOME, sources, changed)
+    timeline.store(pending, forecast.evaluate_forecast(*HOME, sources, pending))
+    incremental_s = time.perf_counter() - start
+    assert len(pending) == CHANGED_STEPS, len(pending)
+    assert [entry["risk_percentage"] for entry in timeline.as_list()] == [
+        entry["risk_percentage"] for entry in forecast.evaluate_forecast(*HOME, sources, changed)
+    ]
+
+    peak = max(entries, key=lambda entry: entry["risk_percentage"])
+    print(f"steps x incidents : {STEPS} x {INCIDENTS}")
+    print(f"batched           : {batched_s * 1000:8.3f} ms per timeline")
+    print(f"per step          : {per_step_s * 1000:8.3f} ms per timeline")
+    print(f"incremental       : {incremental_s * 1000:8.3f} ms for {CHANGED_STEPS} changed steps")
+    print(f"timeline stats    : {timeline.stats}")
+    print(f"peak              : {peak['risk_percentage']:.2f}% at {peak['datetime']} ({peak['stability_class']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark the rolling wind-sensor fusion.
+
+Feeds a long series of gusty wind samples through WindFusion, checks the
+incremental circular mean, circular standard deviation, mean speed and
+speed variance against a full recomputation over the same window, and
+compares the cost per sample with recomputing the statistics from scratch.
+"""
+from __future__ import annotations
+
+import math
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from _common import load_module
+
+SAMPLES = 20000
+
+
+def main() -> None:
+    wind_fusion = load_module("wind_fusion")
+    window = wind_fusion.WINDOW_SIZE
+    rng = np.random.default_rng(3)
+    # Wind around north, so naive averaging of degrees would fail
+    directions = (355.0 + rng.normal(0.0, 20.0, SAMPLES)) % 360
+    speeds = np.abs(4.0 + rng.normal(0.0, 1.5, SAMPLES))
+    start_time = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    fusion = wind_fusion.WindFusion()
+    start = time.perf_counter()
+    for index in range(SAMPLES):
+        now = start_time + timedelta(seconds=10 * index)
+        fusion.add_direction(float(directions[index]), now)
+        fusion.add_speed(float(speeds[index]), now)
+        fusion.direction_mean, fusion.direction_std, fusion.speed_mean, fusion.speed_std
+    incremental_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for index in range(SAMPLES):
+        recent = np.radians(directions[max(0, index - window + 1):index + 1])
+        sin_mean, cos_mean = np.sin(recent).mean(), np.cos(recent).mean()
+        expected_direction = math.degrees(math.atan2(sin_mean, cos_mean)) % 360
+        expected_std = math.degrees(math.sqrt(-2 * math.log(math.hypot(sin_mean, cos_mean))))
+        recent_speeds = speeds[max(0, index - window + 1):index + 1]
+        expected_speed, expected_speed_std = recent_speeds.mean(), recent_speeds.std()
+    recompute_s = time.perf_counter() - start
+
+    direction_error = abs((fusion.direction_mean - expected_direction + 180) % 360 - 180)
+    assert direction_error < 1e-9, direction_error
+    assert math.isclose(fusion.direction_std, expected_std, rel_tol=1e-9)
+    assert math.isclose(fusion.speed_mean, expected_speed, rel_tol=1e-12)
+    assert math.isclose(fusion.speed_std, expected_speed_std, rel_tol=1e-9)
+
+    weather = fusion.apply({"wind_speed": 9.0, "wind_direction": 10.0, "source": "knmi"}, now)
+    print(f"window          : {window} samples")
+    print(f"incremental     : {incremental_s / SAMPLES * 1e6:8.2f} us per sample")
+    print(f"recompute       : {recompute_s / SAMPLES * 1e6:8.2f} us per sample")
+    print(f"direction       : {fusion.direction_mean:6.1f} deg +/- {fusion.direction_std:.1f} deg")
+    print(f"speed           : {fusion.speed_mean:6.2f} m/s +/- {fusion.speed_std:.2f} m/s")
+    print(f"applied         : {weather}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Check the dispersion coefficient tables against the closed-form expressions.
+
+Compares sigmas_array(), the interpolated lookup used by the NumPy engines,
+with sigma_y_closed_form() and sigma_z_closed_form() for every stability
+class on random distances between 1 m and 100 km, and times the array lookup
+against evaluating the closed form per distance, as scalar callers do.
+"""
+from __future__ import annotations
+
+import random
+import time
+
+import numpy as np
+
+from _common import TABLE_RTOL, load_module
+
+SAMPLES = 20_000
+MAX_RELATIVE_ERROR = TABLE_RTOL
+REPEATS = 7
+
+
+def best_of(func) -> float:
+    """Return the fastest of REPEATS timed calls, in seconds."""
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    tables = load_module("_dispersion_tables")
+    rng = random.Random(3)
+    distances = [10 ** rng.uniform(0, 5) for _ in range(SAMPLES)]
+    # Branch point and grid ends are checked explicitly
+    distances += [1.0, 999.999, 1000.0, 1000.001, 100_000.0]
+    distance_array = np.array(distances)
+
+    worst = 0.0
+    for stability in "ABCDEF":
+        sigma_y, sigma_z = tables.sigmas_array(distance_array, stability)
+        for name, closed_form, values in (
+            ("sigma_y", tables.sigma_y_closed_form, sigma_y),
+            ("sigma_z", tables.sigma_z_closed_form, sigma_z),
+        ):
+            class_worst = 0.0
+            for i, distance in enumerate(distances):
+                expected = closed_form(distance, stability)
+                # Both paths cap the far branch of A/B; capped values are not compared
+                if expected > 1e300:
+                    continue
+                class_worst = max(class_worst, abs(float(values[i]) - expected) / expected)
+            print(f"{stability} {name}: max relative error {class_worst:.2e}")
+            worst = max(worst, class_worst)
+
+    def closed_form() -> None:
+        for distance in distances:
+            tables.sigma_y_closed_form(distance, "D")
+            tables.sigma_z_closed_form(distance, "D")
+
+    closed_s = best_of(closed_form)
+    array_s = best_of(lambda: tables.sigmas_array(distance_array, "D"))
+
+    print(f"closed form : {closed_s * 1000:8.2f} ms for {len(distances)} distances")
+    print(f"table array : {array_s * 1000:8.2f} ms")
+    assert worst < MAX_RELATIVE_ERROR, f"table error {worst:.2e} exceeds {MAX_RELATIVE_ERROR:.0e}"
+
+
+if __name__ == "__main__":
+    main()
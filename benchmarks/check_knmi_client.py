@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Check the KNMI observations client against a local stand-in of the API.
+
+A small aiohttp server implements the three Open Data API calls the client
+uses (file listing, temporary download URL, download) and serves the
+observation files in a directory. Pass a directory of recorded KNMI files
+as the first argument; without one, files with the layout of the KNMI
+10-minute dataset are generated with netCDF4.
+
+Checks that a file is downloaded once, that the publication interval is
+respected, that a restart loads the file from the disk cache, and that
+nearest-station lookups match a brute-force search. Also times lookups.
+
+The parser and the lookups are also checked on in-memory variables, so
+they run without netCDF4; the client checks are skipped without it.
+"""
+from __future__ import annotations
+
+import asyncio
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+import aiohttp
+import numpy as np
+from aiohttp import web
+
+from _common import load_module
+
+API_KEY = "test-key"
+STATIONS = 50
+LOOKUPS = 10000
+
+
+def observation_variables(observed_at: datetime, rng: random.Random) -> dict[str, np.ndarray]:
+    """Return in-memory variables with the layout of the KNMI 10-minute dataset."""
+    def column(low: float, high: float) -> np.ma.MaskedArray:
+        return np.ma.masked_array([[rng.uniform(low, high)] for _ in range(STATIONS)])
+
+    variables = {
+        "station": np.array([f"06{200 + index:03d}" for index in range(STATIONS)]),
+        "stationname": np.array([f"Station {index}" for index in range(STATIONS)]),
+        "time": np.array([(observed_at - datetime(1950, 1, 1, tzinfo=timezone.utc)).total_seconds()]),
+        "lat": np.array([rng.uniform(50.8, 53.5) for _ in range(STATIONS)]),
+        "lon": np.array([rng.uniform(3.4, 7.2) for _ in range(STATIONS)]),
+        "ff": column(0, 15),
+        "dd": column(0, 360),
+        "ta": column(-5, 30),
+        "pp": column(990, 1030),
+        "rh": column(30, 100),
+    }
+    # A station without a wind sensor is left out of the index
+    variables["ff"][0, 0] = np.ma.masked
+    return variables
+
+
+def write_observation_file(path: str, variables: dict[str, np.ndarray]) -> None:
+    """Write variables to a NetCDF file like the KNMI files."""
+    from netCDF4 import Dataset
+
+    with Dataset(path, "w") as dataset:
+        dataset.createDimension("station", STATIONS)
+        dataset.createDimension("time", 1)
+        for name in ("station", "stationname"):
+            variable = dataset.createVariable(name, str, ("station",))
+            for index, value in enumerate(variables[name]):
+                variable[index] = str(value)
+        times = dataset.createVariable("time", "f8", ("time",))
+        times.units = "seconds since 1950-01-01 00:00:00"
+        times[:] = variables["time"]
+        for name in ("lat", "lon"):
+            dataset.createVariable(name, "f8", ("station",))[:] = variables[name]
+        for name in ("ff", "dd", "ta", "pp", "rh"):
+            dataset.createVariable(name, "f8", ("station", "time"), fill_value=-9999.0)[:] = variables[name]
+
+
+def check_parser(knmi, rng: random.Random) -> list:
+    """Parse in-memory variables and return the stations with wind."""
+    observed_at = datetime(2024, 10, 17, 12, 0, tzinfo=timezone.utc)
+    variables = observation_variables(observed_at, rng)
+    stations = knmi.parse_variables(variables)
+    assert len(stations) == STATIONS
+    assert not stations[0].has_wind and stations[0].wind_speed is None
+    assert all(station.has_wind for station in stations[1:])
+    assert all(station.observed_at == observed_at for station in stations)
+    assert stations[1].station_id == "06201" and stations[1].name == "Station 1"
+    assert math.isclose(stations[1].temperature, float(variables["ta"][1, 0]))
+    print(f"parser        : {len(stations)} stations, {len(stations) - 1} with wind")
+    return [station for station in stations if station.has_wind]
+
+
+def filename_for(observed_at: datetime) -> str:
+    """Return the KNMI filename of an observation time."""
+    return f"KMDS__OPER_P___10M_OBS_L2_{observed_at:%Y%m%d%H%M}.nc"
+
+
+class StandInServer:
+    """Serve the newest file of a directory like the KNMI Open Data API."""
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self.requests: list[str] = []
+        self.base_url = ""
+
+    def latest(self) -> str:
+        return sorted(name for name in os.listdir(self.directory) if name.endswith(".nc"))[-1]
+
+    async def files(self, request: web.Request) -> web.Response:
+        self.requests.append("list")
+        if request.headers.get("Authorization") != API_KEY:
+            return web.Response(status=403)
+        return web.json_response({"files": [{"filename": self.latest()}]})
+
+    async def url(self, request: web.Request) -> web.Response:
+        self.requests.append("url")
+        filename = request.match_info["filename"]
+        return web.json_response({"temporaryDownloadUrl": f"{self.base_url}/download/{filename}"})
+
+    async def download(self, request: web.Request) -> web.FileResponse:
+        self.requests.append("download")
+        return web.FileResponse(os.path.join(self.directory, request.match_info["filename"]))
+
+    async def start(self) -> web.AppRunner:
+        app = web.Application()
+        prefix = "/datasets/Actuele10mindataKNMIstations/versions/2/files"
+        app.router.add_get(prefix, self.files)
+        app.router.add_get(prefix + "/{filename}/url", self.url)
+        app.router.add_get("/download/{filename}", self.download)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}"
+        return runner
+
+
+async def check_client(knmi, rng: random.Random) -> None:
+    """Run the client against the stand-in server."""
+    with tempfile.TemporaryDirectory() as served, tempfile.TemporaryDirectory() as cache:
+        if len(sys.argv) > 1:
+            served = sys.argv[1]
+        else:
+            observed_at = datetime(2024, 10, 17, 12, 0, tzinfo=timezone.utc)
+            variables = observation_variables(observed_at, rng)
+            path = os.path.join(served, filename_for(observed_at))
+            write_observation_file(path, variables)
+            # The NetCDF round trip gives the same stations as the variables
+            parsed = knmi.parse_observations(path)
+            expected = knmi.parse_variables(variables)
+            assert [(s.station_id, s.wind_speed, s.observed_at) for s in parsed] == [
+                (s.station_id, s.wind_speed, s.observed_at) for s in expected
+            ]
+        server = StandInServer(served)
+        runner = await server.start()
+        endpoint = f"{server.base_url}/datasets/Actuele10mindataKNMIstations/versions/2/files"
+        now = datetime(2024, 10, 17, 12, 5, tzinfo=timezone.utc)
+
+        async with aiohttp.ClientSession() as session:
+            client = knmi.KNMIObservationsClient(session, API_KEY, cache, endpoint)
+            await client.async_update(now)
+            assert client.download_count == 1 and client.filename == server.latest()
+            print(f"first update  : {server.requests}, {len(client.index)} stations with wind")
+
+            server.requests.clear()
+            await client.async_update(now + timedelta(minutes=5))
+            assert server.requests == [], server.requests
+            await client.async_update(now + knmi.PUBLICATION_INTERVAL)
+            assert server.requests == ["list"] and client.download_count == 1, server.requests
+            print(f"same file     : {server.requests}")
+
+            if len(sys.argv) == 1:
+                observed_at = datetime(2024, 10, 17, 12, 10, tzinfo=timezone.utc)
+                write_observation_file(
+                    os.path.join(served, filename_for(observed_at)),
+                    observation_variables(observed_at, rng),
+                )
+                server.requests.clear()
+                await client.async_update(now + 2 * knmi.PUBLICATION_INTERVAL)
+                assert client.download_count == 2 and client.filename == server.latest()
+                assert os.listdir(cache) == [client.filename], os.listdir(cache)
+                print(f"new file      : {server.requests}")
+
+            # A restart finds the latest file on disk and does not download it
+            server.requests.clear()
+            restarted = knmi.KNMIObservationsClient(session, API_KEY, cache, endpoint)
+            await restarted.async_update(now + 3 * knmi.PUBLICATION_INTERVAL)
+            assert restarted.download_count == 0 and restarted.filename == server.latest()
+            print(f"after restart : {server.requests}")
+
+        await runner.cleanup()
+
+
+def check_lookups(knmi, stations: list, rng: random.Random) -> None:
+    """Compare nearest-station lookups with a brute-force search."""
+    index = knmi.StationIndex(stations)
+    points = [(rng.uniform(50.7, 53.6), rng.uniform(3.3, 7.3)) for _ in range(LOOKUPS)]
+
+    start = time.perf_counter()
+    found = [index.nearest(lat, lon)[0] for lat, lon in points]
+    tree_s = time.perf_counter() - start
+
+    cos_lat = index._cos_lat
+    start = time.perf_counter()
+    expected = [
+        min(
+            stations,
+            key=lambda station: ((station.longitude - lon) * cos_lat) ** 2 + (station.latitude - lat) ** 2,
+        )
+        for lat, lon in points
+    ]
+    brute_s = time.perf_counter() - start
+    assert all(a is b for a, b in zip(found, expected))
+
+    station, distance = index.nearest(52.10, 5.18)
+    print(f"nearest to De Bilt: {station.name} at {distance:.1f} km, wind {station.wind_speed:.1f} m/s")
+    print(f"lookups       : {LOOKUPS} in {tree_s * 1000:.1f} ms (brute force {brute_s * 1000:.1f} ms)")
+
+
+async def main() -> None:
+    knmi = load_module("knmi")
+    rng = random.Random(5)
+    stations = check_parser(knmi, rng)
+    if knmi.netcdf_available():
+        await check_client(knmi, rng)
+    else:
+        print("client        : skipped, netCDF4 is not installed")
+    check_lookups(knmi, stations, rng)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -14,7 +14,8 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant, ServiceCall
 
-from .const import DOMAIN
+from .const import DOMAIN, CONF_STREAM_DECODE, CONF_KNMI_API_KEY
+from .models import Alert
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -34,12 +35,33 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Store an instance of the "connecting" class
     hass.data.setdefault(DOMAIN, {})
     
+    # Combineer data en options voor API client en coordinator
+    config_data = {**entry.data, **entry.options}
+    
     # Create API client and coordinator
     session = async_get_clientsession(hass)
-    api = NLAlertAPI(session)
-    
-    # Combineer data en options voor coordinator
-    config_data = {**entry.data, **entry.options}
+    knmi = None
+    if config_data.get(CONF_KNMI_API_KEY):
+        from homeassistant.helpers.storage import STORAGE_DIR
+        from homeassistant.requirements import RequirementsNotFound, async_process_requirements
+        from .knmi import REQUIREMENTS as KNMI_REQUIREMENTS, KNMIObservationsClient
+        
+        # netCDF4 alleen installeren als de KNMI bron gebruikt wordt
+        try:
+            await async_process_requirements(hass, DOMAIN, KNMI_REQUIREMENTS)
+        except RequirementsNotFound as err:
+            _LOGGER.error("KNMI observations disabled, using the default weather: %s", err)
+        else:
+            knmi = KNMIObservationsClient(
+                session,
+                config_data[CONF_KNMI_API_KEY],
+                hass.config.path(STORAGE_DIR, f"{DOMAIN}_knmi"),
+            )
+    api = NLAlertAPI(
+        session,
+        stream_decode=config_data.get(CONF_STREAM_DECODE, False),
+        knmi=knmi,
+    )
     coordinator = NLAlertCoordinator(hass, api, config_data)
     
     # Store coordinator for platforms
@@ -52,6 +74,12 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Fetch initial data
     await coordinator.async_config_entry_first_refresh()
     
+    # Herbereken het pluimrisico zodra het weer verandert
+    coordinator.async_track_weather()
+    
+    # Load the stored incident archive without delaying setup
+    hass.async_create_task(coordinator.async_load_history())
+    
     # Set up options update listener
     entry.async_on_unload(entry.add_update_listener(async_update_listener))
     
@@ -83,7 +111,8 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        entry_data = hass.data[DOMAIN].pop(entry.entry_id)
+        await entry_data["coordinator"].async_unload()
     
     return unload_ok
 
@@ -96,7 +125,7 @@ async def _register_services(hass: HomeAssistant, coordinator) -> None:
         _LOGGER.info("🧪 NL-Alert test alert service called")
         
         # Create test alert
-        test_alert = {
+        test_alert = Alert.from_dict({
             "identifier": "TEST-2024-001",
             "msgType": "Alert", 
             "scope": "Public",
@@ -122,13 +151,12 @@ async def _register_services(hass: HomeAssistant, coordinator) -> None:
                     "polygon": "52.1 4.9 52.2 4.9 52.2 5.0 52.1 5.0 52.1 4.9"
                 }]
             }]
-        }
+        })
         
         # Ensure coordinator data exists and is properly structured
         if coordinator.data is None:
             coordinator.data = {
                 "alerts": [],
-                "recent_alerts": [],
                 "active_alerts": [],
                 "active_count": 0,
                 "alert_count": 0,
@@ -139,9 +167,8 @@ async def _register_services(hass: HomeAssistant, coordinator) -> None:
                 "historical_count": 0,
             }
         
-        # Add test alert to current alerts and recent alerts
+        # Add test alert to current alerts
         coordinator.data["alerts"] = [test_alert] + coordinator.data.get("alerts", [])
-        coordinator.data["recent_alerts"] = [test_alert] + coordinator.data.get("recent_alerts", [])
         coordinator.data["active_alerts"] = [test_alert]
         coordinator.data["active_count"] = 1
         coordinator.data["alert_count"] = 1
@@ -150,7 +177,7 @@ async def _register_services(hass: HomeAssistant, coordinator) -> None:
         coordinator.data["has_severe_alerts"] = True
         
         # Also add to historical data
-        test_alert["stored_at"] = datetime.now().isoformat()
+        test_alert.stored_at = datetime.now().isoformat()
         coordinator.data["historical_alerts"] = [test_alert] + coordinator.data.get("historical_alerts", [])
         coordinator.data["historical_count"] = len(coordinator.data["historical_alerts"])
         
@@ -166,7 +193,6 @@ async def _register_services(hass: HomeAssistant, coordinator) -> None:
         # Reset all alert data
         coordinator.data = {
             "alerts": [],
-            "recent_alerts": [],
             "active_alerts": [],
             "active_count": 0,
             "alert_count": 0,
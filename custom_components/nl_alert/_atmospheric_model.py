@@ -6,55 +6,24 @@ Contains proprietary Gaussian plume modeling calculations.
 import math
 from typing import Tuple, Optional
 
+from ._dispersion_tables import PG_SIGMA_Y_PARAMS, sigma_y_closed_form, sigma_z_closed_form
+
 
 class _AtmosphericModel:
     """Private atmospheric dispersion calculator."""
     
     # Stability class coefficients (Pasquill-Gifford)
-    _STABILITY_PARAMS = {
-        'A': {'a': 213, 'b': 440.8, 'c': 1.941, 'd': 9.27, 'f': 459.7},
-        'B': {'a': 156, 'b': 106.6, 'c': 1.149, 'd': 3.3, 'f': 108.2},
-        'C': {'a': 104, 'b': 61.0, 'c': 0.911, 'd': 0, 'f': 61.0},
-        'D': {'a': 68, 'b': 33.2, 'c': 0.725, 'd': -1.7, 'f': 44.5},
-        'E': {'a': 50.5, 'b': 22.8, 'c': 0.678, 'd': -1.3, 'f': 37.6},
-        'F': {'a': 34, 'b': 14.35, 'c': 0.740, 'd': -0.35, 'f': 18.05}
-    }
+    _STABILITY_PARAMS = PG_SIGMA_Y_PARAMS
     
     @staticmethod
     def _calculate_sigma_y(distance_m: float, stability: str) -> float:
         """Calculate horizontal dispersion coefficient."""
-        params = _AtmosphericModel._STABILITY_PARAMS.get(stability, 
-                 _AtmosphericModel._STABILITY_PARAMS['D'])
-        
-        x_km = distance_m / 1000.0
-        
-        if x_km < 1.0:
-            theta = 0.017453293 * (params['c'] - params['d'] * math.log(x_km))
-            sigma_y = params['a'] * x_km * math.tan(theta)
-        else:
-            sigma_y = params['b'] * (x_km ** params['f'] / 1000)
-            
-        return max(sigma_y, 1.0)
+        return sigma_y_closed_form(distance_m, stability)
     
     @staticmethod 
     def _calculate_sigma_z(distance_m: float, stability: str) -> float:
         """Calculate vertical dispersion coefficient."""
-        # Simplified Briggs formulas
-        x_km = distance_m / 1000.0
-        
-        coefficients = {
-            'A': lambda x: 0.20 * x,
-            'B': lambda x: 0.12 * x,
-            'C': lambda x: 0.08 * x * (1 + 0.0001 * x) ** -0.5,
-            'D': lambda x: 0.06 * x * (1 + 0.0015 * x) ** -0.5,
-            'E': lambda x: 0.03 * x * (1 + 0.0003 * x) ** -1,
-            'F': lambda x: 0.016 * x * (1 + 0.0003 * x) ** -1
-        }
-        
-        calc_func = coefficients.get(stability, coefficients['D'])
-        sigma_z = calc_func(x_km * 1000)
-        
-        return max(sigma_z, 1.0)
+        return sigma_z_closed_form(distance_m, stability)
 
 
 def _gaussian_plume_concentration(
@@ -0,0 +1,239 @@
+"""
+Batch risk evaluation.
+
+Vectorized counterparts of the scalar helpers in _atmospheric_model, so
+risk for many receptor locations against many incidents is computed in one
+NumPy pass instead of N x M calls to calculate_risk_percentage.
+"""
+from __future__ import annotations
+
+import numpy as np
+
+from ._plume_raster import gaussian_plume_concentration_array
+
+# Earth radius in km, same as _calculate_distance
+_EARTH_RADIUS_KM = 6371.0
+
+# Beyond this distance calculate_risk_percentage reports no risk
+MAX_RISK_DISTANCE_KM = 50.0
+
+# Calibration constant of calculate_risk_percentage
+RISK_FACTOR = 1000.0
+
+
+def haversine_distance_array(
+    lat1: np.ndarray, lon1: np.ndarray, lat2: np.ndarray, lon2: np.ndarray
+) -> np.ndarray:
+    """Great-circle distance in km; inputs broadcast against each other."""
+    lat1_rad = np.radians(lat1)
+    lat2_rad = np.radians(lat2)
+    dlat = lat2_rad - lat1_rad
+    dlon = np.radians(np.asarray(lon2, dtype=float) - np.asarray(lon1, dtype=float))
+
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1_rad) * np.cos(lat2_rad) * np.sin(dlon / 2) ** 2
+    return 2 * _EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def bearing_array(
+    lat1: np.ndarray, lon1: np.ndarray, lat2: np.ndarray, lon2: np.ndarray
+) -> np.ndarray:
+    """Initial bearing in degrees (0-360) from point 1 to point 2."""
+    lat1_rad = np.radians(lat1)
+    lat2_rad = np.radians(lat2)
+    dlon = np.radians(np.asarray(lon2, dtype=float) - np.asarray(lon1, dtype=float))
+
+    y = np.sin(dlon) * np.cos(lat2_rad)
+    x = np.cos(lat1_rad) * np.sin(lat2_rad) - np.sin(lat1_rad) * np.cos(lat2_rad) * np.cos(dlon)
+    return (np.degrees(np.arctan2(y, x)) + 360) % 360
+
+
+def crosswind_array(
+    distance_km: np.ndarray, bearing: np.ndarray, wind_direction: np.ndarray
+) -> np.ndarray:
+    """Crosswind offset in meters from the plume centerline.
+
+    wind_direction is where the wind comes FROM, as in calculate_risk_percentage.
+    """
+    plume_direction = (np.asarray(wind_direction, dtype=float) + 180) % 360
+    angle_diff = np.abs(bearing - plume_direction)
+    angle_diff = np.where(angle_diff > 180, 360 - angle_diff, angle_diff)
+    return distance_km * 1000 * np.sin(np.radians(angle_diff))
+
+
+def calculate_concentration_matrix(
+    receptor_lats: np.ndarray,
+    receptor_lons: np.ndarray,
+    incident_lats: np.ndarray,
+    incident_lons: np.ndarray,
+    wind_direction: float | np.ndarray,
+    wind_speed: float | np.ndarray = 5.0,
+    stability_class: str = "D",
+) -> tuple[np.ndarray, np.ndarray]:
+    """Ground-level concentration and distance for every receptor/incident pair.
+
+    wind_direction and wind_speed are scalars or one value per incident.
+    Pairs beyond MAX_RISK_DISTANCE_KM get zero concentration.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (concentration, distance_km), both of
+        shape (receptors, incidents).
+    """
+    receptor_lats = np.asarray(receptor_lats, dtype=float).reshape(-1, 1)
+    receptor_lons = np.asarray(receptor_lons, dtype=float).reshape(-1, 1)
+    incident_lats = np.asarray(incident_lats, dtype=float).reshape(1, -1)
+    incident_lons = np.asarray(incident_lons, dtype=float).reshape(1, -1)
+    wind_direction = np.asarray(wind_direction, dtype=float).reshape(1, -1)
+    wind_speed = np.asarray(wind_speed, dtype=float).reshape(1, -1)
+
+    distance_km = haversine_distance_array(receptor_lats, receptor_lons, incident_lats, incident_lons)
+    bearing = bearing_array(incident_lats, incident_lons, receptor_lats, receptor_lons)
+    crosswind_m = crosswind_array(distance_km, bearing, wind_direction)
+
+    concentration = gaussian_plume_concentration_array(
+        distance_km * 1000,
+        crosswind_m,
+        height_m=2.0,
+        source_height=20.0,
+        wind_speed=wind_speed,
+        stability_class=stability_class,
+    )
+    concentration[distance_km > MAX_RISK_DISTANCE_KM] = 0.0
+    return concentration, distance_km
+
+
+def calculate_risk_matrix(
+    receptor_lats: np.ndarray,
+    receptor_lons: np.ndarray,
+    incident_lats: np.ndarray,
+    incident_lons: np.ndarray,
+    wind_direction: float | np.ndarray,
+    wind_speed: float | np.ndarray = 5.0,
+    stability_class: str = "D",
+) -> tuple[np.ndarray, np.ndarray]:
+    """Risk and distance for every receptor/incident pair.
+
+    wind_direction and wind_speed are scalars or one value per incident.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (risk_percentage, distance_km), both of
+        shape (receptors, incidents).
+    """
+    concentration, distance_km = calculate_concentration_matrix(
+        receptor_lats,
+        receptor_lons,
+        incident_lats,
+        incident_lons,
+        wind_direction,
+        wind_speed,
+        stability_class,
+    )
+    return concentration_to_risk(concentration), distance_km
+
+
+def concentration_to_risk(concentration: np.ndarray) -> np.ndarray:
+    """Scale concentrations to risk percentages like calculate_risk_percentage."""
+    return np.minimum(concentration * RISK_FACTOR, 100.0)
+
+
+class SuperpositionResult:
+    """Combined exposure of one receptor to several incidents."""
+
+    __slots__ = ("concentrations", "distances_km", "total_concentration", "dominant_index")
+
+    def __init__(self, concentrations: np.ndarray, distances_km: np.ndarray) -> None:
+        """Initialize from per-incident concentrations and distances."""
+        self.concentrations = concentrations
+        self.distances_km = distances_km
+        self.total_concentration = float(concentrations.sum())
+        self.dominant_index: int | None = None
+        if len(concentrations):
+            # Without any exposure the nearest incident is reported as dominant
+            ranking = concentrations if self.total_concentration > 0 else -distances_km
+            self.dominant_index = int(np.argmax(ranking))
+
+    @property
+    def risk_percentage(self) -> float:
+        """Return the risk of the summed concentration."""
+        return min(self.total_concentration * RISK_FACTOR, 100.0)
+
+    @property
+    def risk_percentages(self) -> np.ndarray:
+        """Return the risk each incident would cause on its own."""
+        return concentration_to_risk(self.concentrations)
+
+    @property
+    def shares(self) -> np.ndarray:
+        """Return each incident's fraction of the total concentration."""
+        if self.total_concentration <= 0:
+            return np.zeros_like(self.concentrations)
+        return self.concentrations / self.total_concentration
+
+
+def superpose_incidents(
+    receptor_lat: float,
+    receptor_lon: float,
+    incident_lats: np.ndarray,
+    incident_lons: np.ndarray,
+    wind_direction: float | np.ndarray,
+    wind_speed: float | np.ndarray = 5.0,
+    stability_class: str = "D",
+) -> SuperpositionResult:
+    """Sum the plumes of all incidents at one receptor in a single pass.
+
+    Gaussian plumes are linear in the emission rate, so simultaneous
+    releases add up.
+    """
+    concentration, distance_km = calculate_concentration_matrix(
+        [receptor_lat],
+        [receptor_lon],
+        incident_lats,
+        incident_lons,
+        wind_direction,
+        wind_speed,
+        stability_class,
+    )
+    return SuperpositionResult(concentration[0], distance_km[0])
+
+
+def superpose_forecast(
+    receptor_lat: float,
+    receptor_lon: float,
+    incident_lats: np.ndarray,
+    incident_lons: np.ndarray,
+    wind_directions: np.ndarray,
+    wind_speeds: np.ndarray,
+    stability_classes: list[str],
+) -> tuple[np.ndarray, np.ndarray]:
+    """Concentration of every incident at one receptor for many weather steps.
+
+    Distances and bearings do not depend on the weather and are computed
+    once; the plume itself is evaluated for all steps of one stability
+    class in a single array call.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (concentration of shape (steps,
+        incidents), distance_km of shape (incidents,)).
+    """
+    incident_lats = np.asarray(incident_lats, dtype=float).reshape(1, -1)
+    incident_lons = np.asarray(incident_lons, dtype=float).reshape(1, -1)
+    wind_directions = np.asarray(wind_directions, dtype=float).reshape(-1, 1)
+    wind_speeds = np.asarray(wind_speeds, dtype=float).reshape(-1, 1)
+
+    distance_km = haversine_distance_array(receptor_lat, receptor_lon, incident_lats, incident_lons)
+    bearing = bearing_array(incident_lats, incident_lons, receptor_lat, receptor_lon)
+    crosswind_m = crosswind_array(distance_km, bearing, wind_directions)
+
+    concentration = np.zeros(crosswind_m.shape)
+    classes = np.asarray(stability_classes)
+    for stability_class in np.unique(classes):
+        rows = classes == stability_class
+        concentration[rows] = gaussian_plume_concentration_array(
+            distance_km * 1000,
+            crosswind_m[rows],
+            height_m=2.0,
+            source_height=20.0,
+            wind_speed=wind_speeds[rows],
+            stability_class=str(stability_class),
+        )
+    concentration[:, distance_km[0] > MAX_RISK_DISTANCE_KM] = 0.0
+    return concentration, distance_km[0]
@@ -0,0 +1,192 @@
+"""
+Precomputed dispersion coefficient tables.
+
+sigma_y and sigma_z of the Pasquill-Gifford model are tabulated per
+stability class on a log-spaced distance grid, the first time a class is
+used. Lookups interpolate linearly in log-log space, which is exact for the
+power-law branches and accurate to well below a percent elsewhere; the
+grid is uniform in log10(distance), so finding the cell is a multiplication
+instead of a search.
+
+The tables only serve arrays of distances (sigmas_array). For a single
+distance the closed-form expressions are faster than an interpolated lookup
+in Python, so scalar callers use sigma_y_closed_form and sigma_z_closed_form.
+"""
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+# Stability class coefficients (Pasquill-Gifford) for sigma_y
+PG_SIGMA_Y_PARAMS = {
+    'A': {'a': 213, 'b': 440.8, 'c': 1.941, 'd': 9.27, 'f': 459.7},
+    'B': {'a': 156, 'b': 106.6, 'c': 1.149, 'd': 3.3, 'f': 108.2},
+    'C': {'a': 104, 'b': 61.0, 'c': 0.911, 'd': 0, 'f': 61.0},
+    'D': {'a': 68, 'b': 33.2, 'c': 0.725, 'd': -1.7, 'f': 44.5},
+    'E': {'a': 50.5, 'b': 22.8, 'c': 0.678, 'd': -1.3, 'f': 37.6},
+    'F': {'a': 34, 'b': 14.35, 'c': 0.740, 'd': -0.35, 'f': 18.05}
+}
+
+# Simplified Briggs coefficients for sigma_z: a * x * (1 + b * x) ** exponent
+BRIGGS_SIGMA_Z_PARAMS = {
+    'A': (0.20, 0.0, 0.0),
+    'B': (0.12, 0.0, 0.0),
+    'C': (0.08, 0.0001, -0.5),
+    'D': (0.06, 0.0015, -0.5),
+    'E': (0.03, 0.0003, -1.0),
+    'F': (0.016, 0.0003, -1.0),
+}
+
+# Grid: 1 m .. 100 km; lookups outside extrapolate along the end cells
+GRID_MIN_M = 1.0
+GRID_MAX_M = 100_000.0
+POINTS_PER_DECADE = 200
+
+# sigma_y switches formula at 1 km, which is a grid node
+_SIGMA_Y_BRANCH_M = 1000.0
+
+# exp() of larger values overflows; such sigmas make the concentration zero anyway
+_MAX_LOG_SIGMA = 700.0
+_MAX_SIGMA = math.exp(_MAX_LOG_SIGMA)
+
+
+def sigma_y_closed_form(distance_m: float, stability: str) -> float:
+    """Horizontal dispersion coefficient from the closed-form expression.
+
+    1 m where distance <= 0; the far branch is capped like the tables
+    instead of overflowing.
+    """
+    if distance_m <= 0:
+        return 1.0
+    params = PG_SIGMA_Y_PARAMS.get(stability) or PG_SIGMA_Y_PARAMS['D']
+
+    x_km = distance_m / 1000.0
+
+    if x_km < 1.0:
+        theta = 0.017453293 * (params['c'] - params['d'] * math.log(x_km))
+        sigma_y = params['a'] * x_km * math.tan(theta)
+    else:
+        try:
+            sigma_y = params['b'] * (x_km ** params['f'] / 1000)
+        except OverflowError:
+            return _MAX_SIGMA
+        if sigma_y > _MAX_SIGMA:
+            return _MAX_SIGMA
+
+    # Conditional instead of max(): this runs once per incident and receptor
+    return sigma_y if sigma_y > 1.0 else 1.0
+
+
+def sigma_z_closed_form(distance_m: float, stability: str) -> float:
+    """Vertical dispersion coefficient from the closed-form expression; 1 m where distance <= 0."""
+    if distance_m <= 0:
+        return 1.0
+    a, b, exponent = BRIGGS_SIGMA_Z_PARAMS.get(stability) or BRIGGS_SIGMA_Z_PARAMS['D']
+    sigma_z = a * distance_m * (1 + b * distance_m) ** exponent
+    return sigma_z if sigma_z > 1.0 else 1.0
+
+
+# Stand-in for log(sigma) where the near-field expression is not positive
+_LOG_SIGMA_FLOOR = -10.0
+
+
+def _log_sigma_y(distance_m: float, stability: str) -> float:
+    """log of sigma_y before the 1 m floor is applied.
+
+    The floor is applied after interpolation; tabulating the unclamped
+    curve keeps the kink where sigma crosses 1 m out of the table. The far
+    branch is evaluated in log space so it cannot overflow.
+    """
+    params = PG_SIGMA_Y_PARAMS.get(stability, PG_SIGMA_Y_PARAMS['D'])
+    x_km = distance_m / 1000.0
+    if distance_m < _SIGMA_Y_BRANCH_M:
+        theta = 0.017453293 * (params['c'] - params['d'] * math.log(x_km))
+        sigma_y = params['a'] * x_km * math.tan(theta)
+        return math.log(sigma_y) if sigma_y > 0 else _LOG_SIGMA_FLOOR
+    return math.log(params['b'] / 1000) + params['f'] * math.log(x_km)
+
+
+def _log_sigma_z(distance_m: float, stability: str) -> float:
+    """log of sigma_z before the 1 m floor is applied."""
+    a, b, exponent = BRIGGS_SIGMA_Z_PARAMS.get(stability, BRIGGS_SIGMA_Z_PARAMS['D'])
+    return math.log(a * distance_m) + exponent * math.log(1 + b * distance_m)
+
+
+class _LogLogTable:
+    """log(sigma) tabulated per cell of a uniform log10(distance) grid.
+
+    Each cell stores its value at the left edge and the change up to just
+    below its right edge, so a formula switch at a grid node (sigma_y at
+    1 km) is reproduced without smoothing it over.
+    """
+
+    __slots__ = ("log_x0", "last", "array_values", "array_slopes")
+
+    def __init__(self, x_lo: float, x_hi: float, log_func) -> None:
+        """Tabulate log_func, which maps a distance in meters to log(sigma)."""
+        self.log_x0 = math.log10(x_lo)
+        cells = int(round((math.log10(x_hi) - self.log_x0) * POINTS_PER_DECADE))
+        # Decimal exponents keep nodes such as 1 km exact
+        nodes = [10 ** (self.log_x0 + i / POINTS_PER_DECADE) for i in range(cells + 1)]
+
+        self.last = cells - 1
+        values = [log_func(nodes[i]) for i in range(cells)]
+        slopes = [log_func(math.nextafter(nodes[i + 1], 0.0)) - values[i] for i in range(cells)]
+        self.array_values = np.array(values)
+        self.array_slopes = np.array(slopes)
+
+
+class DispersionTable:
+    """sigma_y and sigma_z lookup for one stability class."""
+
+    def __init__(self, stability: str) -> None:
+        """Tabulate both coefficients for the stability class."""
+        self.stability = stability
+        self._sigma_y = _LogLogTable(GRID_MIN_M, GRID_MAX_M, lambda x: _log_sigma_y(x, stability))
+        self._sigma_z = _LogLogTable(GRID_MIN_M, GRID_MAX_M, lambda x: _log_sigma_z(x, stability))
+
+    def sigmas_array(self, distance_m: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Return (sigma_y, sigma_z) for an array of distances; 1 m where distance <= 0.
+
+        Both tables share the grid, so the cell position is computed once.
+        """
+        x = np.asarray(distance_m, dtype=float)
+        positive = x > 0
+        all_positive = positive.all()
+        if not all_positive:
+            x = np.where(positive, x, 1.0)
+
+        position = (np.log10(x) - self._sigma_y.log_x0) * POINTS_PER_DECADE
+        index = np.clip(position.astype(np.intp), 0, self._sigma_y.last)
+        fraction = position - index
+
+        sigmas = []
+        for table in (self._sigma_y, self._sigma_z):
+            log_sigma = table.array_values[index] + table.array_slopes[index] * fraction
+            np.clip(log_sigma, 0.0, _MAX_LOG_SIGMA, out=log_sigma)
+            if not all_positive:
+                log_sigma[~positive] = 0.0
+            sigmas.append(np.exp(log_sigma, out=log_sigma))
+        return sigmas[0], sigmas[1]
+
+
+_TABLES: dict[str, DispersionTable] = {}
+
+
+def get_table(stability: str) -> DispersionTable:
+    """Return the table of a stability class, building it on first use.
+
+    Unknown classes fall back to D (neutral), like the closed-form expressions.
+    """
+    if stability not in PG_SIGMA_Y_PARAMS:
+        stability = 'D'
+    table = _TABLES.get(stability)
+    if table is None:
+        table = _TABLES[stability] = DispersionTable(stability)
+    return table
+
+
+def sigmas_array(distance_m: np.ndarray, stability: str) -> tuple[np.ndarray, np.ndarray]:
+    """Interpolated (sigma_y, sigma_z) for an array of distances."""
+    return get_table(stability).sigmas_array(distance_m)
@@ -0,0 +1,188 @@
+"""
+Monte Carlo wind-uncertainty ensemble.
+
+Samples wind direction, wind speed and stability class around the observed
+values and evaluates every member against every incident with the
+vectorized plume of _plume_raster. Members are grouped per stability class,
+so one ensemble is at most six array evaluations.
+"""
+from __future__ import annotations
+
+import numpy as np
+
+from ._batch_risk import (
+    MAX_RISK_DISTANCE_KM,
+    bearing_array,
+    concentration_to_risk,
+    crosswind_array,
+    haversine_distance_array,
+)
+from ._plume_raster import gaussian_plume_concentration_array
+
+STABILITY_CLASSES = "ABCDEF"
+
+DEFAULT_MEMBERS = 1000
+# Standard deviation of the wind direction in degrees
+DEFAULT_DIRECTION_SPREAD = 15.0
+# Standard deviation of log(wind speed); 0.3 is roughly +/- 30 %
+DEFAULT_SPEED_SPREAD = 0.3
+# Probability of the estimated class and of its neighbours (one class
+# more and one class less stable); _estimate_stability_class is a heuristic
+DEFAULT_STABILITY_WEIGHTS = {-1: 0.25, 0: 0.5, 1: 0.25}
+DEFAULT_RISK_THRESHOLD = 1.0
+# Wind speeds are kept above calm, where the plume formula breaks down
+MIN_WIND_SPEED = 0.5
+
+
+class EnsembleResult:
+    """Combined risk at one receptor for every ensemble member."""
+
+    __slots__ = (
+        "risks",
+        "threshold",
+        "wind_directions",
+        "wind_speeds",
+        "stability_classes",
+        "concentrations",
+        "distances_km",
+    )
+
+    def __init__(
+        self,
+        risks: np.ndarray,
+        threshold: float,
+        wind_directions: np.ndarray,
+        wind_speeds: np.ndarray,
+        stability_classes: np.ndarray,
+        concentrations: np.ndarray | None = None,
+        distances_km: np.ndarray | None = None,
+    ) -> None:
+        """Initialize from per-member risk percentages and the sampled inputs.
+
+        concentrations optionally holds the member mean per incident and
+        distances_km the incident distances, in incident order.
+        """
+        self.risks = risks
+        self.threshold = threshold
+        self.wind_directions = wind_directions
+        self.wind_speeds = wind_speeds
+        self.stability_classes = stability_classes
+        self.concentrations = concentrations
+        self.distances_km = distances_km
+
+    @property
+    def members(self) -> int:
+        """Return the number of members."""
+        return len(self.risks)
+
+    @property
+    def median(self) -> float:
+        """Return the median risk percentage."""
+        return float(np.median(self.risks))
+
+    @property
+    def p90(self) -> float:
+        """Return the 90th percentile risk percentage."""
+        return float(np.percentile(self.risks, 90))
+
+    def exceedance_probability(self, threshold: float | None = None) -> float:
+        """Return the fraction of members whose risk exceeds threshold."""
+        if threshold is None:
+            threshold = self.threshold
+        return float(np.count_nonzero(self.risks > threshold)) / max(len(self.risks), 1)
+
+    def as_dict(self) -> dict[str, float | int]:
+        """Return the summary published in home_danger."""
+        return {
+            "members": self.members,
+            "median_risk": round(self.median, 2),
+            "p90_risk": round(self.p90, 2),
+            "threshold": self.threshold,
+            "exceedance_probability": round(self.exceedance_probability(), 3),
+        }
+
+
+def sample_stability_classes(
+    stability_class: str,
+    members: int,
+    rng: np.random.Generator,
+    weights: dict[int, float] | None = None,
+) -> np.ndarray:
+    """Draw a class index (0 = A .. 5 = F) per member around stability_class.
+
+    weights maps an offset from the estimated class to its probability;
+    offsets past A or F are folded onto the end class.
+    """
+    weights = DEFAULT_STABILITY_WEIGHTS if weights is None else weights
+    center = STABILITY_CLASSES.find(stability_class)
+    if center < 0:
+        center = STABILITY_CLASSES.index("D")
+    offsets = np.array(list(weights), dtype=int)
+    probabilities = np.array(list(weights.values()), dtype=float)
+    drawn = rng.choice(offsets, size=members, p=probabilities / probabilities.sum())
+    return np.clip(center + drawn, 0, len(STABILITY_CLASSES) - 1)
+
+
+def run_ensemble(
+    receptor_lat: float,
+    receptor_lon: float,
+    incident_lats: np.ndarray,
+    incident_lons: np.ndarray,
+    wind_direction: float,
+    wind_speed: float,
+    stability_class: str = "D",
+    members: int = DEFAULT_MEMBERS,
+    direction_spread: float = DEFAULT_DIRECTION_SPREAD,
+    speed_spread: float = DEFAULT_SPEED_SPREAD,
+    stability_weights: dict[int, float] | None = None,
+    threshold: float = DEFAULT_RISK_THRESHOLD,
+    rng: np.random.Generator | None = None,
+) -> EnsembleResult:
+    """Evaluate the summed risk of all incidents for every ensemble member.
+
+    Wind direction is sampled from a normal distribution, wind speed from a
+    log-normal distribution with the observed speed as median, and the
+    stability class from stability_weights around the estimated class.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    directions = (wind_direction + rng.normal(0.0, direction_spread, members)) % 360
+    speeds = np.maximum(
+        max(wind_speed, MIN_WIND_SPEED) * np.exp(rng.normal(0.0, speed_spread, members)),
+        MIN_WIND_SPEED,
+    )
+    classes = sample_stability_classes(stability_class, members, rng, stability_weights)
+
+    # Geometry does not depend on the member: one row of incidents
+    incident_lats = np.asarray(incident_lats, dtype=float).reshape(1, -1)
+    incident_lons = np.asarray(incident_lons, dtype=float).reshape(1, -1)
+    distance_km = haversine_distance_array(receptor_lat, receptor_lon, incident_lats, incident_lons)
+    bearing = bearing_array(incident_lats, incident_lons, receptor_lat, receptor_lon)
+    in_range = distance_km <= MAX_RISK_DISTANCE_KM
+
+    total = np.zeros(members)
+    per_incident = np.zeros(incident_lats.shape[1])
+    for index in np.unique(classes):
+        group = classes == index
+        # members x incidents
+        crosswind_m = crosswind_array(distance_km, bearing, directions[group, None])
+        concentration = gaussian_plume_concentration_array(
+            distance_km * 1000,
+            crosswind_m,
+            height_m=2.0,
+            source_height=20.0,
+            wind_speed=speeds[group, None],
+            stability_class=STABILITY_CLASSES[index],
+        )
+        concentration = concentration * in_range
+        total[group] = concentration.sum(axis=1)
+        per_incident += concentration.sum(axis=0)
+
+    return EnsembleResult(
+        concentration_to_risk(total),
+        threshold,
+        directions,
+        speeds,
+        np.array(list(STABILITY_CLASSES))[classes],
+        per_incident / members,
+        distance_km[0],
+    )
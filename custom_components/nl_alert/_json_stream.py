@@ -0,0 +1,111 @@
+"""
+Incremental JSON decoding for large alert feeds.
+
+Decodes the array stored under one key of a top-level JSON object element
+by element, so only the current element and one chunk of the body are held
+in memory instead of the full response text and its decoded tree.
+"""
+from __future__ import annotations
+
+import codecs
+import json
+from typing import Any, AsyncIterable, AsyncIterator
+
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",:]}"
+_DECODER = json.JSONDecoder()
+
+
+class _ChunkBuffer:
+    """Text buffer that is refilled from an async byte-chunk iterator."""
+
+    def __init__(self, chunks: AsyncIterable[bytes]) -> None:
+        """Initialize the buffer."""
+        self._chunks = chunks.__aiter__()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    async def fill(self) -> None:
+        """Drop consumed text and append the next chunk."""
+        try:
+            chunk = await self._chunks.__anext__()
+        except StopAsyncIteration:
+            self.eof = True
+            chunk = b""
+        self.text = self.text[self.pos:] + self._utf8.decode(chunk, final=self.eof)
+        self.pos = 0
+
+    async def peek(self) -> str | None:
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            text = self.text
+            pos = self.pos
+            while pos < len(text) and text[pos] in _WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < len(text):
+                return text[pos]
+            if self.eof:
+                return None
+            await self.fill()
+
+    async def expect(self, char: str) -> None:
+        """Consume the next non-whitespace character, which must be char."""
+        found = await self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} in JSON feed, got {found!r}")
+        self.pos += 1
+
+    async def decode_value(self) -> Any:
+        """Decode one complete JSON value, reading more chunks as needed."""
+        await self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+                await self.fill()
+                continue
+            # A number cut off by the chunk boundary decodes early; wait for its end
+            if not self.eof and (end == len(self.text) or self.text[end] not in _DELIMITERS):
+                await self.fill()
+                continue
+            self.pos = end
+            return value
+
+
+async def async_iter_json_array(
+    chunks: AsyncIterable[bytes], key: str
+) -> AsyncIterator[Any]:
+    """Yield the elements of the array stored under key, one at a time.
+
+    Other top-level members are decoded and discarded. Reading stops as soon
+    as the array is complete. A missing key yields nothing.
+    """
+    buffer = _ChunkBuffer(chunks)
+    await buffer.expect("{")
+    if await buffer.peek() == "}":
+        return
+
+    while True:
+        name = await buffer.decode_value()
+        await buffer.expect(":")
+
+        if name == key and await buffer.peek() == "[":
+            buffer.pos += 1
+            if await buffer.peek() == "]":
+                return
+            while True:
+                yield await buffer.decode_value()
+                if await buffer.peek() == "]":
+                    return
+                await buffer.expect(",")
+        else:
+            await buffer.decode_value()
+
+        if await buffer.peek() == "}":
+            return
+        await buffer.expect(",")
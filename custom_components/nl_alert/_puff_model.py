@@ -0,0 +1,305 @@
+"""
+Lagrangian puff dispersion engine.
+
+Each active incident releases a puff at a fixed interval. Puffs are carried
+by the wind observed while they travel, so a plume that was released before
+the wind turned keeps its old path instead of snapping to the new
+direction as the steady-state Gaussian plume does. The puff state lives
+between coordinator updates and is advanced by the elapsed time.
+
+A puff holds the mass released during one interval, spread along its
+direction of travel over the distance the wind covered in that interval
+(a "slug"). In a steady wind the puffs join up into the Gaussian plume of
+_atmospheric_model, even though the near-field sigma_y is far smaller than
+the spacing between puff centres.
+"""
+from __future__ import annotations
+
+import math
+from datetime import datetime
+
+import numpy as np
+
+from ._batch_risk import SuperpositionResult, haversine_distance_array
+from ._dispersion_tables import sigmas_array
+
+# Meters per degree latitude (spherical earth, R = 6371 km)
+_METERS_PER_DEGREE = 6371000.0 * math.pi / 180.0
+
+# Seconds between puffs of one source
+PUFF_RELEASE_INTERVAL = 60.0
+
+# Longest interval advanced in one go; a longer gap (e.g. after a restart)
+# is not replayed, the puffs simply continue from the last state
+MAX_ADVANCE_SECONDS = 3600.0
+
+# Puffs are retired when their ground-level concentration can no longer
+# exceed this, or when they are older than PUFF_MAX_AGE seconds
+PUFF_MIN_CONCENTRATION = 1e-9
+PUFF_MAX_AGE = 6 * 3600.0
+MAX_PUFFS = 20000
+
+# Below this the wind is treated as calm (puffs grow but do not move)
+MIN_WIND_SPEED = 0.5
+
+
+def _erf(x: np.ndarray) -> np.ndarray:
+    """Error function (Abramowitz & Stegun 7.1.26, absolute error < 1.5e-7)."""
+    sign = np.sign(x)
+    x = np.abs(x)
+    t = 1.0 / (1.0 + 0.3275911 * x)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    with np.errstate(under="ignore"):
+        return sign * (1.0 - poly * np.exp(-x * x))
+
+
+class PuffTracker:
+    """Puffs of all active incidents, advanced on every coordinator update.
+
+    Puff state is kept in parallel NumPy arrays: position (lat, lon), mass,
+    slug length and heading, distance travelled (which sets sigma_y and
+    sigma_z), age and source id.
+    """
+
+    _FIELDS = ("lat", "lon", "mass", "length", "heading", "travel", "age", "source")
+
+    def __init__(
+        self,
+        emission_rate: float = 1.0,
+        source_height: float = 20.0,
+        stability_class: str = "D",
+        release_interval: float = PUFF_RELEASE_INTERVAL,
+    ) -> None:
+        """Initialize an empty tracker."""
+        self.emission_rate = emission_rate
+        self.source_height = source_height
+        self.stability_class = stability_class
+        self.release_interval = release_interval
+
+        self.lat = np.empty(0)
+        self.lon = np.empty(0)
+        self.mass = np.empty(0)
+        self.length = np.empty(0)
+        self.heading = np.empty(0)
+        self.travel = np.empty(0)
+        self.age = np.empty(0)
+        self.source = np.empty(0, dtype=np.intp)
+
+        self._source_ids: dict[str, int] = {}
+        self._last_update: datetime | None = None
+        # Wind observed at the last update; it carried the puffs since then
+        self._wind: tuple[float, float] | None = None
+        # Seconds since each active source released its last puff
+        self._since_release: dict[str, float] = {}
+
+    def __len__(self) -> int:
+        """Return the number of live puffs."""
+        return len(self.mass)
+
+    @property
+    def last_update(self) -> datetime | None:
+        """Return the time the puffs were last advanced to."""
+        return self._last_update
+
+    def _source_index(self, source_id: str) -> int:
+        """Return the integer tag of a source, assigning one on first use."""
+        index = self._source_ids.get(source_id)
+        if index is None:
+            index = self._source_ids[source_id] = len(self._source_ids)
+        return index
+
+    def advance(
+        self,
+        now: datetime,
+        sources: dict[str, tuple[float, float]],
+        wind_direction: float,
+        wind_speed: float,
+    ) -> None:
+        """Move puffs to now and release new ones for the active sources.
+
+        sources maps an incident id to its (lat, lon). wind_direction is where
+        the wind comes FROM. The puffs travel with the previously observed
+        wind for the elapsed interval; the new observation is used from now on.
+        """
+        elapsed = 0.0
+        if self._last_update is not None:
+            elapsed = min(max((now - self._last_update).total_seconds(), 0.0), MAX_ADVANCE_SECONDS)
+        self._last_update = now
+        carrying_wind = self._wind or (wind_direction, wind_speed)
+        self._wind = (wind_direction, wind_speed)
+
+        if elapsed > 0 and len(self):
+            self._move(self.lat, self.lon, self.heading, self.travel, elapsed, *carrying_wind)
+            self.age += elapsed
+
+        # Incidents that are no longer active stop releasing; their puffs live on
+        self._since_release = {
+            source_id: self._since_release.get(source_id, self.release_interval)
+            for source_id in sources
+        }
+        for source_id, (lat, lon) in sources.items():
+            self._release(source_id, lat, lon, elapsed, carrying_wind)
+
+        self._retire()
+
+    @staticmethod
+    def _move(
+        lat: np.ndarray,
+        lon: np.ndarray,
+        heading: np.ndarray,
+        travel: np.ndarray,
+        seconds: np.ndarray | float,
+        wind_direction: float,
+        wind_speed: float,
+    ) -> None:
+        """Advect puffs in place for the given time with a constant wind."""
+        if wind_speed < MIN_WIND_SPEED:
+            # Windstil: de puff groeit ter plaatse met de tijd
+            travel += MIN_WIND_SPEED * seconds
+            return
+        bearing = math.radians((wind_direction + 180.0) % 360.0)
+        distance = wind_speed * seconds
+        lat += distance * math.cos(bearing) / _METERS_PER_DEGREE
+        lon += distance * math.sin(bearing) / (_METERS_PER_DEGREE * np.cos(np.radians(lat)))
+        heading[:] = bearing
+        travel += distance
+
+    def _release(
+        self,
+        source_id: str,
+        lat: float,
+        lon: float,
+        elapsed: float,
+        wind: tuple[float, float],
+    ) -> None:
+        """Release the puffs a source emitted during the elapsed interval.
+
+        Puffs released earlier in the interval have already travelled for
+        the remaining time, so a continuous release forms a trail.
+        """
+        since = self._since_release[source_id] + elapsed
+        count = int(since // self.release_interval)
+        self._since_release[source_id] = since - count * self.release_interval
+        if count == 0:
+            return
+
+        # Time each new puff has already spent in the air
+        in_air = since - self.release_interval * np.arange(1, count + 1)
+        new_lat = np.full(count, lat)
+        new_lon = np.full(count, lon)
+        new_heading = np.full(count, math.radians((wind[0] + 180.0) % 360.0))
+        new_travel = np.zeros(count)
+        self._move(new_lat, new_lon, new_heading, new_travel, in_air, *wind)
+        length = max(wind[1], MIN_WIND_SPEED) * self.release_interval
+
+        new = {
+            "lat": new_lat,
+            "lon": new_lon,
+            "mass": np.full(count, self.emission_rate * self.release_interval),
+            "length": np.full(count, length),
+            "heading": new_heading,
+            "travel": new_travel,
+            "age": in_air,
+            "source": np.full(count, self._source_index(source_id)),
+        }
+        for name in self._FIELDS:
+            setattr(self, name, np.concatenate((getattr(self, name), new[name])))
+
+    def _sigmas(self) -> tuple[np.ndarray, np.ndarray]:
+        """Return sigma_y and sigma_z of every puff from its travel distance."""
+        return sigmas_array(np.maximum(self.travel, 1.0), self.stability_class)
+
+    def _retire(self) -> None:
+        """Drop puffs that are too diluted or too old, and the oldest beyond MAX_PUFFS.
+
+        Sources that no longer release and have no puffs left are forgotten.
+        """
+        if len(self):
+            # Upper bound of the ground-level concentration; unlike the actual
+            # peak it only decreases, so puffs that have not reached the ground
+            # yet are kept
+            sigma_y, sigma_z = self._sigmas()
+            bound = 2 * self.mass / (2 * math.pi * self.length * sigma_y * sigma_z)
+            keep = (bound >= PUFF_MIN_CONCENTRATION) & (self.age <= PUFF_MAX_AGE)
+            if np.count_nonzero(keep) > MAX_PUFFS:
+                keep &= self.age <= np.sort(self.age[keep])[MAX_PUFFS - 1]
+            if not keep.all():
+                for name in self._FIELDS:
+                    setattr(self, name, getattr(self, name)[keep])
+        self._retire_sources()
+
+    def _retire_sources(self) -> None:
+        """Forget sources without puffs or releases and re-tag the rest as 0..n-1.
+
+        Keeps the tags, and with them the bincount in concentrations_at,
+        bounded by the live sources instead of every incident ever seen.
+        """
+        source_ids = self._source_ids
+        has_puffs = np.bincount(self.source, minlength=len(source_ids)) > 0
+        kept = [
+            source_id
+            for source_id, index in source_ids.items()
+            if has_puffs[index] or source_id in self._since_release
+        ]
+        if len(kept) == len(source_ids):
+            return
+        remap = np.zeros(len(source_ids), dtype=np.intp)
+        self._source_ids = {}
+        for index, source_id in enumerate(kept):
+            remap[source_ids[source_id]] = index
+            self._source_ids[source_id] = index
+        self.source = remap[self.source]
+
+    def concentrations_at(
+        self, lat: float, lon: float, source_ids: list[str], height_m: float = 2.0
+    ) -> np.ndarray:
+        """Return the concentration at a point contributed by each listed source."""
+        result = np.zeros(len(source_ids))
+        if not len(self):
+            return result
+
+        sigma_y, sigma_z = self._sigmas()
+        north = (lat - self.lat) * _METERS_PER_DEGREE
+        east = (lon - self.lon) * _METERS_PER_DEGREE * math.cos(math.radians(lat))
+        along = east * np.sin(self.heading) + north * np.cos(self.heading)
+        cross = east * np.cos(self.heading) - north * np.sin(self.heading)
+
+        with np.errstate(under="ignore"):
+            half = self.length / 2
+            scale = math.sqrt(2) * sigma_y
+            along_term = 0.5 * (_erf((along + half) / scale) - _erf((along - half) / scale)) / self.length
+            cross_term = np.exp(-0.5 * (cross / sigma_y) ** 2) / (math.sqrt(2 * math.pi) * sigma_y)
+            z_terms = np.exp(-0.5 * ((height_m - self.source_height) / sigma_z) ** 2) + np.exp(
+                -0.5 * ((height_m + self.source_height) / sigma_z) ** 2
+            )
+            values = self.mass * along_term * cross_term * z_terms / (math.sqrt(2 * math.pi) * sigma_z)
+
+        per_source = np.bincount(self.source, weights=values, minlength=len(self._source_ids))
+        for position, source_id in enumerate(source_ids):
+            index = self._source_ids.get(source_id)
+            if index is not None:
+                result[position] = per_source[index]
+        return result
+
+    def superpose(
+        self,
+        now: datetime,
+        receptor_lat: float,
+        receptor_lon: float,
+        sources: dict[str, tuple[float, float]],
+        wind_direction: float,
+        wind_speed: float,
+    ) -> SuperpositionResult:
+        """Advance to now and return the per-incident exposure at the receptor.
+
+        The result has the same shape as _batch_risk.superpose_incidents, in
+        the order of sources.
+        """
+        self.advance(now, sources, wind_direction, wind_speed)
+        source_ids = list(sources)
+        lats = np.array([sources[source_id][0] for source_id in source_ids])
+        lons = np.array([sources[source_id][1] for source_id in source_ids])
+        return SuperpositionResult(
+            self.concentrations_at(receptor_lat, receptor_lon, source_ids),
+            haversine_distance_array(receptor_lat, receptor_lon, lats, lons),
+        )
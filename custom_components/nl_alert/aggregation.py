@@ -0,0 +1,163 @@
+"""Single-pass aggregation of NL-Alert alerts."""
+from __future__ import annotations
+
+import heapq
+from datetime import datetime
+from itertools import count
+from typing import Iterable
+
+from .classifier import HazardClassifier
+from .const import SEVERITY_EXTREME, SEVERITY_MINOR, SEVERITY_MODERATE, SEVERITY_SEVERE
+from .models import Alert
+
+
+class AlertSummary:
+    """Everything derived from the active alerts at one instant."""
+
+    __slots__ = (
+        "computed_at",
+        "active",
+        "hazardous",
+        "severity_counts",
+        "severe_count",
+        "has_severe",
+        "has_extreme",
+        "category_counts",
+        "next_expiry",
+    )
+
+    def __init__(self, computed_at: datetime) -> None:
+        """Initialize an empty summary."""
+        self.computed_at = computed_at
+        self.active: list[Alert] = []
+        self.hazardous: list[Alert] = []
+        self.severity_counts = {
+            SEVERITY_MINOR: 0,
+            SEVERITY_MODERATE: 0,
+            SEVERITY_SEVERE: 0,
+            SEVERITY_EXTREME: 0,
+        }
+        self.severe_count = 0
+        self.has_severe = False
+        self.has_extreme = False
+        self.category_counts: dict[str, int] = {}
+        # Earliest expiry among the active alerts; the summary is stale after it
+        self.next_expiry: datetime | None = None
+
+    def is_valid_at(self, now: datetime) -> bool:
+        """Return True if no active alert has expired since the summary was made."""
+        return self.next_expiry is None or now < self.next_expiry
+
+    def without(
+        self,
+        expired: Iterable[Alert],
+        now: datetime,
+        classifier: HazardClassifier | None = None,
+    ) -> AlertSummary:
+        """Return a summary with the expired alerts removed.
+
+        Counts are decremented for the removed alerts only; no timestamp is
+        parsed and no other alert is classified again.
+        """
+        gone = {id(alert) for alert in expired}
+        summary = AlertSummary(now)
+        summary.severity_counts = dict(self.severity_counts)
+        summary.category_counts = dict(self.category_counts)
+        next_expiry = None
+
+        for alert in self.active:
+            if id(alert) not in gone:
+                summary.active.append(alert)
+                expires_at = alert.expires_at
+                if expires_at is not None and (next_expiry is None or expires_at < next_expiry):
+                    next_expiry = expires_at
+                continue
+            if alert.severity in summary.severity_counts:
+                summary.severity_counts[alert.severity] -= 1
+            if classifier is not None:
+                for category in classifier.classify(alert):
+                    remaining = summary.category_counts.get(category, 0) - 1
+                    if remaining > 0:
+                        summary.category_counts[category] = remaining
+                    else:
+                        summary.category_counts.pop(category, None)
+
+        summary.hazardous = [alert for alert in self.hazardous if id(alert) not in gone]
+        counts = summary.severity_counts
+        summary.severe_count = counts[SEVERITY_SEVERE] + counts[SEVERITY_EXTREME]
+        summary.has_severe = summary.severe_count > 0
+        summary.has_extreme = counts[SEVERITY_EXTREME] > 0
+        summary.next_expiry = next_expiry
+        return summary
+
+
+class ExpiryQueue:
+    """Min-heap of active alerts ordered by expiry time."""
+
+    def __init__(self) -> None:
+        """Initialize an empty queue."""
+        self._heap: list[tuple[datetime, int, Alert]] = []
+        # Tie-breaker so alerts themselves are never compared
+        self._counter = count()
+
+    def reset(self, alerts: Iterable[Alert]) -> None:
+        """Replace the queue contents with the alerts that have an expiry time."""
+        self._heap = [
+            (alert.expires_at, next(self._counter), alert)
+            for alert in alerts
+            if alert.expires_at is not None
+        ]
+        heapq.heapify(self._heap)
+
+    @property
+    def next_expiry(self) -> datetime | None:
+        """Return the soonest expiry time, if any."""
+        return self._heap[0][0] if self._heap else None
+
+    def pop_expired(self, now: datetime) -> list[Alert]:
+        """Remove and return all alerts that expired at or before now."""
+        expired = []
+        while self._heap and self._heap[0][0] <= now:
+            expired.append(heapq.heappop(self._heap)[2])
+        return expired
+
+    def __len__(self) -> int:
+        """Return the number of queued alerts."""
+        return len(self._heap)
+
+
+def summarize_alerts(
+    alerts: Iterable[Alert],
+    now: datetime,
+    classifier: HazardClassifier | None = None,
+) -> AlertSummary:
+    """Build the active set, severity histogram and hazard counts in one pass."""
+    summary = AlertSummary(now)
+    counts = summary.severity_counts
+    category_counts = summary.category_counts
+    next_expiry = None
+
+    for alert in alerts:
+        expires_at = alert.expires_at
+        if expires_at is not None:
+            if expires_at <= now:
+                continue
+            if next_expiry is None or expires_at < next_expiry:
+                next_expiry = expires_at
+
+        summary.active.append(alert)
+        if alert.severity in counts:
+            counts[alert.severity] += 1
+
+        if classifier is not None:
+            categories = classifier.classify(alert)
+            if categories:
+                summary.hazardous.append(alert)
+                for category in categories:
+                    category_counts[category] = category_counts.get(category, 0) + 1
+
+    summary.severe_count = counts[SEVERITY_SEVERE] + counts[SEVERITY_EXTREME]
+    summary.has_severe = summary.severe_count > 0
+    summary.has_extreme = counts[SEVERITY_EXTREME] > 0
+    summary.next_expiry = next_expiry
+    return summary
@@ -4,8 +4,8 @@ from __future__ import annotations
 import asyncio
 import logging
 import math
-from datetime import datetime
-from typing import Any
+from datetime import datetime, timezone
+from typing import Any, Callable
 
 import aiohttp
 import async_timeout
@@ -13,93 +13,236 @@ import async_timeout
 from .const import (
     API_ENDPOINT_ALERTS,
     API_ENDPOINT_RECENT_ALERTS,
-    KNMI_STATIONS_ENDPOINT,
     PLUME_STATUS_SAFE,
     PLUME_STATUS_CAUTION, 
     PLUME_STATUS_DANGER,
     DEFAULT_STABILITY_CLASS,
+    DEFAULT_WIND_DIRECTION,
+    DEFAULT_WIND_SPEED,
     MAX_PLUME_DISTANCE,
 )
+from ._dispersion_tables import sigma_y_closed_form, sigma_z_closed_form
+from ._json_stream import async_iter_json_array
+from .aggregation import AlertSummary, summarize_alerts
+from .classifier import HazardClassifier
+from .knmi import KNMIObservationsClient
+from .models import Alert
 
 _LOGGER = logging.getLogger(__name__)
 
+# Read size used when decoding feeds incrementally
+STREAM_CHUNK_SIZE = 64 * 1024
+
 
 class NLAlertAPI:
     """Class to communicate with NL-Alert API."""
 
-    def __init__(self, session: aiohttp.ClientSession) -> None:
-        """Initialize the API client."""
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        stream_decode: bool = False,
+        knmi: KNMIObservationsClient | None = None,
+    ) -> None:
+        """Initialize the API client.
+
+        With stream_decode the feed body is decoded alert by alert while it
+        is read and every alert becomes an Alert as soon as it is decoded, so
+        neither the whole body nor the decoded dicts are held at once.
+        knmi supplies station observations when no weather entity is set.
+        """
         self.session = session
-        self._alerts: list[dict[str, Any]] = []
+        self.stream_decode = stream_decode
+        self.knmi = knmi
+        self._alerts: list[Alert] = []
+        self._alert_table: dict[str, Alert] = {}
+        self._summary: AlertSummary | None = None
+        self._summary_classifier: HazardClassifier | None = None
+        # Conditional GET state per endpoint
+        self._validators: dict[str, dict[str, str | None]] = {}
+        self._feed_cache: dict[str, list[Alert]] = {}
+        self._modified: dict[str, bool] = {}
+        self._poll_count = 0
+        self._unchanged_poll_count = 0
+        self._request_count = 0
+        self._not_modified_count = 0
 
-    async def async_get_alerts(self) -> list[dict[str, Any]]:
+    async def async_get_alerts(self) -> list[Alert]:
         """Get current active alerts from NL-Alert API."""
-        try:
-            async with async_timeout.timeout(10):
-                async with self.session.get(API_ENDPOINT_ALERTS) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        self._alerts = data.get("alerts", [])
-                        _LOGGER.debug("Retrieved %d current alerts", len(self._alerts))
-                        return self._alerts
-                    else:
-                        _LOGGER.error("API returned status %d for current alerts", response.status)
-                        return []
-        except asyncio.TimeoutError:
-            _LOGGER.error("Timeout while fetching current alerts")
-            return []
-        except aiohttp.ClientError as err:
-            _LOGGER.error("Client error while fetching current alerts: %s", err)
-            return []
-        except Exception as err:
-            _LOGGER.error("Unexpected error while fetching current alerts: %s", err)
-            return []
+        alerts = await self._async_fetch_alerts(API_ENDPOINT_ALERTS, "current alerts")
+        if alerts is not self._alerts:
+            self._alerts = alerts
+            self._summary = None
+        return alerts
+
+    async def async_get_recent_alerts(
+        self, on_alert: Callable[[Alert], None] | None = None
+    ) -> list[Alert]:
+        """Get recent alerts from last 24h for historical data.
+
+        With on_alert every alert is handed over as soon as it is decoded and
+        the returned list is empty; a 304 hands over nothing.
+        """
+        return await self._async_fetch_alerts(
+            API_ENDPOINT_RECENT_ALERTS, "recent alerts (last 24h)", on_alert
+        )
+
+    async def async_get_alert_feeds(
+        self, on_recent_alert: Callable[[Alert], None] | None = None
+    ) -> tuple[list[Alert], list[Alert]]:
+        """Fetch current and last-24h alerts concurrently.
+
+        Alerts present in both feeds are stored once in the alert table, so
+        the returned recent list shares its entries with the current list.
+        With on_recent_alert the recent feed is not kept as a list but
+        passed to it alert by alert (see async_get_recent_alerts); the table
+        then holds the current alerts only.
+        """
+        current_alerts, recent_alerts = await asyncio.gather(
+            self.async_get_alerts(),
+            self.async_get_recent_alerts(on_recent_alert),
+        )
+        self._poll_count += 1
+        if self.feeds_unchanged:
+            self._unchanged_poll_count += 1
+            return current_alerts, recent_alerts
+
+        table: dict[str, Alert] = {}
+        for alert in current_alerts:
+            if alert.identifier:
+                table[alert.identifier] = alert
+
+        merged_recent = []
+        for alert in recent_alerts:
+            if alert.identifier:
+                alert = table.setdefault(alert.identifier, alert)
+            merged_recent.append(alert)
+
+        # Keep the de-duplicated list so a later 304 reuses shared entries
+        if API_ENDPOINT_RECENT_ALERTS in self._feed_cache:
+            self._feed_cache[API_ENDPOINT_RECENT_ALERTS] = merged_recent
+        self._alert_table = table
+        return current_alerts, merged_recent
+
+    @property
+    def alert_table(self) -> dict[str, Alert]:
+        """Return all known alerts from both feeds keyed by identifier."""
+        return self._alert_table
+
+    def forget_validators(self) -> None:
+        """Make the next poll fetch every feed in full, without a conditional GET."""
+        self._validators.clear()
+        self._feed_cache.clear()
+
+    async def _async_fetch_alerts(
+        self,
+        endpoint: str,
+        label: str,
+        on_alert: Callable[[Alert], None] | None = None,
+    ) -> list[Alert]:
+        """Fetch an alert feed, using a conditional GET when validators are known.
+
+        Alerts are converted to Alert records as they are decoded. A 304
+        response reuses the records built on the previous poll, so the body
+        is neither downloaded nor parsed again. With on_alert the records
+        are passed to it instead of being collected; together with
+        stream_decode no part of the feed is held beyond a read chunk and
+        the alert being decoded.
+        """
+        self._modified[endpoint] = True
+        self._request_count += 1
+        headers = {}
+        validators = self._validators.get(endpoint, {})
+        if endpoint in self._feed_cache:
+            if validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
 
-    async def async_get_recent_alerts(self) -> list[dict[str, Any]]:
-        """Get recent alerts from last 24h for historical data."""
         try:
             async with async_timeout.timeout(10):
-                async with self.session.get(API_ENDPOINT_RECENT_ALERTS) as response:
+                async with self.session.get(endpoint, headers=headers) as response:
+                    if response.status == 304 and endpoint in self._feed_cache:
+                        self._modified[endpoint] = False
+                        self._not_modified_count += 1
+                        alerts = self._feed_cache[endpoint]
+                        _LOGGER.debug("Feed not modified, reusing %d %s", len(alerts), label)
+                        return alerts
                     if response.status == 200:
-                        data = await response.json()
-                        recent_alerts = data.get("alerts", [])
-                        _LOGGER.debug("Retrieved %d recent alerts (last 24h)", len(recent_alerts))
-                        return recent_alerts
+                        alerts: list[Alert] = []
+                        handle = alerts.append if on_alert is None else on_alert
+                        count = 0
+                        if self.stream_decode:
+                            async for alert in async_iter_json_array(
+                                response.content.iter_chunked(STREAM_CHUNK_SIZE), "alerts"
+                            ):
+                                handle(Alert.from_dict(alert))
+                                count += 1
+                        else:
+                            data = await response.json()
+                            for alert in data.get("alerts", []):
+                                handle(Alert.from_dict(alert))
+                                count += 1
+                        self._feed_cache[endpoint] = alerts
+                        self._validators[endpoint] = {
+                            "etag": response.headers.get("ETag"),
+                            "last_modified": response.headers.get("Last-Modified"),
+                        }
+                        _LOGGER.debug("Retrieved %d %s", count, label)
+                        return alerts
                     else:
-                        _LOGGER.error("API returned status %d for recent alerts", response.status)
-                        return []
+                        _LOGGER.error("API returned status %d for %s", response.status, label)
         except asyncio.TimeoutError:
-            _LOGGER.error("Timeout while fetching recent alerts")
-            return []
+            _LOGGER.error("Timeout while fetching %s", label)
         except aiohttp.ClientError as err:
-            _LOGGER.error("Client error while fetching recent alerts: %s", err)
-            return []
+            _LOGGER.error("Client error while fetching %s: %s", label, err)
         except Exception as err:
-            _LOGGER.error("Unexpected error while fetching recent alerts: %s", err)
-            return []
+            _LOGGER.error("Unexpected error while fetching %s: %s", label, err)
 
-    def get_active_alerts(self) -> list[dict[str, Any]]:
+        # Forget validators so the next poll does a full fetch
+        self._validators.pop(endpoint, None)
+        self._feed_cache.pop(endpoint, None)
+        return []
+
+    @property
+    def feeds_unchanged(self) -> bool:
+        """Return True if every feed fetched on the last poll answered 304."""
+        return bool(self._modified) and not any(self._modified.values())
+
+    @property
+    def fetch_stats(self) -> dict[str, int]:
+        """Return conditional GET statistics.
+
+        A poll fetches both feeds; it is unchanged when both answered 304.
+        The request counters count every feed request separately.
+        """
+        return {
+            "polls": self._poll_count,
+            "unchanged_polls": self._unchanged_poll_count,
+            "requests": self._request_count,
+            "not_modified_requests": self._not_modified_count,
+        }
+
+    def get_summary(self, classifier: HazardClassifier | None = None) -> AlertSummary:
+        """Aggregate the current alerts in a single pass.
+
+        The summary is reused until the feed changes or one of its active
+        alerts expires, so repeated calls within a refresh are free.
+        """
+        now = datetime.now(timezone.utc)
+        summary = self._summary
+        if (
+            summary is None
+            or self._summary_classifier is not classifier
+            or not summary.is_valid_at(now)
+        ):
+            summary = summarize_alerts(self._alerts, now, classifier)
+            self._summary = summary
+            self._summary_classifier = classifier
+        return summary
+
+    def get_active_alerts(self) -> list[Alert]:
         """Get currently active alerts."""
-        now = datetime.utcnow()
-        active_alerts = []
-        
-        for alert in self._alerts:
-            try:
-                # Check if alert is still valid
-                expires = alert.get("expires")
-                if expires:
-                    expires_dt = datetime.fromisoformat(expires.replace("Z", "+00:00"))
-                    if expires_dt > now:
-                        active_alerts.append(alert)
-                else:
-                    # If no expiry date, consider it active
-                    active_alerts.append(alert)
-            except (ValueError, TypeError) as err:
-                _LOGGER.warning("Error parsing alert expiry date: %s", err)
-                # Include alert if we can't parse the date
-                active_alerts.append(alert)
-        
-        return active_alerts
+        return self.get_summary(self._summary_classifier).active
 
     def get_alert_count(self) -> int:
         """Get total number of active alerts."""
@@ -107,29 +250,24 @@ class NLAlertAPI:
 
     def get_severity_counts(self) -> dict[str, int]:
         """Get count of alerts by severity."""
-        counts = {"Minor": 0, "Moderate": 0, "Severe": 0, "Extreme": 0}
-        
-        for alert in self.get_active_alerts():
-            # Extract info data (can be list or dict)
-            info_data = {}
-            if isinstance(alert.get("info"), list) and len(alert["info"]) > 0:
-                info_data = alert["info"][0]
-            elif isinstance(alert.get("info"), dict):
-                info_data = alert["info"]
-            
-            severity = info_data.get("severity", "Unknown")
-            if severity in counts:
-                counts[severity] += 1
-        
-        return counts
+        return dict(self.get_summary(self._summary_classifier).severity_counts)
 
     def has_severe_alerts(self) -> bool:
         """Check if there are any severe or extreme alerts."""
-        severity_counts = self.get_severity_counts()
-        return severity_counts.get("Severe", 0) > 0 or severity_counts.get("Extreme", 0) > 0
+        return self.get_summary(self._summary_classifier).has_severe
+
+    async def async_get_weather_data(
+        self,
+        hass,
+        weather_entity_id: str = None,
+        latitude: float | None = None,
+        longitude: float | None = None,
+    ) -> dict[str, Any]:
+        """Get weather data from Home Assistant weather entity or KNMI.
 
-    async def async_get_weather_data(self, hass, weather_entity_id: str = None) -> dict[str, Any]:
-        """Get weather data from Home Assistant weather entity or KNMI."""
+        KNMI data comes from the station nearest to latitude/longitude, from
+        the observations loaded by the last poll; no request is made here.
+        """
         try:
             if weather_entity_id and hass:
                 # Probeer weerdata op te halen van HA weather entiteit
@@ -154,18 +292,41 @@ class NLAlertAPI:
                             float(wind_speed),
                             attributes.get("condition", "unknown")
                         ),
+                        # Nodig om de stabiliteitsklasse na sensorfusie opnieuw te schatten
+                        "condition": attributes.get("condition", "unknown"),
                         "source": "ha_weather_entity",
                     }
             
-            # Fallback naar mock KNMI data
+            # KNMI waarnemingen van het dichtstbijzijnde station
+            if self.knmi is not None and latitude is not None and longitude is not None:
+                nearest = self.knmi.nearest(latitude, longitude)
+                if nearest is not None:
+                    station, distance_km = nearest
+                    temperature = station.temperature if station.temperature is not None else 15.0
+                    return {
+                        "wind_speed": station.wind_speed,
+                        "wind_direction": station.wind_direction,
+                        "temperature": temperature,
+                        "pressure": station.pressure if station.pressure is not None else 1013.25,
+                        "humidity": station.humidity if station.humidity is not None else 50.0,
+                        "stability_class": self._estimate_stability_class(
+                            temperature, station.wind_speed, "unknown"
+                        ),
+                        "station": station.name,
+                        "station_distance_km": round(distance_km, 1),
+                        "observed_at": station.observed_at.isoformat() if station.observed_at else None,
+                        "source": "knmi",
+                    }
+            
+            # Geen weerbron beschikbaar: standaardwaarden
             return {
-                "wind_speed": 3.5,  # m/s
-                "wind_direction": 225,  # graden (ZW)
+                "wind_speed": DEFAULT_WIND_SPEED,
+                "wind_direction": DEFAULT_WIND_DIRECTION,
                 "temperature": 15.0,  # celsius
                 "pressure": 1013.25,  # hPa
                 "humidity": 50.0,  # %
                 "stability_class": DEFAULT_STABILITY_CLASS,
-                "source": "knmi_mock",
+                "source": "default",
             }
         except Exception as err:
             _LOGGER.error("Fout bij ophalen weerdata: %s", err)
@@ -222,6 +383,10 @@ class NLAlertAPI:
         """
         Berekent Gaussiaanse pluim dispersie.
         
+        Losstaande statusindicatie met een eigen normalisatie en
+        MAX_PLUME_DISTANCE; het risico voor de woning komt van de
+        dispersie-engines in dispersion.py.
+        
         Args:
             source_lat: Latitude van bron (alert locatie)
             source_lon: Longitude van bron 
@@ -331,27 +496,8 @@ class NLAlertAPI:
 
     def _calculate_sigma_y(self, distance: float, stability_class: str) -> float:
         """Bereken horizontale dispersie parameter."""
-        # Vereenvoudigde Pasquill-Gifford parameters
-        distance_km = distance / 1000
-        
-        if stability_class in ["A", "B"]:  # Onstabiel
-            return 0.32 * distance_km * (1 + 0.0004 * distance_km) ** -0.5
-        elif stability_class == "C":  # Licht onstabiel
-            return 0.22 * distance_km * (1 + 0.0004 * distance_km) ** -0.5
-        elif stability_class == "D":  # Neutraal
-            return 0.16 * distance_km * (1 + 0.0004 * distance_km) ** -0.5
-        else:  # E, F - Stabiel
-            return 0.11 * distance_km * (1 + 0.0004 * distance_km) ** -0.5
+        return sigma_y_closed_form(distance, stability_class)
 
     def _calculate_sigma_z(self, distance: float, stability_class: str) -> float:
         """Bereken verticale dispersie parameter."""
-        distance_km = distance / 1000
-        
-        if stability_class in ["A", "B"]:  # Onstabiel
-            return 0.24 * distance_km * (1 + 0.001 * distance_km) ** 0.5
-        elif stability_class == "C":  # Licht onstabiel
-            return 0.20 * distance_km
-        elif stability_class == "D":  # Neutraal
-            return 0.14 * distance_km * (1 + 0.0003 * distance_km) ** -0.5
-        else:  # E, F - Stabiel
-            return 0.08 * distance_km * (1 + 0.0015 * distance_km) ** -0.5
\ No newline at end of file
+        return sigma_z_closed_form(distance, stability_class)
@@ -107,6 +107,7 @@ class NLAlertBinarySensor(CoordinatorEntity[NLAlertCoordinator], BinarySensorEnt
         attrs = {
             "alert_count": self.coordinator.data.get("active_count", 0),
             "last_updated": self.coordinator.last_update_success,
+            "update_interval": self.coordinator.data.get("update_interval"),
             "severity_counts": self.coordinator.data.get("severity_counts", {}),
         }
         
@@ -115,32 +116,26 @@ class NLAlertBinarySensor(CoordinatorEntity[NLAlertCoordinator], BinarySensorEnt
             attrs.update({
                 "historical_count": self.coordinator.data.get("historical_count", 0),
                 "severe_count": self.coordinator.data.get("severe_count", 0),
+                "hazard_counts": self.coordinator.data.get("hazard_counts", {}),
             })
         elif self.entity_description.key == "severe_alert":
-            severe_alerts = []
-            for alert in self.coordinator.data.get("alerts", []):
-                # Extract info data (can be list or dict)
-                info_data = {}
-                if isinstance(alert.get("info"), list) and len(alert["info"]) > 0:
-                    info_data = alert["info"][0]
-                elif isinstance(alert.get("info"), dict):
-                    info_data = alert["info"]
-                
-                severity = info_data.get("severity")
-                if severity in ["Severe", "Extreme"]:
-                    # Extract area description
-                    area_desc = ""
-                    if isinstance(info_data.get("area"), list) and len(info_data["area"]) > 0:
-                        area_desc = info_data["area"][0].get("areaDesc", "")
-                    elif isinstance(info_data.get("area"), dict):
-                        area_desc = info_data["area"].get("areaDesc", "")
-                    
-                    severe_alerts.append({
-                        "id": alert.get("identifier"),
-                        "severity": severity,
-                        "headline": info_data.get("headline"),
-                        "areas": area_desc,
-                    })
-            attrs["severe_alerts"] = severe_alerts[:5]  # Laatste 5 ernstige alerts
+            alerts = self.coordinator.data.get("alerts", [])
+            # Eenmaal per nieuwe alertlijst opbouwen
+            attrs["severe_alerts"] = self.coordinator.payload_cache.get(
+                "severe_alerts", (alerts,), lambda: self._severe_alerts(alerts)
+            )
             
-        return attrs
\ No newline at end of file
+        return attrs
+
+    def _severe_alerts(self, alerts: list) -> list[dict[str, Any]]:
+        """Return the first 5 severe alerts."""
+        severe_alerts = []
+        for alert in alerts:
+            if alert.is_severe:
+                severe_alerts.append({
+                    "id": alert.identifier,
+                    "severity": alert.severity,
+                    "headline": alert.headline,
+                    "areas": alert.area_desc,
+                })
+        return severe_alerts[:5]  # Laatste 5 ernstige alerts
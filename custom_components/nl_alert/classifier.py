@@ -0,0 +1,102 @@
+"""Hazardous-material classification of NL-Alert messages."""
+from __future__ import annotations
+
+import logging
+import re
+from collections import OrderedDict
+
+from .models import Alert
+
+_LOGGER = logging.getLogger(__name__)
+
+# Standaard lexicon: categorie -> trefwoorden (substring match, hoofdletterongevoelig)
+DEFAULT_HAZARD_LEXICON: dict[str, tuple[str, ...]] = {
+    "chemical": ("chemisch", "chemical", "stof", "ammonia", "ammoniak", "chlor", "chloor", "benzeen"),
+    "fire": ("brand", "fire"),
+    "smoke": ("rookontwikkeling", "rook", "smoke"),
+    "toxic": ("giftige", "schadelijk", "toxic"),
+    "hazardous": ("gevaarlijk", "hazardous", "dangerous"),
+    "gas": ("gas", "lekkage"),
+    "explosion": ("ontploffing",),
+}
+
+CUSTOM_CATEGORY = "custom"
+
+# Maximum number of alert identifiers kept in the classification cache
+CACHE_SIZE = 1024
+
+
+def parse_lexicon_option(value: str | None) -> dict[str, tuple[str, ...]]:
+    """Parse the user lexicon option.
+
+    Entries are comma separated; "category:keyword" adds to that category,
+    a bare keyword goes into the "custom" category.
+    """
+    lexicon: dict[str, list[str]] = {}
+    for entry in (value or "").split(","):
+        category, sep, keyword = entry.partition(":")
+        if not sep:
+            category, keyword = CUSTOM_CATEGORY, category
+        category = category.strip().lower() or CUSTOM_CATEGORY
+        keyword = keyword.strip().lower()
+        if keyword:
+            lexicon.setdefault(category, []).append(keyword)
+    return {category: tuple(keywords) for category, keywords in lexicon.items()}
+
+
+def _compile(keywords) -> re.Pattern[str]:
+    """Compile keywords into one case-insensitive alternation."""
+    # Longest first so overlapping keywords do not shadow each other
+    ordered = sorted(set(keywords), key=len, reverse=True)
+    return re.compile("|".join(re.escape(keyword) for keyword in ordered), re.IGNORECASE)
+
+
+class HazardClassifier:
+    """Classify alerts by hazard category using a precompiled lexicon."""
+
+    def __init__(self, extra_keywords: str | None = None) -> None:
+        """Compile the default lexicon extended with user keywords."""
+        lexicon = {category: list(keywords) for category, keywords in DEFAULT_HAZARD_LEXICON.items()}
+        for category, keywords in parse_lexicon_option(extra_keywords).items():
+            lexicon.setdefault(category, []).extend(keywords)
+
+        self._any_pattern = _compile(
+            keyword for keywords in lexicon.values() for keyword in keywords
+        )
+        self._category_patterns = [
+            (category, _compile(keywords)) for category, keywords in lexicon.items()
+        ]
+        self._cache: OrderedDict[str, frozenset[str]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def classify_text(self, text: str) -> frozenset[str]:
+        """Return the hazard categories whose keywords occur in text."""
+        # Snelle weg: de meeste meldingen matchen geen enkel trefwoord
+        if not self._any_pattern.search(text):
+            return frozenset()
+        return frozenset(
+            category for category, pattern in self._category_patterns if pattern.search(text)
+        )
+
+    def classify(self, alert: Alert) -> frozenset[str]:
+        """Return the hazard categories of an alert, cached per identifier."""
+        alert_id = alert.identifier
+        if alert_id is not None:
+            categories = self._cache.get(alert_id)
+            if categories is not None:
+                self._cache.move_to_end(alert_id)
+                self.hits += 1
+                return categories
+
+        self.misses += 1
+        categories = self.classify_text(f"{alert.headline}\n{alert.description}")
+        if alert_id is not None:
+            self._cache[alert_id] = categories
+            if len(self._cache) > CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return categories
+
+    def is_hazardous(self, alert: Alert) -> bool:
+        """Return True if the alert matches any hazard category."""
+        return bool(self.classify(alert))
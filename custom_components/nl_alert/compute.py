@@ -0,0 +1,164 @@
+"""Compute backends for the plume calculations of the NL-Alert integration."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+COMPUTE_INLINE = "inline"
+COMPUTE_EXECUTOR = "executor"
+COMPUTE_PROCESS = "process"
+
+# Persistent worker processes for the process pool backend
+PROCESS_POOL_WORKERS = 1
+
+
+class ComputeSuperseded(Exception):
+    """Raised when a newer job with the same key replaced a running one."""
+
+
+class ComputeBackend:
+    """Runs plume computations; the base class runs them inline on the event loop."""
+
+    name = COMPUTE_INLINE
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the backend."""
+        self.hass = hass
+        self._jobs: dict[str, tuple[int, asyncio.Future]] = {}
+        self._generation = 0
+
+    async def _async_submit(self, func: Callable[..., _T], *args: Any) -> _T:
+        """Run func(*args); subclasses move the work off the event loop."""
+        return func(*args)
+
+    async def _async_submit_local(self, func: Callable[..., _T], *args: Any) -> _T:
+        """Run func(*args) in this process (for work on shared state)."""
+        return await self._async_submit(func, *args)
+
+    async def async_run(self, key: str, func: Callable[..., _T], *args: Any) -> _T:
+        """Run a job, superseding any unfinished job with the same key.
+
+        func and args must be picklable for the process pool backend, so pass
+        module-level functions and plain data.
+
+        Raises ComputeSuperseded if a newer job with this key was started
+        before this one finished; its result is discarded.
+        """
+        return await self._async_run_latest(key, self._async_submit, func, *args)
+
+    async def async_run_local(self, key: str, func: Callable[..., _T], *args: Any) -> _T:
+        """Like async_run, but never leaves this process.
+
+        For stateful engines (the puff tracker) whose state must survive the
+        call; the process pool backend runs these in the thread executor.
+        A superseded job that already started keeps running in its thread,
+        so func must guard its own state against concurrent calls.
+        """
+        return await self._async_run_latest(key, self._async_submit_local, func, *args)
+
+    async def _async_run_latest(
+        self, key: str, submit: Callable[..., Any], func: Callable[..., _T], *args: Any
+    ) -> _T:
+        """Run a job through submit and cancel the previous job with the same key."""
+        previous = self._jobs.get(key)
+        if previous is not None and not previous[1].done():
+            # Nog niet gestarte jobs worden geannuleerd; lopende resultaten genegeerd
+            previous[1].cancel()
+
+        self._generation += 1
+        generation = self._generation
+        future = asyncio.ensure_future(submit(func, *args))
+        self._jobs[key] = (generation, future)
+        try:
+            return await future
+        except asyncio.CancelledError:
+            if self._jobs.get(key, (generation,))[0] != generation:
+                raise ComputeSuperseded(key) from None
+            raise
+        finally:
+            if self._jobs.get(key, (None,))[0] == generation:
+                del self._jobs[key]
+
+    async def async_shutdown(self) -> None:
+        """Cancel outstanding jobs and release resources."""
+        for _, future in self._jobs.values():
+            future.cancel()
+        self._jobs.clear()
+
+
+class ExecutorBackend(ComputeBackend):
+    """Runs jobs in Home Assistant's thread pool; NumPy releases the GIL."""
+
+    name = COMPUTE_EXECUTOR
+
+    async def _async_submit(self, func: Callable[..., _T], *args: Any) -> _T:
+        """Run func(*args) in the executor."""
+        return await self.hass.async_add_executor_job(func, *args)
+
+
+class ProcessPoolBackend(ExecutorBackend):
+    """Runs jobs in a persistent process pool, for large rasters and ensembles.
+
+    The pool is started on first use and kept until unload. Local jobs go to
+    the thread executor.
+    """
+
+    name = COMPUTE_PROCESS
+
+    def __init__(self, hass: HomeAssistant, max_workers: int = PROCESS_POOL_WORKERS) -> None:
+        """Initialize the backend."""
+        super().__init__(hass)
+        self.max_workers = max_workers
+        self._pool: ProcessPoolExecutor | None = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Return the pool, creating it on first use."""
+        if self._pool is None:
+            # Geen fork vanuit een proces met threads: gebruik spawn
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._pool
+
+    async def _async_submit(self, func: Callable[..., _T], *args: Any) -> _T:
+        """Run func(*args) in a worker process."""
+        return await self.hass.loop.run_in_executor(self._get_pool(), func, *args)
+
+    async def _async_submit_local(self, func: Callable[..., _T], *args: Any) -> _T:
+        """Run func(*args) in the thread executor."""
+        return await super()._async_submit(func, *args)
+
+    async def async_shutdown(self) -> None:
+        """Cancel outstanding jobs and stop the worker processes."""
+        await super().async_shutdown()
+        if self._pool is not None:
+            pool, self._pool = self._pool, None
+            await self.hass.async_add_executor_job(
+                lambda: pool.shutdown(wait=True, cancel_futures=True)
+            )
+
+
+BACKENDS: dict[str, type[ComputeBackend]] = {
+    COMPUTE_INLINE: ComputeBackend,
+    COMPUTE_EXECUTOR: ExecutorBackend,
+    COMPUTE_PROCESS: ProcessPoolBackend,
+}
+
+
+def create_backend(hass: HomeAssistant, name: str | None) -> ComputeBackend:
+    """Return the backend with this name; unknown names use the executor."""
+    backend_class = BACKENDS.get(name or COMPUTE_EXECUTOR)
+    if backend_class is None:
+        _LOGGER.warning("Unknown compute backend %s, using %s", name, COMPUTE_EXECUTOR)
+        backend_class = ExecutorBackend
+    return backend_class(hass)
@@ -24,6 +24,29 @@ from .const import (
     CONF_LANGUAGE,
     DEFAULT_LANGUAGE,
     CONF_WEATHER_ENTITY,
+    CONF_STREAM_DECODE,
+    CONF_KNMI_API_KEY,
+    CONF_HAZARD_KEYWORDS,
+    CONF_HISTORY_LIMIT,
+    DEFAULT_HISTORY_LIMIT,
+    CONF_HISTORY_RETENTION_DAYS,
+    DEFAULT_HISTORY_RETENTION_DAYS,
+    CONF_ADAPTIVE_POLLING,
+    CONF_MIN_UPDATE_INTERVAL,
+    DEFAULT_MIN_UPDATE_INTERVAL,
+    CONF_MAX_UPDATE_INTERVAL,
+    CONF_DISPERSION_ENGINE,
+    DEFAULT_DISPERSION_ENGINE,
+    CONF_ENSEMBLE_MEMBERS,
+    DEFAULT_ENSEMBLE_MEMBERS,
+    CONF_WIND_DIRECTION_SPREAD,
+    DEFAULT_WIND_DIRECTION_SPREAD,
+    CONF_WIND_SPEED_SPREAD,
+    DEFAULT_WIND_SPEED_SPREAD,
+    CONF_COMPUTE_BACKEND,
+    CONF_FORECAST_TIMELINE,
+    DEFAULT_COMPUTE_BACKEND,
+    DEFAULT_MAX_UPDATE_INTERVAL,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -223,6 +246,62 @@ class NLAlertOptionsFlow(config_entries.OptionsFlow):
                 CONF_ENABLE_PLUME_CALC, 
                 default=current_config.get(CONF_ENABLE_PLUME_CALC, False)
             ): bool,
+            vol.Optional(
+                CONF_DISPERSION_ENGINE,
+                default=current_config.get(CONF_DISPERSION_ENGINE, DEFAULT_DISPERSION_ENGINE)
+            ): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    options=["scalar", "vectorized", "puff", "ensemble"],
+                    mode=selector.SelectSelectorMode.DROPDOWN,
+                    translation_key="dispersion_engine"
+                )
+            ),
+            vol.Optional(
+                CONF_ENSEMBLE_MEMBERS,
+                default=current_config.get(CONF_ENSEMBLE_MEMBERS, DEFAULT_ENSEMBLE_MEMBERS)
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=0,
+                    max=10000,
+                    step=100,
+                    mode=selector.NumberSelectorMode.BOX,
+                    unit_of_measurement="leden"
+                )
+            ),
+            vol.Optional(
+                CONF_WIND_DIRECTION_SPREAD,
+                default=current_config.get(CONF_WIND_DIRECTION_SPREAD, DEFAULT_WIND_DIRECTION_SPREAD)
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=0,
+                    max=90,
+                    step=1,
+                    mode=selector.NumberSelectorMode.BOX,
+                    unit_of_measurement="°"
+                )
+            ),
+            vol.Optional(
+                CONF_WIND_SPEED_SPREAD,
+                default=current_config.get(CONF_WIND_SPEED_SPREAD, DEFAULT_WIND_SPEED_SPREAD)
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=0,
+                    max=100,
+                    step=5,
+                    mode=selector.NumberSelectorMode.BOX,
+                    unit_of_measurement="%"
+                )
+            ),
+            vol.Optional(
+                CONF_COMPUTE_BACKEND,
+                default=current_config.get(CONF_COMPUTE_BACKEND, DEFAULT_COMPUTE_BACKEND)
+            ): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    options=["inline", "executor", "process"],
+                    mode=selector.SelectSelectorMode.DROPDOWN,
+                    translation_key="compute_backend"
+                )
+            ),
             vol.Optional(
                 CONF_WEATHER_ENTITY, 
                 default=current_config.get(CONF_WEATHER_ENTITY, "")
@@ -233,6 +312,76 @@ class NLAlertOptionsFlow(config_entries.OptionsFlow):
                     custom_value=True
                 )
             ),
+            vol.Optional(
+                CONF_FORECAST_TIMELINE,
+                default=current_config.get(CONF_FORECAST_TIMELINE, False)
+            ): bool,
+            vol.Optional(
+                CONF_KNMI_API_KEY,
+                default=current_config.get(CONF_KNMI_API_KEY, "")
+            ): selector.TextSelector(
+                selector.TextSelectorConfig(type=selector.TextSelectorType.PASSWORD)
+            ),
+            vol.Optional(
+                CONF_STREAM_DECODE,
+                default=current_config.get(CONF_STREAM_DECODE, False)
+            ): bool,
+            vol.Optional(
+                CONF_HAZARD_KEYWORDS,
+                default=current_config.get(CONF_HAZARD_KEYWORDS, "")
+            ): str,
+            vol.Optional(
+                CONF_HISTORY_LIMIT,
+                default=current_config.get(CONF_HISTORY_LIMIT, DEFAULT_HISTORY_LIMIT)
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=10,
+                    max=10000,
+                    step=10,
+                    mode=selector.NumberSelectorMode.BOX,
+                    unit_of_measurement="meldingen"
+                )
+            ),
+            vol.Optional(
+                CONF_HISTORY_RETENTION_DAYS,
+                default=current_config.get(CONF_HISTORY_RETENTION_DAYS, DEFAULT_HISTORY_RETENTION_DAYS)
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=1,
+                    max=365,
+                    step=1,
+                    mode=selector.NumberSelectorMode.BOX,
+                    unit_of_measurement="dagen"
+                )
+            ),
+            vol.Optional(
+                CONF_ADAPTIVE_POLLING,
+                default=current_config.get(CONF_ADAPTIVE_POLLING, False)
+            ): bool,
+            vol.Optional(
+                CONF_MIN_UPDATE_INTERVAL,
+                default=current_config.get(CONF_MIN_UPDATE_INTERVAL, DEFAULT_MIN_UPDATE_INTERVAL)
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=30,
+                    max=3600,
+                    step=30,
+                    mode=selector.NumberSelectorMode.BOX,
+                    unit_of_measurement="seconden"
+                )
+            ),
+            vol.Optional(
+                CONF_MAX_UPDATE_INTERVAL,
+                default=current_config.get(CONF_MAX_UPDATE_INTERVAL, DEFAULT_MAX_UPDATE_INTERVAL)
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=60,
+                    max=7200,
+                    step=60,
+                    mode=selector.NumberSelectorMode.BOX,
+                    unit_of_measurement="seconden"
+                )
+            ),
         })
 
         return self.async_show_form(
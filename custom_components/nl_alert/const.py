@@ -12,6 +12,13 @@ CONF_UPDATE_INTERVAL: Final = "update_interval"
 CONF_SEVERITY_FILTER: Final = "severity_filter"
 CONF_LANGUAGE: Final = "language"
 CONF_WEATHER_ENTITY: Final = "weather_entity"
+CONF_STREAM_DECODE: Final = "stream_decode"
+CONF_HAZARD_KEYWORDS: Final = "hazard_keywords"
+CONF_HISTORY_LIMIT: Final = "history_limit"
+CONF_HISTORY_RETENTION_DAYS: Final = "history_retention_days"
+CONF_ADAPTIVE_POLLING: Final = "adaptive_polling"
+CONF_MIN_UPDATE_INTERVAL: Final = "min_update_interval"
+CONF_MAX_UPDATE_INTERVAL: Final = "max_update_interval"
 
 # API constants
 API_BASE_URL: Final = "https://api.public-warning.app/api/v1"
@@ -20,8 +27,17 @@ API_ENDPOINT_RECENT_ALERTS: Final = f"{API_BASE_URL}/providers/nl-alert/alerts?f
 
 # Default values
 DEFAULT_UPDATE_INTERVAL: Final = 300  # 5 minutes
+DEFAULT_MIN_UPDATE_INTERVAL: Final = 60  # Tijdens actieve incidenten
+DEFAULT_MAX_UPDATE_INTERVAL: Final = 1800  # Rustige periodes
 DEFAULT_SEVERITY_FILTER: Final = ["Minor", "Moderate", "Severe", "Extreme"]
 DEFAULT_LANGUAGE: Final = "nl"
+DEFAULT_HISTORY_LIMIT: Final = 50
+DEFAULT_HISTORY_RETENTION_DAYS: Final = 30
+DEFAULT_ENSEMBLE_MEMBERS: Final = 0  # Ensemble uit
+DEFAULT_WIND_DIRECTION_SPREAD: Final = 15  # graden
+DEFAULT_WIND_SPEED_SPREAD: Final = 30  # procent
+DEFAULT_COMPUTE_BACKEND: Final = "executor"  # inline, executor of process
+DEFAULT_DISPERSION_ENGINE: Final = "vectorized"  # scalar, vectorized, puff of ensemble
 
 # Alert severities
 SEVERITY_MINOR: Final = "Minor"
@@ -38,10 +54,17 @@ CONF_WIND_SENSOR: Final = "wind_speed_sensor"
 CONF_WIND_DIRECTION_SENSOR: Final = "wind_direction_sensor"
 CONF_TEMPERATURE_SENSOR: Final = "temperature_sensor"
 CONF_ENABLE_PLUME_CALC: Final = "enable_plume_calculation"
+CONF_DISPERSION_ENGINE: Final = "dispersion_engine"
+CONF_ENSEMBLE_MEMBERS: Final = "ensemble_members"
+CONF_WIND_DIRECTION_SPREAD: Final = "wind_direction_spread"
+CONF_WIND_SPEED_SPREAD: Final = "wind_speed_spread"
+CONF_COMPUTE_BACKEND: Final = "compute_backend"
+CONF_FORECAST_TIMELINE: Final = "forecast_timeline"
 
 # KNMI API
 KNMI_API_BASE: Final = "https://api.knmi.nl/open-data/v1"
-KNMI_STATIONS_ENDPOINT: Final = f"{KNMI_API_BASE}/datasets/observations_latest/versions/latest/files"
+KNMI_STATIONS_ENDPOINT: Final = f"{KNMI_API_BASE}/datasets/Actuele10mindataKNMIstations/versions/2/files"
+CONF_KNMI_API_KEY: Final = "knmi_api_key"
 
 # Plume calculation status
 PLUME_STATUS_SAFE: Final = "safe"  # Groen
@@ -51,6 +74,10 @@ PLUME_STATUS_DANGER: Final = "danger"  # Rood
 # Gaussian plume model constants
 STABILITY_CLASSES: Final = {"A": 1, "B": 2, "C": 3, "D": 4, "E": 5, "F": 6}
 DEFAULT_STABILITY_CLASS: Final = "D"  # Neutrale atmosfeer
+# Weer zonder weer entiteit of KNMI waarnemingen; dezelfde waarden als de
+# vroegere KNMI mock data (zuidwestenwind, de meest voorkomende richting)
+DEFAULT_WIND_SPEED: Final = 3.5  # m/s
+DEFAULT_WIND_DIRECTION: Final = 225  # graden (ZW)
 MAX_PLUME_DISTANCE: Final = 10000  # 10km maximum berekenafstand
 
 # Attributes
@@ -3,18 +3,82 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from datetime import timedelta, datetime
+from datetime import timedelta, datetime, timezone
 from typing import Any
 
-from homeassistant.core import HomeAssistant
+from homeassistant.const import (
+    ATTR_UNIT_OF_MEASUREMENT,
+    STATE_UNAVAILABLE,
+    STATE_UNKNOWN,
+    UnitOfSpeed,
+    UnitOfTemperature,
+)
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, State, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.event import (
+    async_track_point_in_utc_time,
+    async_track_state_change_event,
+)
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.storage import STORAGE_DIR
+from homeassistant.util import dt as dt_util
+from homeassistant.util.unit_conversion import SpeedConverter, TemperatureConverter
 
-from .const import DOMAIN, DEFAULT_UPDATE_INTERVAL
+from .const import (
+    DOMAIN,
+    DEFAULT_UPDATE_INTERVAL,
+    CONF_HAZARD_KEYWORDS,
+    CONF_HISTORY_LIMIT,
+    DEFAULT_HISTORY_LIMIT,
+    CONF_HISTORY_RETENTION_DAYS,
+    DEFAULT_HISTORY_RETENTION_DAYS,
+    CONF_UPDATE_INTERVAL,
+    CONF_ADAPTIVE_POLLING,
+    CONF_MIN_UPDATE_INTERVAL,
+    DEFAULT_MIN_UPDATE_INTERVAL,
+    CONF_MAX_UPDATE_INTERVAL,
+    DEFAULT_MAX_UPDATE_INTERVAL,
+    CONF_ENSEMBLE_MEMBERS,
+    DEFAULT_ENSEMBLE_MEMBERS,
+    CONF_WIND_DIRECTION_SPREAD,
+    DEFAULT_WIND_DIRECTION_SPREAD,
+    CONF_WIND_SPEED_SPREAD,
+    DEFAULT_WIND_SPEED_SPREAD,
+    DEFAULT_STABILITY_CLASS,
+    CONF_ENABLE_PLUME_CALC,
+    CONF_WEATHER_ENTITY,
+    CONF_WIND_SENSOR,
+    CONF_WIND_DIRECTION_SENSOR,
+    CONF_TEMPERATURE_SENSOR,
+    CONF_COMPUTE_BACKEND,
+    DEFAULT_COMPUTE_BACKEND,
+    CONF_FORECAST_TIMELINE,
+)
+from .aggregation import AlertSummary, ExpiryQueue
 from .api import NLAlertAPI
+from .classifier import HazardClassifier
+from .compute import ComputeSuperseded, create_backend
+from .dispersion import EnsembleSuperposition, create_engine
+from .forecast import FORECAST_TYPE, MAX_FORECAST_STEPS, ForecastStep, ForecastTimeline, evaluate_forecast
+from .geometry import AlertGeometry, GeometryCache
+from .history import AlertHistory
+from .risk_cache import RiskCache
+from .scheduler import AdaptivePollScheduler
+from .store import AlertHistoryStore
+from .models import Alert
+from .payload_cache import PayloadCache
+from .wind_fusion import WindFusion
 
 _LOGGER = logging.getLogger(__name__)
 
+# How often alerts past the retention period are removed
+HISTORY_PRUNE_INTERVAL = timedelta(hours=1)
+
+# Quiet time before weather changes trigger a risk recomputation (seconds)
+WEATHER_DEBOUNCE_COOLDOWN = 10.0
+
 
 class NLAlertCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     """Class to manage fetching NL-Alert data."""
@@ -31,12 +95,80 @@ class NLAlertCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             _LOGGER,
             name=DOMAIN,
             update_interval=timedelta(
-                seconds=config_entry_data.get("update_interval", DEFAULT_UPDATE_INTERVAL)
+                seconds=config_entry_data.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL)
             ),
         )
         self.api = api
         self.config_data = config_entry_data
-        self._historical_alerts = []  # Store historical alerts in memory
+        # Store historical alerts in memory
+        self._historical_alerts = AlertHistory(
+            int(config_entry_data.get(CONF_HISTORY_LIMIT, DEFAULT_HISTORY_LIMIT))
+        )
+        self._history_retention = timedelta(
+            days=int(config_entry_data.get(CONF_HISTORY_RETENTION_DAYS, DEFAULT_HISTORY_RETENTION_DAYS))
+        )
+        self._last_history_prune: datetime | None = None
+        self.history_store = AlertHistoryStore(
+            hass, hass.config.path(STORAGE_DIR, f"{DOMAIN}_history.db")
+        )
+        self._recent_count = 0  # Alerts in the last-24h feed of the current poll
+        self._last_data: dict[str, Any] | None = None  # Result of last full update
+        self._summary: AlertSummary | None = None
+        self._expiry_queue = ExpiryQueue()
+        self._unsub_expiry: CALLBACK_TYPE | None = None
+        self._active_ids: frozenset[str | None] = frozenset()
+        
+        # Adaptieve polling: sneller bij actieve incidenten, terugschalen als het rustig is
+        self._scheduler: AdaptivePollScheduler | None = None
+        if config_entry_data.get(CONF_ADAPTIVE_POLLING, False):
+            self._scheduler = AdaptivePollScheduler(
+                float(config_entry_data.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL)),
+                float(config_entry_data.get(CONF_MIN_UPDATE_INTERVAL, DEFAULT_MIN_UPDATE_INTERVAL)),
+                float(config_entry_data.get(CONF_MAX_UPDATE_INTERVAL, DEFAULT_MAX_UPDATE_INTERVAL)),
+            )
+        self.classifier = HazardClassifier(config_entry_data.get(CONF_HAZARD_KEYWORDS))
+        self.geometry_cache = GeometryCache()
+        # Dispersiemodel per config entry; de puff-engine bewaart puffs tussen updates
+        self.engine = create_engine(config_entry_data)
+        # Monte Carlo ensemble voor onzekerheid in wind en stabiliteit (0 = uit)
+        self._ensemble_members = int(config_entry_data.get(CONF_ENSEMBLE_MEMBERS, DEFAULT_ENSEMBLE_MEMBERS))
+        self._direction_spread = float(
+            config_entry_data.get(CONF_WIND_DIRECTION_SPREAD, DEFAULT_WIND_DIRECTION_SPREAD)
+        )
+        self._speed_spread = float(
+            config_entry_data.get(CONF_WIND_SPEED_SPREAD, DEFAULT_WIND_SPEED_SPREAD)
+        ) / 100
+        # Pluimberekeningen buiten de event loop; nieuwere refreshes vervangen oudere
+        self.compute = create_backend(
+            hass, config_entry_data.get(CONF_COMPUTE_BACKEND, DEFAULT_COMPUTE_BACKEND)
+        )
+        # Risico's hergebruiken zolang incidenten, thuislocatie en weer gelijk blijven
+        self.risk_cache = RiskCache()
+        # Risico per verwachtingsstap; alleen gewijzigde stappen opnieuw berekenen
+        self.forecast_timeline: ForecastTimeline | None = None
+        if config_entry_data.get(CONF_FORECAST_TIMELINE) and config_entry_data.get(CONF_WEATHER_ENTITY):
+            self.forecast_timeline = ForecastTimeline()
+        # Afgeleide entiteit-attributen en teksten, eenmaal per nieuwe data gebouwd
+        self.payload_cache = PayloadCache()
+        # Afgevlakte wind uit losse sensoren (ring buffer met cirkelstatistiek)
+        self.wind_fusion: WindFusion | None = None
+        if any(
+            config_entry_data.get(key)
+            for key in (CONF_WIND_SENSOR, CONF_WIND_DIRECTION_SENSOR, CONF_TEMPERATURE_SENSOR)
+        ):
+            self.wind_fusion = WindFusion()
+        # Herberekening bij weerwijzigingen, zonder de feed opnieuw op te halen
+        self._unsub_weather: CALLBACK_TYPE | None = None
+        self._weather_debouncer = Debouncer(
+            hass,
+            _LOGGER,
+            cooldown=WEATHER_DEBOUNCE_COOLDOWN,
+            immediate=False,
+            function=self._async_recompute_home_danger,
+        )
+        # Thuislocatie uit de Home Assistant configuratie
+        self.home_latitude = hass.config.latitude
+        self.home_longitude = hass.config.longitude
         
         # Device info for grouping entities
         self.device_info = DeviceInfo(
@@ -51,166 +183,310 @@ class NLAlertCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     async def _async_update_data(self) -> dict[str, Any]:
         """Fetch data from NL-Alert API."""
         try:
-            # Haal actuele alerts op (voor current status)
-            current_alerts = await self.api.async_get_alerts()
-            active_alerts = self.api.get_active_alerts()
-            
-            # Haal recente alerts op (afgelopen 24h voor historical data)
-            recent_alerts = await self.api.async_get_recent_alerts()
-            _LOGGER.info(f"🔍 Retrieved {len(current_alerts)} current alerts and {len(recent_alerts)} recent alerts")
-            
-            # Add recent alerts to historical collection (only chemical/hazardous material alerts)
-            for alert in recent_alerts:
-                alert_id = alert.get("identifier")
-                
-                # Extract headline from info section
-                headline = ""
-                description = ""
-                if isinstance(alert.get("info"), list) and len(alert["info"]) > 0:
-                    info = alert["info"][0]
-                    headline = info.get("headline", "").lower()
-                    description = info.get("description", "").lower()
-                elif isinstance(alert.get("info"), dict):
-                    headline = alert["info"].get("headline", "").lower()
-                    description = alert["info"].get("description", "").lower()
-                
-                # Only keep alerts related to chemical incidents, fires, or hazardous materials
-                is_relevant = any(keyword in headline + " " + description for keyword in [
-                    "chemisch", "brand", "rookontwikkeling", "giftige", "schadelijk", 
-                    "gevaarlijk", "stof", "gas", "rook", "ontploffing", "lekkage",
-                    "chemical", "fire", "smoke", "toxic", "hazardous", "dangerous",
-                    "ammonia", "ammoniak", "chlor", "benzeen", "chloor"
-                ])
-                
-                if alert_id and is_relevant and not any(h_alert.get("identifier") == alert_id for h_alert in self._historical_alerts):
-                    # Add timestamp for cleanup
-                    alert["stored_at"] = datetime.now().isoformat()
-                    self._historical_alerts.append(alert)
-                    _LOGGER.debug(f"➕ Added relevant alert to history: {headline[:50]}...")
-            
-            # Clean up old historical alerts (keep only last 30 days and max 50 alerts)
-            cutoff_date = datetime.now() - timedelta(days=30)
-            self._historical_alerts = [
-                alert for alert in self._historical_alerts[-50:]  # Max 50 alerts
-                if alert.get("stored_at")
-            ]
+            # Haal actuele en recente alerts (afgelopen 24h) gelijktijdig op; recente
+            # alerts gaan tijdens het decoderen één voor één naar het archief
+            self._recent_count = 0
+            current_alerts, _ = await self.api.async_get_alert_feeds(self._archive_recent_alert)
+            _LOGGER.info(f"🔍 Retrieved {len(current_alerts)} current alerts and {self._recent_count} recent alerts")
+            
+            # Beide feeds ongewijzigd (304): hergebruik vorige resultaten
+            if self.api.feeds_unchanged and self._last_data is not None:
+                _LOGGER.debug("Both feeds unchanged, skipping processing")
+                self._adapt_update_interval(self._summary, changed=False)
+                return {
+                    **self._last_data,
+                    "fetch_stats": self.api.fetch_stats,
+                    "risk_cache_stats": self.risk_cache.stats,
+                    "update_interval": self.update_interval.total_seconds(),
+                }
+            
+            # Eén aggregatie per refresh, hergebruikt door alle entiteiten
+            summary = self.api.get_summary(self.classifier)
+            active_alerts = summary.active
+            
+            active_ids = frozenset(alert.identifier for alert in active_alerts)
+            self._adapt_update_interval(summary, changed=active_ids != self._active_ids)
+            self._active_ids = active_ids
+            
+            # Clean up historical alerts past the retention period (at most once per hour)
+            now = datetime.now(timezone.utc)
+            if self._last_history_prune is None or now - self._last_history_prune > HISTORY_PRUNE_INTERVAL:
+                self._last_history_prune = now
+                cutoff_date = now - self._history_retention
+                self._historical_alerts.prune(cutoff_date)
+                self.hass.async_create_task(self.history_store.async_prune(cutoff_date))
+            
+            # Nieuwe meldingen in één batch wegschrijven, zonder de update te blokkeren
+            if self.history_store.has_pending:
+                self.hass.async_create_task(self.history_store.async_flush())
 
             data = {
                 "alerts": current_alerts,
-                "recent_alerts": recent_alerts,
                 "active_alerts": active_alerts,
                 "active_count": len(active_alerts),
                 "alert_count": len(active_alerts),
-                "severity_counts": self.api.get_severity_counts(),
-                "severe_count": self.api.get_severity_counts().get("Severe", 0) + self.api.get_severity_counts().get("Extreme", 0),
-                "has_severe_alerts": self.api.has_severe_alerts(),
-                "historical_alerts": self._historical_alerts,
+                "severity_counts": dict(summary.severity_counts),
+                "severe_count": summary.severe_count,
+                "has_severe_alerts": summary.has_severe,
+                "hazard_counts": dict(summary.category_counts),
+                "historical_alerts": self._historical_alerts.as_list(),
                 "historical_count": len(self._historical_alerts),
+                "fetch_stats": self.api.fetch_stats,
+                "update_interval": self.update_interval.total_seconds(),
             }
             
-            # Als pluim berekening is ingeschakeld, voeg gevaar data toe
-            if self.config_data.get("enable_plume_calculation", False):
-                home_danger = await self._async_check_home_danger(active_alerts)
-                data["home_danger"] = home_danger
-                data["weather_data"] = home_danger.get("weather_data", {})
-            else:
-                # Zet veilige standaarden als pluim berekening uit staat
-                data["home_danger"] = {
-                    "in_danger": False,
-                    "status": "disabled",
-                    "risk_percentage": 0,
-                    "message": "Pluim berekening uitgeschakeld"
-                }
-                data["weather_data"] = {}
+            # Nieuwe KNMI waarnemingen hooguit eens per publicatie-interval; alleen
+            # hier, zodat herberekeningen bij weerwijzigingen geen netwerk gebruiken
+            if (
+                self.api.knmi is not None
+                and self.config_data.get(CONF_ENABLE_PLUME_CALC, False)
+                and not self.config_data.get(CONF_WEATHER_ENTITY)
+            ):
+                await self.api.knmi.async_update()
+            
+            await self._async_update_home_danger(data, summary)
             
+            # Plan de volgende verloop-timer voor de actieve meldingen
+            self._summary = summary
+            self._expiry_queue.reset(active_alerts)
+            self._schedule_expiry()
+            
+            # Kopie bewaren; services passen coordinator.data direct aan
+            self._last_data = dict(data)
             return data
             
         except Exception as err:
             raise UpdateFailed(f"Error communicating with API: {err}") from err
 
+    def _archive_recent_alert(self, alert: Alert) -> None:
+        """Add a recent alert to the archive if it is new and hazardous.
+
+        Called for every alert of the last-24h feed while it is decoded. Only
+        chemical incidents, fires and hazardous materials are kept; the
+        archive evicts its oldest alerts once the history limit is reached.
+        """
+        self._recent_count += 1
+        if not alert.identifier or alert.identifier in self._historical_alerts:
+            return
+        
+        if self.classifier.is_hazardous(alert):
+            # Add timestamp for cleanup
+            alert.stored_at = datetime.now().isoformat()
+            self._historical_alerts.add(alert)
+            self.history_store.queue(alert)
+            _LOGGER.debug(f"➕ Added relevant alert to history: {alert.headline[:50]}...")
+
+    def _adapt_update_interval(self, summary: AlertSummary | None, changed: bool) -> None:
+        """Set the next poll interval from alert activity (adaptive polling only)."""
+        if self._scheduler is None:
+            return
+        urgent = summary is not None and (summary.has_severe or bool(summary.hazardous))
+        self.update_interval = self._scheduler.next_interval(
+            datetime.now(timezone.utc), urgent, changed
+        )
+        _LOGGER.debug("Next poll in %.0f seconds", self._scheduler.current)
+
+    async def _async_update_home_danger(self, data: dict[str, Any], summary: AlertSummary) -> None:
+        """Set home_danger and weather_data in data for the hazardous active alerts."""
+        # Als pluim berekening is ingeschakeld, voeg gevaar data toe
+        if self.config_data.get("enable_plume_calculation", False):
+            try:
+                home_danger = await self._async_check_home_danger(summary.hazardous)
+            except ComputeSuperseded:
+                # Een nieuwere refresh rekent al; houd het vorige resultaat aan
+                _LOGGER.debug("Plume computation superseded by a newer refresh")
+                previous = self._last_data or {}
+                data["home_danger"] = previous.get("home_danger", {})
+                data["weather_data"] = previous.get("weather_data", {})
+                if self.forecast_timeline is not None:
+                    data["risk_forecast"] = previous.get("risk_forecast", {})
+                return
+            data["home_danger"] = home_danger
+            data["weather_data"] = home_danger.get("weather_data", {})
+            data["risk_cache_stats"] = self.risk_cache.stats
+            if self.forecast_timeline is not None:
+                data["risk_forecast"] = await self._async_update_risk_forecast(summary.hazardous)
+        else:
+            # Zet veilige standaarden als pluim berekening uit staat
+            data["home_danger"] = {
+                "in_danger": False,
+                "status": "disabled",
+                "risk_percentage": 0,
+                "message": "Pluim berekening uitgeschakeld"
+            }
+            data["weather_data"] = {}
+
+    @callback
+    def _schedule_expiry(self) -> None:
+        """Schedule one timer for the soonest alert expiry."""
+        if self._unsub_expiry is not None:
+            self._unsub_expiry()
+            self._unsub_expiry = None
+        next_expiry = self._expiry_queue.next_expiry
+        if next_expiry is not None:
+            self._unsub_expiry = async_track_point_in_utc_time(
+                self.hass, self._async_handle_expiry, next_expiry
+            )
+
+    async def _async_handle_expiry(self, now: datetime) -> None:
+        """Drop alerts that just expired and update entities without refetching."""
+        self._unsub_expiry = None
+        expired = self._expiry_queue.pop_expired(now)
+        if expired and self._summary is not None and self._last_data is not None:
+            previous = self._summary
+            summary = previous.without(expired, now, self.classifier)
+            _LOGGER.debug("%d alert(s) expired, %d still active", len(expired), len(summary.active))
+            
+            data = {
+                **self._last_data,
+                "active_alerts": summary.active,
+                "active_count": len(summary.active),
+                "alert_count": len(summary.active),
+                "severity_counts": dict(summary.severity_counts),
+                "severe_count": summary.severe_count,
+                "has_severe_alerts": summary.has_severe,
+                "hazard_counts": dict(summary.category_counts),
+            }
+            if len(summary.hazardous) != len(previous.hazardous):
+                await self._async_update_home_danger(data, summary)
+                if self._summary is not previous:
+                    # Een poll kwam ertussen en heeft de timer al opnieuw gepland
+                    return
+            
+            self._summary = summary
+            self._last_data = dict(data)
+            # Niet via async_set_updated_data: dat zou de volgende poll uitstellen
+            self.data = data
+            self.async_update_listeners()
+        self._schedule_expiry()
+
+    @callback
+    def async_track_weather(self) -> None:
+        """Recompute home danger when the weather entity or a wind sensor changes."""
+        if not self.config_data.get(CONF_ENABLE_PLUME_CALC, False):
+            return
+        entity_ids = [
+            entity_id
+            for entity_id in (
+                self.config_data.get(CONF_WEATHER_ENTITY),
+                self.config_data.get(CONF_WIND_SENSOR),
+                self.config_data.get(CONF_WIND_DIRECTION_SENSOR),
+                self.config_data.get(CONF_TEMPERATURE_SENSOR),
+            )
+            if entity_id
+        ]
+        if entity_ids:
+            self._unsub_weather = async_track_state_change_event(
+                self.hass, entity_ids, self._async_weather_changed
+            )
+        # Start de sensorbuffers met de huidige waarden
+        for entity_id in entity_ids:
+            state = self.hass.states.get(entity_id)
+            if state is not None:
+                self._add_sensor_sample(state)
+
+    @callback
+    def _async_weather_changed(self, event: Event) -> None:
+        """Schedule a debounced recomputation for a usable new weather state."""
+        new_state = event.data.get("new_state")
+        if new_state is None or new_state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            return
+        self._add_sensor_sample(new_state)
+        self._weather_debouncer.async_schedule_call()
+
+    def _add_sensor_sample(self, state: State) -> None:
+        """Add the reading of a configured wind or temperature sensor to the fusion."""
+        if self.wind_fusion is None:
+            return
+        try:
+            value = float(state.state)
+        except ValueError:
+            return
+        unit = state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+        entity_id = state.entity_id
+        try:
+            if entity_id == self.config_data.get(CONF_WIND_SENSOR):
+                if unit:
+                    value = SpeedConverter.convert(value, unit, UnitOfSpeed.METERS_PER_SECOND)
+                self.wind_fusion.add_speed(value, state.last_updated)
+            elif entity_id == self.config_data.get(CONF_WIND_DIRECTION_SENSOR):
+                self.wind_fusion.add_direction(value, state.last_updated)
+            elif entity_id == self.config_data.get(CONF_TEMPERATURE_SENSOR):
+                if unit:
+                    value = TemperatureConverter.convert(value, unit, UnitOfTemperature.CELSIUS)
+                self.wind_fusion.add_temperature(value, state.last_updated)
+        except HomeAssistantError as err:
+            _LOGGER.warning("Ignoring reading of %s: %s", entity_id, err)
+
+    async def _async_recompute_home_danger(self) -> None:
+        """Recompute home danger for the cached active alerts and publish it.
+
+        Uses the summary of the last poll, so no network I/O is done.
+        """
+        summary = self._summary
+        if summary is None or self._last_data is None:
+            return
+        
+        update: dict[str, Any] = {}
+        await self._async_update_home_danger(update, summary)
+        if summary is not self._summary or self._last_data is None:
+            # Een poll of verlopen melding kwam ertussen; die heeft voorrang
+            return
+        
+        data = {**self._last_data, **update}
+        self._last_data = data
+        # Niet via async_set_updated_data: dat zou de volgende poll uitstellen
+        self.data = data
+        self.async_update_listeners()
+
+    async def async_unload(self) -> None:
+        """Cancel timers, stop the compute backend and close the history store."""
+        if self._unsub_expiry is not None:
+            self._unsub_expiry()
+            self._unsub_expiry = None
+        if self._unsub_weather is not None:
+            self._unsub_weather()
+            self._unsub_weather = None
+        self._weather_debouncer.async_cancel()
+        await self.compute.async_shutdown()
+        await self.history_store.async_close()
+
     async def _async_check_home_danger(
         self, 
-        active_alerts: list[dict[str, Any]]
+        hazardous_alerts: list[Alert]
     ) -> dict[str, Any]:
         """Check if home location is in danger from active chemical alerts."""
         try:
-            # Get weather data
-            weather_entity = self.config_data.get("weather_entity")
-            if weather_entity:
-                weather_data = await self.api.async_get_weather_data(self.hass, weather_entity)
+            incidents = self._collect_incidents(hazardous_alerts)
+            
+            # Wind bij de incidenten (KNMI: dichtstbijzijnde station), anders bij de woning.
+            # Eén station voor het gemiddelde van de incidenten: de engines rekenen met
+            # één windveld voor alle bronnen, dus per-incident stations zouden niet
+            # gebruikt worden
+            if incidents:
+                latitude = sum(geometry.latitude for _, _, geometry in incidents) / len(incidents)
+                longitude = sum(geometry.longitude for _, _, geometry in incidents) / len(incidents)
             else:
-                weather_data = {"wind_speed": 5, "wind_direction": 180, "temperature": 15}  # Mock data
-            
-            # Check each active alert for chemical/hazardous content
-            for alert in active_alerts:
-                # Extract info data (can be list or dict)
-                info_data = {}
-                if isinstance(alert.get("info"), list) and len(alert["info"]) > 0:
-                    info_data = alert["info"][0]
-                elif isinstance(alert.get("info"), dict):
-                    info_data = alert["info"]
-                
-                headline = info_data.get("headline", "").lower()
-                description = info_data.get("description", "").lower()
-                
-                # Check if alert is chemical/fire/hazardous related
-                is_chemical = any(keyword in headline + " " + description for keyword in [
-                    "chemisch", "brand", "rookontwikkeling", "giftige", "schadelijk", 
-                    "gevaarlijk", "stof", "gas", "rook", "ontploffing", "lekkage",
-                    "chemical", "fire", "smoke", "toxic", "hazardous", "dangerous",
-                    "ammonia", "ammoniak", "chlor", "benzeen", "chloor"
-                ])
-                
-                if is_chemical:
-                    # Use private atmospheric model for real calculations
-                    try:
-                        from ._atmospheric_model import calculate_risk_percentage
-                        
-                        # Mock incident coordinates (should be parsed from alert polygon)
-                        incident_lat = 52.3676  # Amsterdam center as example
-                        incident_lon = 4.9041
-                        
-                        if self.home_latitude and self.home_longitude:
-                            risk_percentage, distance_km = calculate_risk_percentage(
-                                self.home_latitude,
-                                self.home_longitude,
-                                incident_lat, 
-                                incident_lon,
-                                weather_data.get("wind_direction", 180),
-                                weather_data.get("wind_speed", 5.0)
-                            )
-                        else:
-                            risk_percentage, distance_km = 25.0, 10.0  # Default values
-                        
-                        plume_direction = (weather_data.get("wind_direction", 180) + 180) % 360
-                        
-                        return {
-                            "in_danger": risk_percentage > 1.0,
-                            "status": "danger_detected" if risk_percentage > 1.0 else "low_risk",
-                            "risk_percentage": risk_percentage,
-                            "distance_km": distance_km,
-                            "wind_direction": weather_data.get("wind_direction", 180),
-                            "plume_direction": plume_direction,
-                            "concentration": risk_percentage / 100.0,
-                            "alert_headline": info_data.get("headline", ""),
-                            "message": f"🌨️ Rookpluim risico: {risk_percentage:.1f}% op {distance_km:.1f}km afstand",
-                            "weather_data": weather_data,
-                        }
-                    except Exception as e:
-                        _LOGGER.error(f"Error calculating plume risk: {e}")
-                        # Fallback to mock data
-                        return {
-                            "in_danger": True,
-                            "status": "danger_detected",
-                            "risk_percentage": 35.0,
-                            "distance_km": 12.5,
-                            "wind_direction": weather_data.get("wind_direction", 180),
-                            "plume_direction": 45,
-                            "concentration": 0.25,
-                            "alert_headline": info_data.get("headline", ""),
-                            "message": "🌨️ Rookpluim detector - berekening niet beschikbaar",
-                            "weather_data": weather_data,
-                        }
+                latitude, longitude = self.home_latitude, self.home_longitude
+            weather_data = await self.api.async_get_weather_data(
+                self.hass, self.config_data.get(CONF_WEATHER_ENTITY) or None, latitude, longitude
+            )
+            if self.wind_fusion is not None:
+                # Gemiddelden van de windsensoren gaan voor momentopnames
+                fused = self.wind_fusion.apply(weather_data, datetime.now(timezone.utc))
+                if (
+                    fused["wind_speed"] != weather_data["wind_speed"]
+                    or fused["temperature"] != weather_data["temperature"]
+                ):
+                    # Stabiliteitsklasse hoort bij de gefuseerde wind en temperatuur,
+                    # niet bij de momentopname waaruit de API hem schatte
+                    fused["stability_class"] = self.api._estimate_stability_class(
+                        fused["temperature"], fused["wind_speed"], fused.get("condition") or "unknown"
+                    )
+                weather_data = fused
+            
+            if incidents:
+                return await self._async_evaluate_incidents(incidents, weather_data)
             
             return {
                 "in_danger": False,
@@ -220,6 +496,8 @@ class NLAlertCoordinator(DataUpdateCoordinator[dict[str, Any]]):
                 "weather_data": weather_data,
             }
             
+        except ComputeSuperseded:
+            raise
         except Exception as e:
             _LOGGER.error("Error checking home danger: %s", e)
             return {
@@ -230,20 +508,326 @@ class NLAlertCoordinator(DataUpdateCoordinator[dict[str, Any]]):
                 "weather_data": {},
             }
 
+    def _collect_incidents(
+        self, hazardous_alerts: list[Alert]
+    ) -> list[tuple[Alert, frozenset[str], AlertGeometry]]:
+        """Return the hazardous alerts with a known source location."""
+        incidents: list[tuple[Alert, frozenset[str], AlertGeometry]] = []
+        for alert in hazardous_alerts:
+            # Categories are cached by the classifier during aggregation
+            hazard_categories = self.classifier.classify(alert)
+            if not hazard_categories:
+                continue
+            # Bronlocatie uit het CAP gebied; eenmalig geparsed per melding
+            geometry = self.geometry_cache.get(alert)
+            if geometry is None:
+                _LOGGER.debug("No area geometry for alert %s, skipping plume check", alert.identifier)
+                continue
+            incidents.append((alert, hazard_categories, geometry))
+        return incidents
+
+    @staticmethod
+    def _incident_sources(
+        incidents: list[tuple[Alert, frozenset[str], AlertGeometry]],
+    ) -> dict[str, tuple[float, float]]:
+        """Return the source location of each incident by alert id."""
+        return {
+            alert.identifier or f"{alert.headline}#{index}": geometry.centroid
+            for index, (alert, _, geometry) in enumerate(incidents)
+        }
+
+    async def _async_evaluate_incidents(
+        self,
+        incidents: list[tuple[Alert, frozenset[str], AlertGeometry]],
+        weather_data: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Combine the plumes of all incidents at the home location in one pass."""
+        wind_direction = weather_data.get("wind_direction", 180)
+        plume_direction = (wind_direction + 180) % 360
+        
+        try:
+            if not (self.home_latitude and self.home_longitude):
+                raise ValueError("home location not configured")
+            
+            sources = self._incident_sources(incidents)
+            wind_speed = weather_data.get("wind_speed", 5.0)
+            stability_class = weather_data.get("stability_class", DEFAULT_STABILITY_CLASS)
+            arguments = (
+                self.home_latitude,
+                self.home_longitude,
+                sources,
+                wind_direction,
+                wind_speed,
+                stability_class,
+                datetime.now(timezone.utc),
+            )
+            
+            if self.engine.stateful:
+                # Puffs volgen de waargenomen wind sinds hun uitstoot; de
+                # engine houdt state bij en blijft dus in dit proces
+                result = await self.compute.async_run_local("superpose", self.engine.evaluate, *arguments)
+            else:
+                cache_key = self.risk_cache.make_key(
+                    self.engine.name,
+                    (self.home_latitude, self.home_longitude),
+                    [lat for lat, _ in sources.values()],
+                    [lon for _, lon in sources.values()],
+                    wind_direction,
+                    wind_speed,
+                    stability_class,
+                    *self.engine.parameters,
+                )
+                result = self.risk_cache.get(cache_key)
+                if result is None:
+                    result = await self.compute.async_run("superpose", self.engine.evaluate, *arguments)
+                    self.risk_cache.put(cache_key, result)
+        except ComputeSuperseded:
+            raise
+        except Exception as e:
+            _LOGGER.error(f"Error calculating plume risk: {e}")
+            # Fallback to mock data
+            alert, hazard_categories, _ = incidents[0]
+            return {
+                "in_danger": True,
+                "status": "danger_detected",
+                "risk_percentage": 35.0,
+                "distance_km": 12.5,
+                "wind_direction": wind_direction,
+                "plume_direction": 45,
+                "concentration": 0.25,
+                "alert_headline": alert.headline,
+                "hazard_categories": sorted(hazard_categories),
+                "incident_count": len(incidents),
+                "message": "🌨️ Rookpluim detector - berekening niet beschikbaar",
+                "weather_data": weather_data,
+            }
+        
+        risk_percentages = result.risk_percentages
+        shares = result.shares
+        contributions = [
+            {
+                "alert_id": alert.identifier,
+                "headline": alert.headline,
+                "hazard_categories": sorted(hazard_categories),
+                "risk_percentage": round(float(risk_percentages[index]), 2),
+                "share": round(float(shares[index]), 3),
+                "distance_km": round(float(result.distances_km[index]), 2),
+                "latitude": geometry.latitude,
+                "longitude": geometry.longitude,
+            }
+            for index, (alert, hazard_categories, geometry) in enumerate(incidents)
+        ]
+        contributions.sort(key=lambda item: item["share"], reverse=True)
+        
+        if isinstance(result, EnsembleSuperposition):
+            ensemble = result.ensemble.as_dict()
+        elif self._ensemble_members:
+            ensemble = await self._async_run_ensemble(incidents, weather_data)
+        else:
+            ensemble = None
+        
+        alert, hazard_categories, geometry = incidents[result.dominant_index]
+        risk_percentage = result.risk_percentage
+        distance_km = float(result.distances_km[result.dominant_index])
+        message = f"🌨️ Rookpluim risico: {risk_percentage:.1f}% op {distance_km:.1f}km afstand"
+        if len(incidents) > 1:
+            message += f" ({len(incidents)} incidenten)"
+        
+        return {
+            "in_danger": risk_percentage > 1.0,
+            "status": "danger_detected" if risk_percentage > 1.0 else "low_risk",
+            "risk_percentage": risk_percentage,
+            "distance_km": distance_km,
+            "wind_direction": wind_direction,
+            "plume_direction": plume_direction,
+            "concentration": risk_percentage / 100.0,
+            "alert_headline": alert.headline,
+            "hazard_categories": sorted(hazard_categories),
+            "incident_latitude": geometry.latitude,
+            "incident_longitude": geometry.longitude,
+            "incident_bbox": list(geometry.bbox),
+            "incident_count": len(incidents),
+            "dominant_alert_id": alert.identifier,
+            "contributions": contributions,
+            "dispersion_model": self.engine.name,
+            "wind_direction_std": weather_data.get("wind_direction_std"),
+            "ensemble": ensemble,
+            "message": message,
+            "weather_data": weather_data,
+        }
+
+    async def _async_get_forecast(self) -> list[ForecastStep]:
+        """Return the hourly forecast of the weather entity in m/s and degrees Celsius."""
+        entity_id = self.config_data.get(CONF_WEATHER_ENTITY)
+        response = await self.hass.services.async_call(
+            "weather",
+            "get_forecasts",
+            {"entity_id": entity_id, "type": FORECAST_TYPE},
+            blocking=True,
+            return_response=True,
+        )
+        forecast = (response or {}).get(entity_id, {}).get("forecast", [])
+        state = self.hass.states.get(entity_id)
+        attributes = state.attributes if state is not None else {}
+        speed_unit = attributes.get("wind_speed_unit")
+        temperature_unit = attributes.get("temperature_unit")
+        
+        steps = []
+        for item in forecast[:MAX_FORECAST_STEPS]:
+            time = dt_util.parse_datetime(str(item.get("datetime", "")))
+            try:
+                wind_speed = float(item["wind_speed"])
+                wind_direction = float(item["wind_bearing"])
+            except (KeyError, TypeError, ValueError):
+                # Stappen zonder (numerieke) wind zijn onbruikbaar voor de pluim
+                continue
+            if time is None:
+                continue
+            temperature = item.get("temperature")
+            if speed_unit:
+                wind_speed = SpeedConverter.convert(wind_speed, speed_unit, UnitOfSpeed.METERS_PER_SECOND)
+            if temperature is not None and temperature_unit:
+                temperature = TemperatureConverter.convert(
+                    float(temperature), temperature_unit, UnitOfTemperature.CELSIUS
+                )
+            stability_class = self.api._estimate_stability_class(
+                temperature if temperature is not None else 15.0,
+                wind_speed,
+                item.get("condition") or "unknown",
+            )
+            steps.append(ForecastStep(time, wind_speed, wind_direction, temperature, stability_class))
+        return steps
+
+    async def _async_update_risk_forecast(self, hazardous_alerts: list[Alert]) -> dict[str, Any]:
+        """Return the risk timeline over the forecast steps of the weather entity.
+
+        Steps whose quantized weather is unchanged since the last run keep
+        their result; the others are evaluated in one batched call.
+        """
+        timeline = self.forecast_timeline
+        previous = (self._last_data or {}).get("risk_forecast", {})
+        try:
+            steps = await self._async_get_forecast()
+            receptor = (self.home_latitude, self.home_longitude)
+            sources = self._incident_sources(self._collect_incidents(hazardous_alerts))
+            pending = timeline.pending(receptor, sources, steps)
+            if pending:
+                entries = await self.compute.async_run(
+                    "forecast", evaluate_forecast, *receptor, sources, pending
+                )
+                timeline.store(pending, entries)
+        except ComputeSuperseded:
+            _LOGGER.debug("Forecast computation superseded by a newer refresh")
+            return previous
+        except (HomeAssistantError, ValueError) as err:
+            _LOGGER.warning("Could not get the forecast of %s: %s", self.config_data.get(CONF_WEATHER_ENTITY), err)
+            return previous
+        
+        entries = timeline.as_list()
+        peak = max(entries, key=lambda entry: entry["risk_percentage"], default=None)
+        return {
+            "timeline": entries,
+            "peak_risk_percentage": peak["risk_percentage"] if peak else 0,
+            "peak_time": peak["datetime"] if peak and peak["risk_percentage"] > 0 else None,
+            "stats": timeline.stats,
+        }
+
+    async def _async_run_ensemble(
+        self,
+        incidents: list[tuple[Alert, frozenset[str], AlertGeometry]],
+        weather_data: dict[str, Any],
+    ) -> dict[str, Any] | None:
+        """Return median, p90 and exceedance probability of the wind ensemble."""
+        incident_lats = [geometry.latitude for _, _, geometry in incidents]
+        incident_lons = [geometry.longitude for _, _, geometry in incidents]
+        wind_direction = weather_data.get("wind_direction", 180)
+        wind_speed = weather_data.get("wind_speed", 5.0)
+        stability_class = weather_data.get("stability_class", DEFAULT_STABILITY_CLASS)
+        cache_key = self.risk_cache.make_key(
+            "ensemble",
+            (self.home_latitude, self.home_longitude),
+            incident_lats,
+            incident_lons,
+            wind_direction,
+            wind_speed,
+            stability_class,
+            self._ensemble_members,
+            self._direction_spread,
+            self._speed_spread,
+        )
+        summary = self.risk_cache.get(cache_key)
+        if summary is not None:
+            return summary
+        
+        try:
+            from ._ensemble import run_ensemble
+            
+            result = await self.compute.async_run(
+                "ensemble",
+                run_ensemble,
+                self.home_latitude,
+                self.home_longitude,
+                incident_lats,
+                incident_lons,
+                wind_direction,
+                wind_speed,
+                stability_class,
+                self._ensemble_members,
+                self._direction_spread,
+                self._speed_spread,
+            )
+        except ComputeSuperseded:
+            raise
+        except Exception as e:
+            _LOGGER.error("Error running wind ensemble: %s", e)
+            return None
+        summary = result.as_dict()
+        self.risk_cache.put(cache_key, summary)
+        return summary
+
     @property
-    def historical_alerts(self) -> list[dict[str, Any]]:
+    def historical_alerts(self) -> list[Alert]:
         """Get historical alerts list."""
-        return self._historical_alerts
+        return self._historical_alerts.as_list()
     
     @historical_alerts.setter
-    def historical_alerts(self, value: list[dict[str, Any]]) -> None:
+    def historical_alerts(self, value: list[Alert]) -> None:
         """Set historical alerts list."""
-        self._historical_alerts = value
+        self._historical_alerts = AlertHistory(self._historical_alerts.max_size, value)
+
+    async def async_load_history(self) -> None:
+        """Load the persisted archive; scheduled after setup so it does not delay it."""
+        cutoff_date = datetime.now(timezone.utc) - self._history_retention
+        stored_alerts = await self.history_store.async_load(
+            self._historical_alerts.max_size, cutoff_date
+        )
+        if not stored_alerts:
+            return
+        
+        # Stored alerts are older than anything fetched since startup
+        self._historical_alerts = AlertHistory(
+            self._historical_alerts.max_size, [*stored_alerts, *self._historical_alerts]
+        )
+        self._last_data = None  # Force full processing on next refresh
+        _LOGGER.info("Loaded %d historical alerts from storage", len(stored_alerts))
+        
+        if self.data is not None:
+            # Niet via async_set_updated_data: dat zou de volgende poll uitstellen
+            self.data = {
+                **self.data,
+                "historical_alerts": self._historical_alerts.as_list(),
+                "historical_count": len(self._historical_alerts),
+            }
+            self.async_update_listeners()
 
     async def clear_historical_data(self) -> None:
         """Clear historical alerts data."""
         try:
-            self._historical_alerts = []
+            self._historical_alerts.clear()
+            await self.history_store.async_clear()
+            self._last_data = None  # Force full processing on next refresh
+            # Zonder feedlijst vult alleen een volledige download het archief opnieuw
+            self.api.forget_validators()
             _LOGGER.info("Historical alerts data cleared")
             # Trigger update to notify all listeners
             await self.async_refresh()
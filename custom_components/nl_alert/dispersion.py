@@ -0,0 +1,270 @@
+"""Dispersion engines that turn incidents and weather into exposure at the home.
+
+Every engine answers the same question: the concentration each incident
+causes at one receptor, as a SuperpositionResult. The engine used is chosen
+per config entry through ENGINES.
+"""
+from __future__ import annotations
+
+import math
+import threading
+from datetime import datetime, timezone
+from typing import Any
+
+import numpy as np
+
+from ._atmospheric_model import (
+    _calculate_bearing,
+    _calculate_distance,
+    _gaussian_plume_concentration,
+)
+from ._batch_risk import MAX_RISK_DISTANCE_KM, SuperpositionResult, superpose_incidents
+from ._ensemble import DEFAULT_MEMBERS, EnsembleResult, run_ensemble
+from .const import (
+    CONF_DISPERSION_ENGINE,
+    CONF_ENSEMBLE_MEMBERS,
+    CONF_WIND_DIRECTION_SPREAD,
+    CONF_WIND_SPEED_SPREAD,
+    DEFAULT_DISPERSION_ENGINE,
+    DEFAULT_STABILITY_CLASS,
+    DEFAULT_WIND_DIRECTION_SPREAD,
+    DEFAULT_WIND_SPEED_SPREAD,
+)
+
+ENGINE_SCALAR = "scalar"
+ENGINE_VECTORIZED = "vectorized"
+ENGINE_PUFF = "puff"
+ENGINE_ENSEMBLE = "ensemble"
+
+Sources = dict[str, tuple[float, float]]
+
+
+class DispersionEngine:
+    """Interface of a dispersion engine.
+
+    sources maps an incident id to its (lat, lon); results are in the order
+    of sources. wind_direction is where the wind comes FROM.
+    """
+
+    name = ""
+    # Engines that keep state between updates must run in this process and
+    # their results cannot be cached
+    stateful = False
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> DispersionEngine:
+        """Create the engine from config entry data."""
+        return cls()
+
+    @property
+    def parameters(self) -> tuple:
+        """Return the settings that affect results, for cache keys."""
+        return ()
+
+    def evaluate(
+        self,
+        receptor_lat: float,
+        receptor_lon: float,
+        sources: Sources,
+        wind_direction: float,
+        wind_speed: float,
+        stability_class: str = DEFAULT_STABILITY_CLASS,
+        now: datetime | None = None,
+    ) -> SuperpositionResult:
+        """Return the exposure at the receptor from every source."""
+        raise NotImplementedError
+
+
+class ScalarEngine(DispersionEngine):
+    """The scalar Gaussian plume of _atmospheric_model, one incident at a time."""
+
+    name = ENGINE_SCALAR
+
+    def evaluate(
+        self,
+        receptor_lat: float,
+        receptor_lon: float,
+        sources: Sources,
+        wind_direction: float,
+        wind_speed: float,
+        stability_class: str = DEFAULT_STABILITY_CLASS,
+        now: datetime | None = None,
+    ) -> SuperpositionResult:
+        """Return the exposure at the receptor from every source."""
+        concentrations = np.zeros(len(sources))
+        distances = np.zeros(len(sources))
+        plume_direction = (wind_direction + 180) % 360
+        for index, (lat, lon) in enumerate(sources.values()):
+            distance_km = _calculate_distance(receptor_lat, receptor_lon, lat, lon)
+            distances[index] = distance_km
+            if distance_km > MAX_RISK_DISTANCE_KM:
+                continue
+            angle_diff = abs(_calculate_bearing(lat, lon, receptor_lat, receptor_lon) - plume_direction)
+            if angle_diff > 180:
+                angle_diff = 360 - angle_diff
+            concentrations[index] = _gaussian_plume_concentration(
+                distance_m=distance_km * 1000,
+                crosswind_m=distance_km * 1000 * math.sin(math.radians(angle_diff)),
+                height_m=2.0,
+                source_height=20.0,
+                wind_speed=wind_speed,
+                stability_class=stability_class,
+            )
+        return SuperpositionResult(concentrations, distances)
+
+
+class VectorizedEngine(DispersionEngine):
+    """The NumPy Gaussian plume of _batch_risk, all incidents in one pass."""
+
+    name = ENGINE_VECTORIZED
+
+    def evaluate(
+        self,
+        receptor_lat: float,
+        receptor_lon: float,
+        sources: Sources,
+        wind_direction: float,
+        wind_speed: float,
+        stability_class: str = DEFAULT_STABILITY_CLASS,
+        now: datetime | None = None,
+    ) -> SuperpositionResult:
+        """Return the exposure at the receptor from every source."""
+        return superpose_incidents(
+            receptor_lat,
+            receptor_lon,
+            [lat for lat, _ in sources.values()],
+            [lon for _, lon in sources.values()],
+            wind_direction,
+            wind_speed,
+            stability_class,
+        )
+
+
+class PuffEngine(DispersionEngine):
+    """The Lagrangian puff model of _puff_model; puffs persist between updates."""
+
+    name = ENGINE_PUFF
+    stateful = True
+
+    def __init__(self) -> None:
+        """Initialize with an empty puff tracker."""
+        from ._puff_model import PuffTracker
+
+        self.tracker = PuffTracker()
+        # Overlapping refreshes run in different executor threads; a superseded
+        # job keeps running, so the tracker state is guarded here
+        self._lock = threading.Lock()
+
+    def evaluate(
+        self,
+        receptor_lat: float,
+        receptor_lon: float,
+        sources: Sources,
+        wind_direction: float,
+        wind_speed: float,
+        stability_class: str = DEFAULT_STABILITY_CLASS,
+        now: datetime | None = None,
+    ) -> SuperpositionResult:
+        """Advance the puffs to now and return the exposure from every source.
+
+        Calls are serialized; a call that acquires the lock after a newer one
+        does not move the puffs back in time.
+        """
+        now = now or datetime.now(timezone.utc)
+        with self._lock:
+            last_update = self.tracker.last_update
+            if last_update is not None and now < last_update:
+                now = last_update
+            self.tracker.stability_class = stability_class
+            return self.tracker.superpose(
+                now,
+                receptor_lat,
+                receptor_lon,
+                sources,
+                wind_direction,
+                wind_speed,
+            )
+
+
+class EnsembleSuperposition(SuperpositionResult):
+    """Ensemble-mean exposure together with the full ensemble."""
+
+    __slots__ = ("ensemble",)
+
+    def __init__(self, ensemble: EnsembleResult) -> None:
+        """Initialize from an ensemble run."""
+        super().__init__(ensemble.concentrations, ensemble.distances_km)
+        self.ensemble = ensemble
+
+
+class EnsembleEngine(DispersionEngine):
+    """Monte Carlo wind ensemble of _ensemble; reports the member mean."""
+
+    name = ENGINE_ENSEMBLE
+
+    def __init__(
+        self,
+        members: int = DEFAULT_MEMBERS,
+        direction_spread: float = DEFAULT_WIND_DIRECTION_SPREAD,
+        speed_spread: float = DEFAULT_WIND_SPEED_SPREAD / 100,
+    ) -> None:
+        """Initialize with the ensemble size and spreads."""
+        self.members = members
+        self.direction_spread = direction_spread
+        self.speed_spread = speed_spread
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> DispersionEngine:
+        """Create the engine from config entry data."""
+        return cls(
+            # 0 schakelt het losse ensemble uit; als engine is het altijd aan
+            int(config.get(CONF_ENSEMBLE_MEMBERS) or DEFAULT_MEMBERS),
+            float(config.get(CONF_WIND_DIRECTION_SPREAD, DEFAULT_WIND_DIRECTION_SPREAD)),
+            float(config.get(CONF_WIND_SPEED_SPREAD, DEFAULT_WIND_SPEED_SPREAD)) / 100,
+        )
+
+    @property
+    def parameters(self) -> tuple:
+        """Return the settings that affect results, for cache keys."""
+        return (self.members, self.direction_spread, self.speed_spread)
+
+    def evaluate(
+        self,
+        receptor_lat: float,
+        receptor_lon: float,
+        sources: Sources,
+        wind_direction: float,
+        wind_speed: float,
+        stability_class: str = DEFAULT_STABILITY_CLASS,
+        now: datetime | None = None,
+    ) -> EnsembleSuperposition:
+        """Return the ensemble-mean exposure at the receptor from every source."""
+        return EnsembleSuperposition(
+            run_ensemble(
+                receptor_lat,
+                receptor_lon,
+                [lat for lat, _ in sources.values()],
+                [lon for _, lon in sources.values()],
+                wind_direction,
+                wind_speed,
+                stability_class,
+                members=self.members,
+                direction_spread=self.direction_spread,
+                speed_spread=self.speed_spread,
+            )
+        )
+
+
+ENGINES: dict[str, type[DispersionEngine]] = {
+    ENGINE_SCALAR: ScalarEngine,
+    ENGINE_VECTORIZED: VectorizedEngine,
+    ENGINE_PUFF: PuffEngine,
+    ENGINE_ENSEMBLE: EnsembleEngine,
+}
+
+
+def create_engine(config: dict[str, Any]) -> DispersionEngine:
+    """Return the engine selected in config entry data."""
+    name = config.get(CONF_DISPERSION_ENGINE) or DEFAULT_DISPERSION_ENGINE
+    engine_class = ENGINES.get(name, ENGINES[DEFAULT_DISPERSION_ENGINE])
+    return engine_class.from_config(config)
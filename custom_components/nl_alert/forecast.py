@@ -0,0 +1,170 @@
+"""Plume risk timeline for the forecast steps of a weather entity.
+
+The forecast of a weather entity rarely changes much between polls: most
+hourly steps keep their wind and stability. ForecastTimeline remembers the
+result of every step together with the (quantized) weather it was computed
+for, so only new or changed steps are evaluated again. The steps that do
+need an evaluation are computed together by evaluate_forecast.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Sequence
+
+import numpy as np
+
+from ._batch_risk import RISK_FACTOR, superpose_forecast
+from .risk_cache import COORDINATE_DECIMALS, DIRECTION_STEP, SPEED_STEP
+
+# Forecast type requested from the weather entity and the steps kept
+FORECAST_TYPE = "hourly"
+MAX_FORECAST_STEPS = 48
+
+
+class ForecastStep:
+    """Weather of one forecast step, in m/s, degrees and degrees Celsius."""
+
+    __slots__ = ("time", "wind_speed", "wind_direction", "temperature", "stability_class")
+
+    def __init__(
+        self,
+        time: datetime,
+        wind_speed: float,
+        wind_direction: float,
+        temperature: float | None,
+        stability_class: str,
+    ) -> None:
+        """Initialize a step."""
+        self.time = time
+        self.wind_speed = wind_speed
+        self.wind_direction = wind_direction
+        self.temperature = temperature
+        self.stability_class = stability_class
+
+    @property
+    def key(self) -> tuple:
+        """Return the quantized weather; steps with equal keys have equal risk."""
+        return (
+            round(self.wind_direction % 360 / DIRECTION_STEP),
+            round(self.wind_speed / SPEED_STEP),
+            self.stability_class,
+        )
+
+
+def evaluate_forecast(
+    receptor_lat: float,
+    receptor_lon: float,
+    sources: dict[str, tuple[float, float]],
+    steps: Sequence[ForecastStep],
+) -> list[dict[str, Any]]:
+    """Return the risk at the receptor for every step, in one batched pass.
+
+    sources maps an incident id to its (latitude, longitude).
+    """
+    incident_ids = list(sources)
+    concentration, distance_km = superpose_forecast(
+        receptor_lat,
+        receptor_lon,
+        [lat for lat, _ in sources.values()],
+        [lon for _, lon in sources.values()],
+        [step.wind_direction for step in steps],
+        [step.wind_speed for step in steps],
+        [step.stability_class for step in steps],
+    )
+    totals = concentration.sum(axis=1)
+    entries = []
+    for index, step in enumerate(steps):
+        dominant = None
+        if incident_ids:
+            # Zonder blootstelling geldt het dichtstbijzijnde incident als dominant
+            ranking = concentration[index] if totals[index] > 0 else -distance_km
+            dominant = int(np.argmax(ranking))
+        entries.append(
+            {
+                "datetime": step.time.isoformat(),
+                "risk_percentage": round(min(float(totals[index]) * RISK_FACTOR, 100.0), 2),
+                "wind_speed": round(step.wind_speed, 1),
+                "wind_direction": round(step.wind_direction),
+                "stability_class": step.stability_class,
+                "dominant_alert_id": incident_ids[dominant] if dominant is not None else None,
+                "distance_km": round(float(distance_km[dominant]), 2) if dominant is not None else None,
+            }
+        )
+    return entries
+
+
+class ForecastTimeline:
+    """Per-step risk results that survive between forecast updates."""
+
+    def __init__(self, coordinate_decimals: int = COORDINATE_DECIMALS) -> None:
+        """Initialize an empty timeline."""
+        self.coordinate_decimals = coordinate_decimals
+        self._context: tuple | None = None
+        # Step time -> (weather key, timeline entry)
+        self._entries: dict[datetime, tuple[tuple, dict[str, Any]]] = {}
+        self.computed = 0
+        self.reused = 0
+
+    def __len__(self) -> int:
+        """Return the number of steps with a result."""
+        return len(self._entries)
+
+    def _make_context(
+        self, receptor: tuple[float, float], sources: dict[str, tuple[float, float]]
+    ) -> tuple:
+        """Return the quantized receptor and incidents the results depend on."""
+        decimals = self.coordinate_decimals
+        return (
+            round(receptor[0], decimals),
+            round(receptor[1], decimals),
+            tuple(
+                (incident_id, round(lat, decimals), round(lon, decimals))
+                for incident_id, (lat, lon) in sources.items()
+            ),
+        )
+
+    def pending(
+        self,
+        receptor: tuple[float, float],
+        sources: dict[str, tuple[float, float]],
+        steps: Sequence[ForecastStep],
+    ) -> list[ForecastStep]:
+        """Return the steps without a result for their current weather.
+
+        Other incidents or another receptor invalidate every step; results
+        of steps no longer in the forecast are dropped.
+        """
+        context = self._make_context(receptor, sources)
+        if context != self._context:
+            self._context = context
+            self._entries.clear()
+        current = {step.time for step in steps}
+        for time in [time for time in self._entries if time not in current]:
+            del self._entries[time]
+        pending = [
+            step
+            for step in steps
+            if step.time not in self._entries or self._entries[step.time][0] != step.key
+        ]
+        self.computed += len(pending)
+        self.reused += len(steps) - len(pending)
+        return pending
+
+    def store(self, steps: Sequence[ForecastStep], entries: Sequence[dict[str, Any]]) -> None:
+        """Keep the entries computed for steps."""
+        for step, entry in zip(steps, entries):
+            self._entries[step.time] = (step.key, entry)
+
+    def as_list(self) -> list[dict[str, Any]]:
+        """Return the timeline entries in time order."""
+        return [self._entries[time][1] for time in sorted(self._entries)]
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return the number of step evaluations done and avoided."""
+        return {"computed": self.computed, "reused": self.reused, "steps": len(self._entries)}
+
+    def clear(self) -> None:
+        """Forget all results."""
+        self._context = None
+        self._entries.clear()
@@ -0,0 +1,211 @@
+"""CAP area geometry for NL-Alert alerts."""
+from __future__ import annotations
+
+import logging
+import math
+from collections import OrderedDict
+
+import numpy as np
+
+from .models import Alert
+
+_LOGGER = logging.getLogger(__name__)
+
+# Geometries kept per alert identifier
+CACHE_SIZE = 1024
+
+# Km per degree latitude (spherical earth, R = 6371 km)
+_KM_PER_DEGREE = 6371.0 * math.pi / 180.0
+
+
+class AlertGeometry:
+    """Parsed CAP area of one alert.
+
+    polygons holds one (n, 2) float array of (lat, lon) vertices per ring.
+    Circles are kept as (lat, lon, radius_km).
+    """
+
+    __slots__ = ("polygons", "circles", "centroid", "bbox")
+
+    def __init__(
+        self,
+        polygons: list[np.ndarray],
+        circles: list[tuple[float, float, float]],
+    ) -> None:
+        """Initialize the geometry and derive centroid and bounding box."""
+        self.polygons = polygons
+        self.circles = circles
+        self.centroid = _centroid(polygons, circles)
+        self.bbox = _bbox(polygons, circles)
+
+    @property
+    def latitude(self) -> float:
+        """Return the centroid latitude."""
+        return self.centroid[0]
+
+    @property
+    def longitude(self) -> float:
+        """Return the centroid longitude."""
+        return self.centroid[1]
+
+    def __repr__(self) -> str:
+        """Return a short representation for logging."""
+        return (
+            f"AlertGeometry({len(self.polygons)} polygon(s), {len(self.circles)} circle(s), "
+            f"centroid=({self.centroid[0]:.4f}, {self.centroid[1]:.4f}))"
+        )
+
+
+def _as_list(value: str | list[str] | None) -> list[str]:
+    """Return a CAP polygon/circle field as a list of strings."""
+    if not value:
+        return []
+    if isinstance(value, str):
+        return [value]
+    return [item for item in value if isinstance(item, str) and item]
+
+
+def parse_polygon(text: str) -> np.ndarray | None:
+    """Parse a CAP polygon into an (n, 2) array of (lat, lon).
+
+    Accepts the standard "lat,lon lat,lon ..." form as well as the
+    "lat lon lat lon ..." form some feeds use.
+    """
+    try:
+        values = np.array(text.replace(",", " ").split(), dtype=float)
+    except ValueError:
+        _LOGGER.warning("Invalid CAP polygon: %.60s", text)
+        return None
+    if len(values) < 6 or len(values) % 2:
+        _LOGGER.warning("Invalid CAP polygon: %.60s", text)
+        return None
+    return values.reshape(-1, 2)
+
+
+def parse_circle(text: str) -> tuple[float, float, float] | None:
+    """Parse a CAP circle "lat,lon radius_km" into (lat, lon, radius_km)."""
+    try:
+        lat, lon, radius = (float(value) for value in text.replace(",", " ").split())
+    except ValueError:
+        _LOGGER.warning("Invalid CAP circle: %.60s", text)
+        return None
+    return lat, lon, radius
+
+
+def _ring_centroid(points: np.ndarray) -> tuple[float, float, float]:
+    """Return (area, lat, lon) of a ring with the shoelace formula."""
+    # Relative to the first vertex, to avoid cancellation in the cross products
+    lat0, lon0 = float(points[0, 0]), float(points[0, 1])
+    lat = points[:, 0] - lat0
+    lon = points[:, 1] - lon0
+    lat_next = np.roll(lat, -1)
+    lon_next = np.roll(lon, -1)
+    cross = lon * lat_next - lon_next * lat
+    area = cross.sum() / 2
+    if abs(area) < 1e-12:
+        # Degenerate ring (line or point): use the vertex mean
+        return 0.0, lat0 + float(lat.mean()), lon0 + float(lon.mean())
+    c_lat = ((lat + lat_next) * cross).sum() / (6 * area)
+    c_lon = ((lon + lon_next) * cross).sum() / (6 * area)
+    return abs(float(area)), lat0 + float(c_lat), lon0 + float(c_lon)
+
+
+def _centroid(
+    polygons: list[np.ndarray], circles: list[tuple[float, float, float]]
+) -> tuple[float, float]:
+    """Area-weighted centroid of all rings and circles."""
+    weights = []
+    lats = []
+    lons = []
+    for points in polygons:
+        area, lat, lon = _ring_centroid(points)
+        weights.append(area)
+        lats.append(lat)
+        lons.append(lon)
+    for lat, lon, radius_km in circles:
+        radius_deg = radius_km / _KM_PER_DEGREE
+        weights.append(math.pi * radius_deg**2 * math.cos(math.radians(lat)))
+        lats.append(lat)
+        lons.append(lon)
+
+    total = sum(weights)
+    if total <= 0:
+        return sum(lats) / len(lats), sum(lons) / len(lons)
+    return (
+        sum(w * lat for w, lat in zip(weights, lats)) / total,
+        sum(w * lon for w, lon in zip(weights, lons)) / total,
+    )
+
+
+def _bbox(
+    polygons: list[np.ndarray], circles: list[tuple[float, float, float]]
+) -> tuple[float, float, float, float]:
+    """Return (min_lat, min_lon, max_lat, max_lon) of all rings and circles."""
+    min_lat = min_lon = math.inf
+    max_lat = max_lon = -math.inf
+    for points in polygons:
+        min_lat = min(min_lat, float(points[:, 0].min()))
+        max_lat = max(max_lat, float(points[:, 0].max()))
+        min_lon = min(min_lon, float(points[:, 1].min()))
+        max_lon = max(max_lon, float(points[:, 1].max()))
+    for lat, lon, radius_km in circles:
+        d_lat = radius_km / _KM_PER_DEGREE
+        d_lon = d_lat / max(math.cos(math.radians(lat)), 1e-6)
+        min_lat = min(min_lat, lat - d_lat)
+        max_lat = max(max_lat, lat + d_lat)
+        min_lon = min(min_lon, lon - d_lon)
+        max_lon = max(max_lon, lon + d_lon)
+    return min_lat, min_lon, max_lat, max_lon
+
+
+def parse_alert_geometry(alert: Alert) -> AlertGeometry | None:
+    """Parse the polygon and circle fields of an alert; None without an area."""
+    polygons = [
+        points
+        for points in (parse_polygon(text) for text in _as_list(alert.polygon))
+        if points is not None
+    ]
+    circles = [
+        circle
+        for circle in (parse_circle(text) for text in _as_list(alert.circle))
+        if circle is not None
+    ]
+    if not polygons and not circles:
+        return None
+    return AlertGeometry(polygons, circles)
+
+
+class GeometryCache:
+    """Parse each alert area once per identifier.
+
+    The result is also stored on the alert record, so later lookups for the
+    same record skip the cache entirely.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty cache."""
+        self._cache: OrderedDict[str, AlertGeometry | None] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, alert: Alert) -> AlertGeometry | None:
+        """Return the geometry of an alert, parsing it only on first sight."""
+        if alert.geometry is not None:
+            self.hits += 1
+            return alert.geometry
+
+        alert_id = alert.identifier
+        if alert_id is not None and alert_id in self._cache:
+            self._cache.move_to_end(alert_id)
+            self.hits += 1
+            geometry = self._cache[alert_id]
+        else:
+            self.misses += 1
+            geometry = parse_alert_geometry(alert)
+            if alert_id is not None:
+                self._cache[alert_id] = geometry
+                if len(self._cache) > CACHE_SIZE:
+                    self._cache.popitem(last=False)
+
+        alert.geometry = geometry
+        return geometry
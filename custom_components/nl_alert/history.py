@@ -0,0 +1,80 @@
+"""Historical alert archive for the NL-Alert integration."""
+from __future__ import annotations
+
+from collections import OrderedDict
+from datetime import datetime
+from typing import Iterable, Iterator
+
+from .models import Alert
+
+
+class AlertHistory:
+    """Bounded, insertion-ordered archive of alerts keyed by identifier.
+
+    Membership, insertion and eviction of the oldest alert are O(1).
+    """
+
+    def __init__(self, max_size: int, alerts: Iterable[Alert] = ()) -> None:
+        """Initialize the archive."""
+        self.max_size = max_size
+        self._index: OrderedDict[str, Alert] = OrderedDict()
+        self._list: list[Alert] | None = None
+        for alert in alerts:
+            self.add(alert)
+
+    def add(self, alert: Alert) -> bool:
+        """Add an alert; return False if its identifier is already archived."""
+        alert_id = alert.identifier
+        if not alert_id or alert_id in self._index:
+            return False
+        self._index[alert_id] = alert
+        while len(self._index) > self.max_size:
+            self._index.popitem(last=False)
+        self._list = None
+        return True
+
+    def remove(self, alert_id: str) -> Alert | None:
+        """Remove and return an alert by identifier."""
+        alert = self._index.pop(alert_id, None)
+        if alert is not None:
+            self._list = None
+        return alert
+
+    def prune(self, cutoff: datetime) -> int:
+        """Remove alerts sent before cutoff.
+
+        Alerts without a sent time count from when they were archived.
+        """
+        expired = []
+        for alert_id, alert in self._index.items():
+            retention_time = alert.retention_time
+            if retention_time is not None and retention_time < cutoff:
+                expired.append(alert_id)
+        for alert_id in expired:
+            del self._index[alert_id]
+        if expired:
+            self._list = None
+        return len(expired)
+
+    def clear(self) -> None:
+        """Remove all alerts."""
+        self._index.clear()
+        self._list = None
+
+    def as_list(self) -> list[Alert]:
+        """Return the alerts oldest first; the list is rebuilt only after changes."""
+        if self._list is None:
+            self._list = list(self._index.values())
+        return self._list
+
+    def __contains__(self, alert_id: object) -> bool:
+        """Return True if an alert with this identifier is archived."""
+        return alert_id in self._index
+
+    def __len__(self) -> int:
+        """Return the number of archived alerts."""
+        return len(self._index)
+
+    def __iter__(self) -> Iterator[Alert]:
+        """Iterate over the alerts oldest first."""
+        return iter(self._index.values())
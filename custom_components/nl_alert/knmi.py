@@ -0,0 +1,364 @@
+"""KNMI 10-minute station observations with a nearest-station index.
+
+The KNMI Open Data API publishes one file with the latest observations of
+all automatic weather stations every 10 minutes. The client downloads it at
+most once per publication interval, keeps it on disk so a restart does not
+download it again, and answers "weather at this point" from the nearest
+station with valid wind data.
+"""
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import logging
+import math
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Mapping, Sequence
+
+import aiohttp
+import async_timeout
+import numpy as np
+
+from .const import KNMI_STATIONS_ENDPOINT
+
+_LOGGER = logging.getLogger(__name__)
+
+# Needed to read the observation files; installed by Home Assistant on setup
+# of an entry with a KNMI API key, so installs without one do not pull it in
+REQUIREMENTS = ["netCDF4>=1.6.0"]
+
+# KNMI publishes a new observation file every 10 minutes
+PUBLICATION_INTERVAL = timedelta(minutes=10)
+REQUEST_TIMEOUT = 30
+
+_KM_PER_DEGREE = 6371.0 * math.pi / 180.0
+# Reference time of the "time" variable in the observation files
+_NETCDF_EPOCH = datetime(1950, 1, 1, tzinfo=timezone.utc)
+
+
+class StationObservation:
+    """Latest observation of one KNMI station."""
+
+    __slots__ = (
+        "station_id",
+        "name",
+        "latitude",
+        "longitude",
+        "wind_speed",
+        "wind_direction",
+        "temperature",
+        "pressure",
+        "humidity",
+        "observed_at",
+    )
+
+    def __init__(
+        self,
+        station_id: str,
+        name: str,
+        latitude: float,
+        longitude: float,
+        wind_speed: float | None,
+        wind_direction: float | None,
+        temperature: float | None,
+        pressure: float | None,
+        humidity: float | None,
+        observed_at: datetime | None,
+    ) -> None:
+        """Initialize from values in SI units; missing values are None."""
+        self.station_id = station_id
+        self.name = name
+        self.latitude = latitude
+        self.longitude = longitude
+        self.wind_speed = wind_speed
+        self.wind_direction = wind_direction
+        self.temperature = temperature
+        self.pressure = pressure
+        self.humidity = humidity
+        self.observed_at = observed_at
+
+    @property
+    def has_wind(self) -> bool:
+        """Return True if both wind speed and direction were observed."""
+        return self.wind_speed is not None and self.wind_direction is not None
+
+
+def _value(values: Any, index: int) -> float | None:
+    """Return one value of a (masked) NetCDF variable, or None if missing."""
+    value = values[index]
+    if np.ma.is_masked(value) or not np.isfinite(value):
+        return None
+    return float(value)
+
+
+def netcdf_available() -> bool:
+    """Return True if netCDF4, needed to read the observation files, is installed."""
+    return importlib.util.find_spec("netCDF4") is not None
+
+
+def parse_variables(variables: Mapping[str, Any]) -> list[StationObservation]:
+    """Read the stations from the variables of a KNMI 10-minute observation file.
+
+    variables maps a variable name to an object that yields a (masked)
+    array when sliced with [:], such as netCDF4 variables. Wind speed (ff)
+    is the 10-minute mean in m/s, wind direction (dd) in degrees,
+    temperature (ta) in degrees Celsius, pressure (pp) in hPa and relative
+    humidity (rh) in percent.
+    """
+
+    def column(name: str) -> Any:
+        if name not in variables:
+            return np.ma.masked_all(len(variables["lat"][:]))
+        values = variables[name][:]
+        # (station, time) in the KNMI files; the file holds one time step
+        return values[:, -1] if values.ndim == 2 else values
+
+    observed_at = None
+    if "time" in variables:
+        seconds = float(np.ma.filled(variables["time"][:], np.nan).ravel()[-1])
+        if math.isfinite(seconds):
+            observed_at = _NETCDF_EPOCH + timedelta(seconds=seconds)
+
+    station_ids = [str(station).strip() for station in variables["station"][:]]
+    names = (
+        [str(name).strip() for name in variables["stationname"][:]]
+        if "stationname" in variables
+        else station_ids
+    )
+    lats, lons = column("lat"), column("lon")
+    ff, dd, ta, pp, rh = (column(name) for name in ("ff", "dd", "ta", "pp", "rh"))
+
+    return [
+        StationObservation(
+            station_ids[index],
+            names[index],
+            float(lats[index]),
+            float(lons[index]),
+            _value(ff, index),
+            _value(dd, index),
+            _value(ta, index),
+            _value(pp, index),
+            _value(rh, index),
+            observed_at,
+        )
+        for index in range(len(station_ids))
+    ]
+
+
+def parse_observations(path: str) -> list[StationObservation]:
+    """Read a KNMI 10-minute observation file (blocking); needs netCDF4."""
+    from netCDF4 import Dataset  # pylint: disable=import-outside-toplevel
+
+    with Dataset(path) as dataset:
+        return parse_variables(dataset.variables)
+
+
+class StationIndex:
+    """2-d tree over station positions for nearest-station lookups.
+
+    Positions are projected to kilometres on a plane tangent at the mean
+    latitude, which is accurate to well under a percent across the
+    Netherlands. A lookup visits O(log n) nodes.
+    """
+
+    def __init__(self, stations: Sequence[StationObservation]) -> None:
+        """Build the tree."""
+        self.stations = list(stations)
+        mean_latitude = (
+            sum(station.latitude for station in self.stations) / len(self.stations)
+            if self.stations
+            else 0.0
+        )
+        self._cos_lat = math.cos(math.radians(mean_latitude))
+        self._points = [self._project(station.latitude, station.longitude) for station in self.stations]
+        # Per node: station index, split axis, left child, right child (-1 = none)
+        self._nodes: list[list[int]] = []
+        self._root = self._build(list(range(len(self.stations))), 0)
+
+    def _project(self, latitude: float, longitude: float) -> tuple[float, float]:
+        """Return (east, north) in km."""
+        return longitude * _KM_PER_DEGREE * self._cos_lat, latitude * _KM_PER_DEGREE
+
+    def __len__(self) -> int:
+        """Return the number of indexed stations."""
+        return len(self.stations)
+
+    def _build(self, indices: list[int], depth: int) -> int:
+        """Build the subtree for indices and return its node number."""
+        if not indices:
+            return -1
+        axis = depth % 2
+        indices.sort(key=lambda index: self._points[index][axis])
+        middle = len(indices) // 2
+        node = len(self._nodes)
+        self._nodes.append([indices[middle], axis, -1, -1])
+        self._nodes[node][2] = self._build(indices[:middle], depth + 1)
+        self._nodes[node][3] = self._build(indices[middle + 1:], depth + 1)
+        return node
+
+    def nearest(self, latitude: float, longitude: float) -> tuple[StationObservation, float] | None:
+        """Return the nearest station and its distance in km, or None if empty."""
+        if self._root < 0:
+            return None
+        target = self._project(latitude, longitude)
+        points, nodes = self._points, self._nodes
+        best_index, best_squared = -1, math.inf
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node < 0:
+                continue
+            index, axis, left, right = nodes[node]
+            point = points[index]
+            dx = point[0] - target[0]
+            dy = point[1] - target[1]
+            squared = dx * dx + dy * dy
+            if squared < best_squared:
+                best_index, best_squared = index, squared
+            offset = target[axis] - point[axis]
+            near, far = (left, right) if offset < 0 else (right, left)
+            # The far side can only hold a closer station if the split plane is closer
+            if offset * offset < best_squared:
+                stack.append(far)
+            stack.append(near)
+        return self.stations[best_index], math.sqrt(best_squared)
+
+
+class KNMIObservationsClient:
+    """Download, cache and look up the latest KNMI station observations."""
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        api_key: str,
+        cache_dir: str,
+        files_endpoint: str = KNMI_STATIONS_ENDPOINT,
+    ) -> None:
+        """Initialize the client.
+
+        files_endpoint is the file listing of the dataset; it can point at a
+        local server for testing.
+        """
+        self.session = session
+        self.api_key = api_key
+        self.cache_dir = cache_dir
+        self.files_endpoint = files_endpoint.rstrip("/")
+        self.filename: str | None = None
+        self.index: StationIndex | None = None
+        self._checked_at: datetime | None = None
+        self._lock = asyncio.Lock()
+        self.download_count = 0
+        # None until checked; netCDF4 is optional and only needed for KNMI
+        self.available: bool | None = None
+
+    @property
+    def _headers(self) -> dict[str, str]:
+        """Return the authorization header of the Open Data API."""
+        return {"Authorization": self.api_key}
+
+    async def async_update(self, now: datetime | None = None) -> None:
+        """Make sure the latest observations are loaded.
+
+        Checks for a new file at most once per publication interval and
+        downloads only a file that is not on disk yet.
+        """
+        now = now or datetime.now(timezone.utc)
+        async with self._lock:
+            if self.available is None:
+                self.available = await asyncio.get_running_loop().run_in_executor(
+                    None, netcdf_available
+                )
+                if not self.available:
+                    _LOGGER.error(
+                        "KNMI observations need the netCDF4 package, which is not available; "
+                        "using the default weather instead"
+                    )
+            if not self.available:
+                return
+            if self._checked_at is not None and now - self._checked_at < PUBLICATION_INTERVAL:
+                return
+            self._checked_at = now
+            try:
+                if self.index is None:
+                    await self._async_load_cached()
+                filename = await self._async_latest_filename()
+                if filename is None or filename == self.filename:
+                    return
+                path = os.path.join(self.cache_dir, filename)
+                if not await asyncio.get_running_loop().run_in_executor(None, os.path.exists, path):
+                    await self._async_download(filename, path)
+                await self._async_load(path)
+            except asyncio.TimeoutError:
+                _LOGGER.error("Timeout while fetching KNMI observations")
+            except aiohttp.ClientError as err:
+                _LOGGER.error("Client error while fetching KNMI observations: %s", err)
+            except Exception as err:
+                _LOGGER.error("Unexpected error while fetching KNMI observations: %s", err)
+
+    async def _async_latest_filename(self) -> str | None:
+        """Return the name of the most recently published file."""
+        params = {"maxKeys": "1", "orderBy": "created", "sorting": "desc"}
+        async with async_timeout.timeout(REQUEST_TIMEOUT):
+            async with self.session.get(
+                self.files_endpoint, headers=self._headers, params=params
+            ) as response:
+                if response.status != 200:
+                    _LOGGER.error("KNMI API returned status %d for the file listing", response.status)
+                    return None
+                files = (await response.json()).get("files", [])
+        return files[0]["filename"] if files else None
+
+    async def _async_download(self, filename: str, path: str) -> None:
+        """Download a file to path via its temporary download URL."""
+        async with async_timeout.timeout(REQUEST_TIMEOUT):
+            async with self.session.get(
+                f"{self.files_endpoint}/{filename}/url", headers=self._headers
+            ) as response:
+                response.raise_for_status()
+                url = (await response.json())["temporaryDownloadUrl"]
+            async with self.session.get(url) as response:
+                response.raise_for_status()
+                content = await response.read()
+        self.download_count += 1
+        await asyncio.get_running_loop().run_in_executor(None, self._store, path, content)
+        _LOGGER.debug("Downloaded KNMI observations %s (%d bytes)", filename, len(content))
+
+    def _store(self, path: str, content: bytes) -> None:
+        """Write a downloaded file and remove older observation files."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        temporary = f"{path}.part"
+        with open(temporary, "wb") as file:
+            file.write(content)
+        os.replace(temporary, path)
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".nc") and name != os.path.basename(path):
+                os.remove(os.path.join(self.cache_dir, name))
+
+    def _latest_cached(self) -> str | None:
+        """Return the newest observation file on disk."""
+        if not os.path.isdir(self.cache_dir):
+            return None
+        # KNMI filenames end in the observation time, so they sort by time
+        names = sorted(name for name in os.listdir(self.cache_dir) if name.endswith(".nc"))
+        return names[-1] if names else None
+
+    async def _async_load_cached(self) -> None:
+        """Load the newest file on disk, e.g. after a restart."""
+        loop = asyncio.get_running_loop()
+        filename = await loop.run_in_executor(None, self._latest_cached)
+        if filename is not None:
+            await self._async_load(os.path.join(self.cache_dir, filename))
+
+    async def _async_load(self, path: str) -> None:
+        """Parse a file and replace the station index."""
+        stations = await asyncio.get_running_loop().run_in_executor(None, parse_observations, path)
+        self.index = StationIndex([station for station in stations if station.has_wind])
+        self.filename = os.path.basename(path)
+        _LOGGER.debug("Loaded %d KNMI stations with wind from %s", len(self.index), self.filename)
+
+    def nearest(self, latitude: float, longitude: float) -> tuple[StationObservation, float] | None:
+        """Return the nearest station with wind data and its distance in km."""
+        if self.index is None:
+            return None
+        return self.index.nearest(latitude, longitude)
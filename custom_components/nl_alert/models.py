@@ -0,0 +1,162 @@
+"""Data models for the NL-Alert integration."""
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timezone
+from typing import Any
+
+from .const import SEVERITY_EXTREME, SEVERITY_MINOR, SEVERITY_MODERATE, SEVERITY_SEVERE
+
+_LOGGER = logging.getLogger(__name__)
+
+_SEVERITIES = {
+    severity.lower(): severity
+    for severity in (SEVERITY_MINOR, SEVERITY_MODERATE, SEVERITY_SEVERE, SEVERITY_EXTREME)
+}
+
+
+def _first(value: Any) -> dict[str, Any]:
+    """Return the first element of a CAP list field, or the field if it is a dict."""
+    if isinstance(value, list):
+        return value[0] if value and isinstance(value[0], dict) else {}
+    if isinstance(value, dict):
+        return value
+    return {}
+
+
+def parse_timestamp(value: str | None) -> datetime | None:
+    """Parse an ISO 8601 timestamp; naive values are taken as UTC."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (ValueError, TypeError, AttributeError) as err:
+        _LOGGER.warning("Error parsing alert timestamp %s: %s", value, err)
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+# stored_at is written as datetime.now().isoformat(): naive local time, so
+# values of the same format sort as text in time order
+def parse_stored_at(value: str | None) -> datetime | None:
+    """Parse a stored_at value; naive values are taken as local time."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (ValueError, TypeError):
+        return None
+    return parsed.astimezone() if parsed.tzinfo is None else parsed
+
+
+def format_stored_at(moment: datetime) -> str:
+    """Return an aware datetime in the stored_at format, for text comparisons."""
+    return moment.astimezone().replace(tzinfo=None).isoformat()
+
+
+class Alert:
+    """Compact NL-Alert record, parsed once from the CAP JSON structure."""
+
+    __slots__ = (
+        "identifier",
+        "severity",
+        "headline",
+        "description",
+        "area_desc",
+        "polygon",
+        "circle",
+        "sent",
+        "expires",
+        "sent_at",
+        "expires_at",
+        "stored_at",
+        "geometry",
+    )
+
+    def __init__(
+        self,
+        identifier: str | None,
+        severity: str,
+        headline: str,
+        description: str,
+        area_desc: str,
+        polygon: str | None = None,
+        circle: str | None = None,
+        sent: str | None = None,
+        expires: str | None = None,
+        stored_at: str | None = None,
+    ) -> None:
+        """Initialize the alert record."""
+        self.identifier = identifier
+        self.severity = severity
+        self.headline = headline
+        self.description = description
+        self.area_desc = area_desc
+        self.polygon = polygon
+        self.circle = circle
+        self.sent = sent
+        self.expires = expires
+        self.sent_at = parse_timestamp(sent)
+        self.expires_at = parse_timestamp(expires)
+        self.stored_at = stored_at
+        # Parsed area, filled in lazily by geometry.GeometryCache
+        self.geometry = None
+
+    @classmethod
+    def from_dict(cls, alert: dict[str, Any]) -> Alert:
+        """Build a record from a CAP alert dict (info and area may be list or dict)."""
+        info = _first(alert.get("info"))
+        area = _first(info.get("area"))
+        severity = info.get("severity") or "Unknown"
+        return cls(
+            identifier=alert.get("identifier"),
+            severity=_SEVERITIES.get(str(severity).lower(), severity),
+            headline=info.get("headline") or "",
+            description=info.get("description") or "",
+            area_desc=area.get("areaDesc") or "",
+            polygon=area.get("polygon") or None,
+            circle=area.get("circle") or None,
+            sent=alert.get("sent"),
+            expires=alert.get("expires"),
+            stored_at=alert.get("stored_at"),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the record in CAP shape, as accepted by from_dict."""
+        area: dict[str, Any] = {"areaDesc": self.area_desc}
+        if self.polygon:
+            area["polygon"] = self.polygon
+        if self.circle:
+            area["circle"] = self.circle
+        return {
+            "identifier": self.identifier,
+            "sent": self.sent,
+            "expires": self.expires,
+            "stored_at": self.stored_at,
+            "info": [{
+                "severity": self.severity,
+                "headline": self.headline,
+                "description": self.description,
+                "area": [area],
+            }],
+        }
+
+    def is_active(self, now: datetime) -> bool:
+        """Return True if the alert has not expired at now (aware datetime)."""
+        return self.expires_at is None or self.expires_at > now
+
+    @property
+    def retention_time(self) -> datetime | None:
+        """Return the time retention counts from: sent, else when it was archived."""
+        return self.sent_at or parse_stored_at(self.stored_at)
+
+    @property
+    def is_severe(self) -> bool:
+        """Return True for Severe and Extreme alerts."""
+        return self.severity in (SEVERITY_SEVERE, SEVERITY_EXTREME)
+
+    def __repr__(self) -> str:
+        """Return a short representation for logging."""
+        return f"Alert({self.identifier!r}, {self.severity!r}, {self.headline[:40]!r})"
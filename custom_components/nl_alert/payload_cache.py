@@ -0,0 +1,63 @@
+"""Entity payloads derived once per version of the coordinator data."""
+from __future__ import annotations
+
+from typing import Any, Callable, TypeVar
+
+_T = TypeVar("_T")
+
+
+class PayloadCache:
+    """Derived entity attributes and texts, shared by all entities.
+
+    Every coordinator update writes the state of every entity, but most
+    updates (304 feeds, weather-only recomputes) pass the same archive,
+    alert list and danger dicts on unchanged. A payload is keyed by the
+    objects it is derived from, compared by identity: it is rebuilt only
+    when the coordinator replaced one of them. The coordinator and the
+    services always assign new objects instead of changing them in place.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty cache."""
+        # Payload name -> (source objects, payload)
+        self._entries: dict[str, tuple[tuple[Any, ...], Any]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        """Return the number of cached payloads."""
+        return len(self._entries)
+
+    def get(self, name: str, sources: tuple[Any, ...], build: Callable[[], _T]) -> _T:
+        """Return the payload for sources, building it if they changed.
+
+        The returned value is shared and must not be modified.
+        """
+        entry = self._entries.get(name)
+        if (
+            entry is not None
+            and len(entry[0]) == len(sources)
+            and all(cached is source for cached, source in zip(entry[0], sources))
+        ):
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        payload = build()
+        # The sources are kept alive, so their ids cannot be reused
+        self._entries[name] = (sources, payload)
+        return payload
+
+    @property
+    def stats(self) -> dict[str, int | float]:
+        """Return hit and miss counters."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+    def clear(self) -> None:
+        """Forget all payloads."""
+        self._entries.clear()
@@ -0,0 +1,126 @@
+"""Memoized plume risk results keyed by quantized incident, receptor and weather state."""
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Any, Iterable
+
+# Maximum number of results kept and how long one stays valid (seconds)
+CACHE_SIZE = 256
+CACHE_TTL = 900.0
+
+# Quantization of the key; inputs within one step share a result.
+# 4 decimals is ~11 m latitude, 1 degree of wind direction moves the plume
+# axis ~17 m per km downwind
+COORDINATE_DECIMALS = 4
+DIRECTION_STEP = 1.0
+SPEED_STEP = 0.5
+
+
+class RiskCache:
+    """LRU cache with a time-to-live in front of the dispersion model.
+
+    Between polls the incidents, the home location and the weather usually
+    stay the same, so the previous result can be reused. Keys are quantized;
+    the steps trade accuracy for hit rate and the hit and miss counters show
+    how well a setting works.
+    """
+
+    def __init__(
+        self,
+        max_size: int = CACHE_SIZE,
+        ttl: float = CACHE_TTL,
+        coordinate_decimals: int = COORDINATE_DECIMALS,
+        direction_step: float = DIRECTION_STEP,
+        speed_step: float = SPEED_STEP,
+    ) -> None:
+        """Initialize an empty cache."""
+        self.max_size = max_size
+        self.ttl = ttl
+        self.coordinate_decimals = coordinate_decimals
+        self.direction_step = direction_step
+        self.speed_step = speed_step
+        self._cache: OrderedDict[tuple, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        """Return the number of cached results."""
+        return len(self._cache)
+
+    def _coordinate(self, value: float) -> float:
+        """Quantize a latitude or longitude."""
+        return round(float(value), self.coordinate_decimals)
+
+    def make_key(
+        self,
+        model: str,
+        receptor: tuple[float, float],
+        incident_lats: Iterable[float],
+        incident_lons: Iterable[float],
+        wind_direction: float,
+        wind_speed: float,
+        stability_class: str,
+        *extra: Any,
+    ) -> tuple:
+        """Return the cache key of one evaluation.
+
+        extra holds further hashable parameters of the model (e.g. ensemble
+        size and spreads). The incident order is kept, since results are
+        reported per incident.
+        """
+        direction = round(float(wind_direction) / self.direction_step) * self.direction_step % 360
+        speed = round(float(wind_speed) / self.speed_step) * self.speed_step
+        return (
+            model,
+            self._coordinate(receptor[0]),
+            self._coordinate(receptor[1]),
+            tuple(self._coordinate(lat) for lat in incident_lats),
+            tuple(self._coordinate(lon) for lon in incident_lons),
+            direction,
+            speed,
+            stability_class,
+            *extra,
+        )
+
+    def get(self, key: tuple, now: float | None = None) -> Any | None:
+        """Return the cached result for key, or None if absent or expired."""
+        now = time.monotonic() if now is None else now
+        entry = self._cache.get(key)
+        if entry is not None:
+            stored_at, value = entry
+            if now - stored_at <= self.ttl:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._cache[key]
+            self.expired += 1
+        self.misses += 1
+        return None
+
+    def put(self, key: tuple, value: Any, now: float | None = None) -> None:
+        """Store a result, evicting the least recently used beyond max_size."""
+        self._cache[key] = (time.monotonic() if now is None else now, value)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all cached results; the counters are kept."""
+        self._cache.clear()
+
+    @property
+    def stats(self) -> dict[str, int | float]:
+        """Return hit/miss statistics."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "evictions": self.evictions,
+            "size": len(self._cache),
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
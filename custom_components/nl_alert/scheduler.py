@@ -0,0 +1,56 @@
+"""Adaptive polling interval for the NL-Alert coordinator."""
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta
+
+# Na een wijziging in de feed blijven we dit lang snel pollen
+RECENT_CHANGE_WINDOW = timedelta(minutes=15)
+BACKOFF_FACTOR = 2.0
+JITTER_FRACTION = 0.1
+
+
+class AdaptivePollScheduler:
+    """Poll fast while alerts are severe or changing, back off when quiet.
+
+    While a severe or hazardous alert is active, or the feed changed within
+    RECENT_CHANGE_WINDOW, the interval is the minimum. Otherwise each quiet
+    poll multiplies it by BACKOFF_FACTOR up to the maximum. A random jitter
+    of +/- JITTER_FRACTION spreads polls of many installations.
+    """
+
+    def __init__(
+        self,
+        base_interval: float,
+        min_interval: float,
+        max_interval: float,
+        jitter: float = JITTER_FRACTION,
+    ) -> None:
+        """Initialize the scheduler; intervals are in seconds."""
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.jitter = jitter
+        self._interval = min(max(base_interval, self.min_interval), self.max_interval)
+        self._last_change: datetime | None = None
+        self.current = self._interval
+
+    def next_interval(self, now: datetime, urgent: bool, changed: bool) -> timedelta:
+        """Return the interval until the next poll.
+
+        urgent: severe or hazardous alerts are active.
+        changed: the alert set changed on this poll.
+        """
+        if changed:
+            self._last_change = now
+        recently_changed = (
+            self._last_change is not None and now - self._last_change < RECENT_CHANGE_WINDOW
+        )
+
+        if urgent or recently_changed:
+            self._interval = self.min_interval
+        else:
+            self._interval = min(self._interval * BACKOFF_FACTOR, self.max_interval)
+
+        jittered = self._interval * (1 + random.uniform(-self.jitter, self.jitter))
+        self.current = min(max(jittered, self.min_interval), self.max_interval)
+        return timedelta(seconds=self.current)
@@ -58,6 +58,31 @@ SENSOR_DESCRIPTIONS = [
     ),
 ]
 
+COMPASS_DIRECTIONS = (
+    "N", "NNO", "NO", "ONO", "O", "OZO", "ZO", "ZZO",
+    "Z", "ZZW", "ZW", "WZW", "W", "WNW", "NW", "NNW",
+)
+
+
+def _direction_to_compass(bearing: float) -> str:
+    """Convert bearing to Dutch compass direction."""
+    return COMPASS_DIRECTIONS[round(bearing / 22.5) % 16]
+
+
+# De acht hoofdsectoren van het kompas veranderen nooit
+COMPASS_SECTORS = [
+    {"direction": i * 45, "label": _direction_to_compass(i * 45)}
+    for i in range(8)
+]
+
+# Alleen met een risicoverwachting (optie forecast_timeline en een weer entiteit)
+FORECAST_SENSOR_DESCRIPTION = SensorEntityDescription(
+    key="risk_forecast",
+    name="📈 Pluim Risico Verwachting",
+    icon="mdi:chart-timeline-variant",
+    native_unit_of_measurement="%",
+)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -83,6 +108,8 @@ async def async_setup_entry(
         sensor = NLAlertSensor(coordinator, description)
         entities.append(sensor)
         _LOGGER.debug("Creating sensor: %s (%s)", description.name, description.key)
+    if coordinator.forecast_timeline is not None:
+        entities.append(NLAlertSensor(coordinator, FORECAST_SENSOR_DESCRIPTION))
     
     _LOGGER.info("Adding %d NL-Alert sensors", len(entities))
     try:
@@ -132,6 +159,9 @@ class NLAlertSensor(CoordinatorEntity, SensorEntity):
         elif self.entity_description.key == "danger_compass":
             home_danger = self.coordinator.data.get("home_danger", {})
             value = home_danger.get("risk_percentage", 0)
+        elif self.entity_description.key == "risk_forecast":
+            # Hoogste verwachte risico over de verwachtingsperiode
+            value = self.coordinator.data.get("risk_forecast", {}).get("peak_risk_percentage", 0)
         else:
             return None
             
@@ -144,104 +174,134 @@ class NLAlertSensor(CoordinatorEntity, SensorEntity):
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return additional state attributes."""
+        # Afgeleide attributen eenmaal per nieuwe brondata bouwen, gedeeld door alle entiteiten
+        payload_cache = self.coordinator.payload_cache
         if self.entity_description.key == "historical_alerts":
             historical_alerts = self.coordinator.data.get("historical_alerts", [])
-            
-            # Extract and flatten alert data from nested info structure
-            formatted_alerts = []
-            for alert in historical_alerts[-10:]:  # Last 10 for attributes
-                # Extract info data (can be list or dict)
-                info_data = {}
-                if isinstance(alert.get("info"), list) and len(alert["info"]) > 0:
-                    info_data = alert["info"][0]
-                elif isinstance(alert.get("info"), dict):
-                    info_data = alert["info"]
-                
-                # Extract area description
-                area_desc = ""
-                if isinstance(info_data.get("area"), list) and len(info_data["area"]) > 0:
-                    area_desc = info_data["area"][0].get("areaDesc", "")
-                elif isinstance(info_data.get("area"), dict):
-                    area_desc = info_data["area"].get("areaDesc", "")
-                
-                formatted_alerts.append({
-                    "id": alert.get("identifier"),
-                    "ernst": info_data.get("severity"),
-                    "gebied": area_desc,
-                    "beschrijving": info_data.get("headline"),
-                    "verstuurd": alert.get("sent"),
-                    "geldig_tot": alert.get("expires"),
-                })
-            
-            return {
-                "historische_meldingen": formatted_alerts,
-                "totaal_aantal": len(historical_alerts),
-            }
+            return payload_cache.get(
+                "historical_alerts",
+                (historical_alerts,),
+                lambda: self._historical_alerts_attributes(historical_alerts),
+            )
         elif self.entity_description.key == "danger_compass":
             home_danger = self.coordinator.data.get("home_danger", {})
             weather_data = self.coordinator.data.get("weather_data", {})
-            
-            # Create compass visualization data
-            risk_percentage = home_danger.get("risk_percentage", 0)
-            wind_direction = weather_data.get("wind_direction", 0)
-            plume_direction = home_danger.get("plume_direction", 0)
-            
+            compass = payload_cache.get(
+                "danger_compass",
+                (home_danger, weather_data),
+                lambda: self._danger_compass_attributes(home_danger, weather_data),
+            )
+            # Statistieken veranderen elke update en zitten dus niet in de cache
             return {
-                "status": home_danger.get("status", "safe"),
-                "in_danger": home_danger.get("in_danger", False),
-                "risk_percentage": risk_percentage,
-                "distance_km": home_danger.get("distance_km", 0),
-                "wind_direction": wind_direction,
-                "wind_direction_text": self._direction_to_compass(wind_direction),
-                "plume_direction": plume_direction,
-                "plume_direction_text": self._direction_to_compass(plume_direction),
-                "alert_headline": home_danger.get("alert_headline", ""),
-                "message": home_danger.get("message", "Geen gevaar gedetecteerd"),
-                "concentration": home_danger.get("concentration", 0),
-                "wind_speed": weather_data.get("wind_speed", 0),
-                "temperature": weather_data.get("temperature", 0),
-                # Compass visualization data
-                "compass_data": self._create_compass_visualization(home_danger, weather_data),
-                "risk_color": self._get_risk_color(risk_percentage),
-                "risk_level": self._get_risk_level(risk_percentage),
+                **compass,
+                "risk_cache_stats": self.coordinator.data.get("risk_cache_stats"),
+                "entity_cache_stats": payload_cache.stats,
             }
+        elif self.entity_description.key == "risk_forecast":
+            risk_forecast = self.coordinator.data.get("risk_forecast", {})
+            return payload_cache.get(
+                "risk_forecast",
+                (risk_forecast,),
+                lambda: self._risk_forecast_attributes(risk_forecast),
+            )
         
         alerts = self.coordinator.data.get("alerts", [])
-        if not alerts:
-            return {}
+        attributes = {}
+        if alerts:
+            # Return info about the most recent alert
+            attributes = payload_cache.get(
+                "latest_alert", (alerts,), lambda: self._latest_alert_attributes(alerts)
+            )
         
-        # Return info about the most recent alert
-        latest_alert = alerts[0] if alerts else {}
-        
-        # Extract info data (can be list or dict)
-        info_data = {}
-        if isinstance(latest_alert.get("info"), list) and len(latest_alert["info"]) > 0:
-            info_data = latest_alert["info"][0]
-        elif isinstance(latest_alert.get("info"), dict):
-            info_data = latest_alert["info"]
+        if self.entity_description.key == "alert_count":
+            # Diagnostiek verandert elke update en zit dus niet in de cache
+            return {
+                **attributes,
+                "fetch_stats": self.coordinator.data.get("fetch_stats"),
+                # Huidige (adaptieve) poll-interval in seconden
+                "update_interval": self.coordinator.data.get("update_interval"),
+            }
+        if self.entity_description.key == "severe_alerts":
+            # Telling per ernst en per gevarencategorie uit de aggregatie van deze refresh
+            return {
+                **attributes,
+                "severity_counts": self.coordinator.data.get("severity_counts", {}),
+                "hazard_counts": self.coordinator.data.get("hazard_counts", {}),
+            }
+        return attributes
+
+    def _historical_alerts_attributes(self, historical_alerts: list) -> dict[str, Any]:
+        """Build the attributes of the archive sensor."""
+        # Extract and flatten alert data from nested info structure
+        formatted_alerts = []
+        for alert in historical_alerts[-10:]:  # Last 10 for attributes
+            formatted_alerts.append({
+                "id": alert.identifier,
+                "ernst": alert.severity,
+                "gebied": alert.area_desc,
+                "beschrijving": alert.headline,
+                "verstuurd": alert.sent,
+                "geldig_tot": alert.expires,
+            })
         
-        # Extract area description
-        area_desc = ""
-        if isinstance(info_data.get("area"), list) and len(info_data["area"]) > 0:
-            area_desc = info_data["area"][0].get("areaDesc", "")
-        elif isinstance(info_data.get("area"), dict):
-            area_desc = info_data["area"].get("areaDesc", "")
+        return {
+            "historische_meldingen": formatted_alerts,
+            "totaal_aantal": len(historical_alerts),
+        }
+
+    def _danger_compass_attributes(self, home_danger: dict, weather_data: dict) -> dict[str, Any]:
+        """Build the attributes of the danger compass, without statistics."""
+        # Create compass visualization data
+        risk_percentage = home_danger.get("risk_percentage", 0)
+        wind_direction = weather_data.get("wind_direction", 0)
+        plume_direction = home_danger.get("plume_direction", 0)
         
         return {
-            ATTR_ALERT_ID: latest_alert.get("identifier"),
-            ATTR_SEVERITY: info_data.get("severity"),
-            ATTR_AREAS: area_desc,
-            ATTR_DESCRIPTION: info_data.get("headline"),
+            "status": home_danger.get("status", "safe"),
+            "in_danger": home_danger.get("in_danger", False),
+            "risk_percentage": risk_percentage,
+            "distance_km": home_danger.get("distance_km", 0),
+            "wind_direction": wind_direction,
+            "wind_direction_text": _direction_to_compass(wind_direction),
+            "plume_direction": plume_direction,
+            "plume_direction_text": _direction_to_compass(plume_direction),
+            "alert_headline": home_danger.get("alert_headline", ""),
+            "message": home_danger.get("message", "Geen gevaar gedetecteerd"),
+            "concentration": home_danger.get("concentration", 0),
+            "incident_count": home_danger.get("incident_count", 0),
+            "dominant_alert_id": home_danger.get("dominant_alert_id"),
+            "contributions": home_danger.get("contributions", []),
+            "ensemble": home_danger.get("ensemble"),
+            "wind_speed": weather_data.get("wind_speed", 0),
+            "temperature": weather_data.get("temperature", 0),
+            # Compass visualization data
+            "compass_data": self._create_compass_visualization(home_danger, weather_data),
+            "risk_color": self._get_risk_color(risk_percentage),
+            "risk_level": self._get_risk_level(risk_percentage),
+        }
+
+    def _risk_forecast_attributes(self, risk_forecast: dict) -> dict[str, Any]:
+        """Build the attributes of the forecast sensor."""
+        peak_risk = risk_forecast.get("peak_risk_percentage", 0)
+        return {
+            "timeline": risk_forecast.get("timeline", []),
+            "peak_time": risk_forecast.get("peak_time"),
+            "peak_risk_level": self._get_risk_level(peak_risk),
+            "peak_risk_color": self._get_risk_color(peak_risk),
+            "forecast_stats": risk_forecast.get("stats"),
         }
 
-    def _direction_to_compass(self, bearing: float) -> str:
-        """Convert bearing to Dutch compass direction."""
-        directions = ["N", "NNO", "NO", "ONO", "O", "OZO", "ZO", "ZZO",
-                     "Z", "ZZW", "ZW", "WZW", "W", "WNW", "NW", "NNW"]
+    def _latest_alert_attributes(self, alerts: list) -> dict[str, Any]:
+        """Build the attributes describing the most recent alert."""
+        latest_alert = alerts[0]
         
-        index = round(bearing / 22.5) % 16
-        return directions[index]
-    
+        return {
+            ATTR_ALERT_ID: latest_alert.identifier,
+            ATTR_SEVERITY: latest_alert.severity,
+            ATTR_AREAS: latest_alert.area_desc,
+            ATTR_DESCRIPTION: latest_alert.headline,
+        }
+
     def _create_compass_visualization(self, danger_data: dict, weather_data: dict) -> dict:
         """Create compass visualization data for frontend."""
         return {
@@ -249,15 +309,23 @@ class NLAlertSensor(CoordinatorEntity, SensorEntity):
             "wind_arrow": weather_data.get("wind_direction", 0),
             "danger_sector": {
                 "direction": danger_data.get("plume_direction", 0),
-                "width": min(60, max(10, danger_data.get("risk_percentage", 0) * 2)),  # Sector width based on risk
+                "width": self._sector_width(danger_data, weather_data),
                 "intensity": danger_data.get("risk_percentage", 0) / 100,
             },
-            "sectors": [
-                {"direction": i * 45, "label": self._direction_to_compass(i * 45)} 
-                for i in range(8)
-            ]
+            "sectors": COMPASS_SECTORS,
         }
     
+    def _sector_width(self, danger_data: dict, weather_data: dict) -> float:
+        """Get the danger sector width in degrees.
+
+        With wind sensors the sector covers two circular standard deviations
+        of the measured direction, otherwise it scales with the risk.
+        """
+        direction_std = weather_data.get("wind_direction_std")
+        if direction_std is not None:
+            return min(90, max(10, 2 * direction_std))
+        return min(60, max(10, danger_data.get("risk_percentage", 0) * 2))  # Sector width based on risk
+    
     def _get_risk_color(self, risk_percentage: float) -> str:
         """Get color based on risk percentage."""
         if risk_percentage >= 75:
@@ -287,39 +355,32 @@ class NLAlertSensor(CoordinatorEntity, SensorEntity):
     def _format_historical_alerts_text(self) -> str:
         """Format historical alerts as readable text."""
         historical_alerts = self.coordinator.data.get("historical_alerts", [])
-        
-        if not historical_alerts:
-            return "Geen historische meldingen beschikbaar"
-        
-        # Format last 10 alerts as text
-        text_lines = [f"Historische Meldingen ({len(historical_alerts)} totaal):", ""]
-        
-        for idx, alert in enumerate(historical_alerts[-10:], 1):  # Last 10 alerts
-            # Extract info data (can be list or dict)
-            info_data = {}
-            if isinstance(alert.get("info"), list) and len(alert["info"]) > 0:
-                info_data = alert["info"][0]
-            elif isinstance(alert.get("info"), dict):
-                info_data = alert["info"]
-            
-            # Extract area description
-            area_desc = ""
-            if isinstance(info_data.get("area"), list) and len(info_data["area"]) > 0:
-                area_desc = info_data["area"][0].get("areaDesc", "Onbekend gebied")
-            elif isinstance(info_data.get("area"), dict):
-                area_desc = info_data["area"].get("areaDesc", "Onbekend gebied")
-            
-            # Format alert information
-            headline = info_data.get("headline", "Geen beschrijving")
-            severity = info_data.get("severity", "Onbekend")
-            sent = alert.get("sent", "Onbekende datum")
-            
-            # Add formatted alert to text
-            text_lines.append(f"{idx}. {headline}")
-            text_lines.append(f"   Ernst: {severity} | Gebied: {area_desc}")
-            text_lines.append(f"   Verstuurd: {sent}")
-            text_lines.append("")
-        
-        return "\n".join(text_lines)
+        return self.coordinator.payload_cache.get(
+            "historical_alerts_text",
+            (historical_alerts,),
+            lambda: _historical_alerts_text(historical_alerts),
+        )
 
 
+def _historical_alerts_text(historical_alerts: list) -> str:
+    """Format the last 10 historical alerts as readable text."""
+    if not historical_alerts:
+        return "Geen historische meldingen beschikbaar"
+    
+    # Format last 10 alerts as text
+    text_lines = [f"Historische Meldingen ({len(historical_alerts)} totaal):", ""]
+    
+    for idx, alert in enumerate(historical_alerts[-10:], 1):  # Last 10 alerts
+        # Format alert information
+        area_desc = alert.area_desc or "Onbekend gebied"
+        headline = alert.headline or "Geen beschrijving"
+        severity = alert.severity if alert.severity != "Unknown" else "Onbekend"
+        sent = alert.sent or "Onbekende datum"
+        
+        # Add formatted alert to text
+        text_lines.append(f"{idx}. {headline}")
+        text_lines.append(f"   Ernst: {severity} | Gebied: {area_desc}")
+        text_lines.append(f"   Verstuurd: {sent}")
+        text_lines.append("")
+    
+    return "\n".join(text_lines)
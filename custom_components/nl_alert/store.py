@@ -0,0 +1,174 @@
+"""Persistent storage of the NL-Alert incident archive."""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import sqlite3
+from datetime import datetime
+
+from homeassistant.core import HomeAssistant
+
+from .models import Alert, format_stored_at
+
+_LOGGER = logging.getLogger(__name__)
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS alerts (
+        identifier TEXT PRIMARY KEY,
+        sent_ts REAL,
+        severity TEXT,
+        stored_at TEXT,
+        payload TEXT NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_alerts_sent_ts ON alerts (sent_ts)",
+    "CREATE INDEX IF NOT EXISTS idx_alerts_severity ON alerts (severity)",
+    # Retention of alerts without a sent time
+    "CREATE INDEX IF NOT EXISTS idx_alerts_stored_at ON alerts (stored_at)",
+)
+
+
+class AlertHistoryStore:
+    """SQLite-backed archive of historical alerts.
+
+    All database work runs in the executor. New alerts are queued and
+    written in one transaction per flush.
+    """
+
+    def __init__(self, hass: HomeAssistant, path: str) -> None:
+        """Initialize the store."""
+        self.hass = hass
+        self.path = path
+        self._conn: sqlite3.Connection | None = None
+        self._pending: dict[str, Alert] = {}
+        # Serializes executor jobs on the shared connection
+        self._lock = asyncio.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database and create the schema if needed."""
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            with conn:
+                for statement in _SCHEMA:
+                    conn.execute(statement)
+            self._conn = conn
+        return self._conn
+
+    def queue(self, alert: Alert) -> None:
+        """Queue an alert for the next flush."""
+        if alert.identifier:
+            self._pending[alert.identifier] = alert
+
+    @property
+    def has_pending(self) -> bool:
+        """Return True if alerts are waiting to be written."""
+        return bool(self._pending)
+
+    async def async_flush(self) -> None:
+        """Write all queued alerts in one batch."""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        rows = [
+            (
+                alert.identifier,
+                alert.sent_at.timestamp() if alert.sent_at else None,
+                alert.severity,
+                alert.stored_at,
+                json.dumps(alert.to_dict()),
+            )
+            for alert in pending.values()
+        ]
+        async with self._lock:
+            try:
+                await self.hass.async_add_executor_job(self._write, rows)
+            except sqlite3.Error as err:
+                _LOGGER.error("Error writing %d alerts to history store: %s", len(rows), err)
+
+    def _write(self, rows: list[tuple]) -> None:
+        """Insert or update rows in a single transaction.
+
+        An alert that is already stored keeps its stored_at, also when it is
+        archived again before the stored archive was loaded.
+        """
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                "INSERT INTO alerts "
+                "(identifier, sent_ts, severity, stored_at, payload) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(identifier) DO UPDATE SET "
+                "sent_ts = excluded.sent_ts, severity = excluded.severity, payload = excluded.payload",
+                rows,
+            )
+
+    async def async_load(self, limit: int, since: datetime) -> list[Alert]:
+        """Load the newest alerts sent after since, oldest first."""
+        async with self._lock:
+            try:
+                rows = await self.hass.async_add_executor_job(
+                    self._read, limit, since.timestamp(), format_stored_at(since)
+                )
+            except sqlite3.Error as err:
+                _LOGGER.error("Error loading history store: %s", err)
+                return []
+        alerts = []
+        for payload, stored_at in reversed(rows):
+            alert = Alert.from_dict(json.loads(payload))
+            # The column keeps the first stored_at, the payload the latest
+            alert.stored_at = stored_at
+            alerts.append(alert)
+        return alerts
+
+    def _read(self, limit: int, since_ts: float, since_stored_at: str) -> list[tuple[str, str | None]]:
+        """Return (payload, stored_at) of the newest rows, newest first."""
+        cursor = self._connect().execute(
+            "SELECT payload, stored_at FROM alerts WHERE sent_ts >= ? "
+            "OR (sent_ts IS NULL AND (stored_at IS NULL OR stored_at >= ?)) "
+            "ORDER BY sent_ts DESC LIMIT ?",
+            (since_ts, since_stored_at, limit),
+        )
+        return list(cursor)
+
+    async def async_prune(self, cutoff: datetime) -> None:
+        """Delete alerts sent before cutoff; without a sent time, stored before it."""
+        async with self._lock:
+            try:
+                deleted = await self.hass.async_add_executor_job(
+                    self._prune, cutoff.timestamp(), format_stored_at(cutoff)
+                )
+            except sqlite3.Error as err:
+                _LOGGER.error("Error pruning history store: %s", err)
+                return
+        if deleted:
+            _LOGGER.debug("Removed %d alerts past retention from history store", deleted)
+
+    def _prune(self, cutoff_ts: float, cutoff_stored_at: str) -> int:
+        """Delete rows older than the cutoff using the sent_ts and stored_at indexes."""
+        conn = self._connect()
+        with conn:
+            return conn.execute(
+                "DELETE FROM alerts WHERE sent_ts < ? OR (sent_ts IS NULL AND stored_at < ?)",
+                (cutoff_ts, cutoff_stored_at),
+            ).rowcount
+
+    async def async_clear(self) -> None:
+        """Delete all stored alerts."""
+        self._pending.clear()
+        async with self._lock:
+            await self.hass.async_add_executor_job(self._clear)
+
+    def _clear(self) -> None:
+        """Delete all rows."""
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM alerts")
+
+    async def async_close(self) -> None:
+        """Flush queued alerts and close the database."""
+        await self.async_flush()
+        async with self._lock:
+            if self._conn is not None:
+                await self.hass.async_add_executor_job(self._conn.close)
+                self._conn = None
@@ -0,0 +1,182 @@
+"""Rolling fusion of wind speed, wind direction and temperature sensor readings.
+
+Instantaneous readings of a gusty wind make the plume direction jump around.
+WindFusion keeps the most recent samples of each sensor in a fixed-size
+ring buffer and maintains running sums, so the smoothed values are updated
+in O(1) per sample. Directions are averaged as unit vectors (circular mean).
+"""
+from __future__ import annotations
+
+import math
+from array import array
+from datetime import datetime, timedelta
+from typing import Any
+
+# Samples kept per sensor
+WINDOW_SIZE = 60
+# A sensor whose newest sample is older than this is ignored
+MAX_SAMPLE_AGE = timedelta(minutes=15)
+
+
+class RingBuffer:
+    """Fixed-size ring buffer of rows of floats with running column sums.
+
+    Rows live in one preallocated array; the oldest row is overwritten once
+    the buffer is full. Sums of the values and of their squares are updated
+    incrementally and recomputed from the array once per wrap-around, so
+    rounding errors do not build up.
+    """
+
+    def __init__(self, size: int, width: int = 1) -> None:
+        """Initialize an empty buffer of size rows of width values."""
+        self.size = size
+        self.width = width
+        self._values = array("d", bytes(8 * size * width))
+        self._sums = [0.0] * width
+        self._squares = [0.0] * width
+        self._next = 0
+        self.count = 0
+        self.updated_at: datetime | None = None
+
+    def __len__(self) -> int:
+        """Return the number of samples held."""
+        return self.count
+
+    def push(self, row: tuple[float, ...], now: datetime) -> None:
+        """Add a sample, replacing the oldest one when full."""
+        values, sums, squares = self._values, self._sums, self._squares
+        offset = self._next * self.width
+        full = self.count == self.size
+        for column, value in enumerate(row):
+            if full:
+                old = values[offset + column]
+                sums[column] -= old
+                squares[column] -= old * old
+            values[offset + column] = value
+            sums[column] += value
+            squares[column] += value * value
+        if not full:
+            self.count += 1
+        self._next += 1
+        if self._next == self.size:
+            self._next = 0
+            # Eens per ronde opnieuw optellen tegen afrondingsdrift
+            for column in range(self.width):
+                column_values = values[column::self.width]
+                sums[column] = math.fsum(column_values)
+                squares[column] = math.fsum(value * value for value in column_values)
+        self.updated_at = now
+
+    @property
+    def mean(self) -> list[float]:
+        """Return the mean of each column."""
+        count = max(self.count, 1)
+        return [total / count for total in self._sums]
+
+    @property
+    def variance(self) -> list[float]:
+        """Return the population variance of each column."""
+        count = max(self.count, 1)
+        return [
+            max(square / count - (total / count) ** 2, 0.0)
+            for total, square in zip(self._sums, self._squares)
+        ]
+
+    def is_fresh(self, now: datetime, max_age: timedelta) -> bool:
+        """Return True if the buffer holds a sample newer than max_age."""
+        return self.count > 0 and self.updated_at is not None and now - self.updated_at <= max_age
+
+
+class WindFusion:
+    """Smoothed wind and temperature from the readings of separate sensors."""
+
+    def __init__(self, size: int = WINDOW_SIZE, max_age: timedelta = MAX_SAMPLE_AGE) -> None:
+        """Initialize empty buffers."""
+        self.max_age = max_age
+        self._speed = RingBuffer(size)
+        # sin and cos of the direction
+        self._direction = RingBuffer(size, 2)
+        self._temperature = RingBuffer(size)
+
+    def add_speed(self, speed: float, now: datetime) -> None:
+        """Add a wind speed sample in m/s."""
+        self._speed.push((speed,), now)
+
+    def add_direction(self, direction: float, now: datetime) -> None:
+        """Add a wind direction sample in degrees (where the wind comes FROM)."""
+        radians = math.radians(direction)
+        self._direction.push((math.sin(radians), math.cos(radians)), now)
+
+    def add_temperature(self, temperature: float, now: datetime) -> None:
+        """Add a temperature sample in degrees Celsius."""
+        self._temperature.push((temperature,), now)
+
+    @property
+    def speed_mean(self) -> float | None:
+        """Return the mean wind speed, or None without samples."""
+        return self._speed.mean[0] if self._speed.count else None
+
+    @property
+    def speed_std(self) -> float | None:
+        """Return the standard deviation of the wind speed."""
+        return math.sqrt(self._speed.variance[0]) if self._speed.count else None
+
+    @property
+    def direction_mean(self) -> float | None:
+        """Return the circular mean direction in degrees, or None without samples."""
+        if not self._direction.count:
+            return None
+        sin_mean, cos_mean = self._direction.mean
+        return math.degrees(math.atan2(sin_mean, cos_mean)) % 360
+
+    @property
+    def direction_resultant(self) -> float | None:
+        """Return the mean resultant length R (1 = steady, 0 = no prevailing direction)."""
+        if not self._direction.count:
+            return None
+        sin_mean, cos_mean = self._direction.mean
+        return min(math.hypot(sin_mean, cos_mean), 1.0)
+
+    @property
+    def direction_std(self) -> float | None:
+        """Return the circular standard deviation sqrt(-2 ln R) in degrees."""
+        resultant = self.direction_resultant
+        if resultant is None:
+            return None
+        if resultant <= 1e-12:
+            # Geen overheersende richting: de spreiding is onbegrensd
+            return 180.0
+        return min(math.degrees(math.sqrt(-2.0 * math.log(resultant))), 180.0)
+
+    @property
+    def temperature_mean(self) -> float | None:
+        """Return the mean temperature, or None without samples."""
+        return self._temperature.mean[0] if self._temperature.count else None
+
+    def apply(self, weather_data: dict[str, Any], now: datetime) -> dict[str, Any]:
+        """Return weather_data with fresh sensor averages in place of its values.
+
+        Adds wind_direction_std and wind_speed_std when the corresponding
+        sensor has fresh samples; values without fresh samples are kept.
+        """
+        fused = dict(weather_data)
+        sources = []
+        if self._speed.is_fresh(now, self.max_age):
+            fused["wind_speed"] = self.speed_mean
+            fused["wind_speed_std"] = self.speed_std
+            sources.append("speed")
+        if self._direction.is_fresh(now, self.max_age):
+            fused["wind_direction"] = self.direction_mean
+            fused["wind_direction_std"] = self.direction_std
+            sources.append("direction")
+        if self._temperature.is_fresh(now, self.max_age):
+            fused["temperature"] = self.temperature_mean
+            sources.append("temperature")
+        if sources:
+            fused["sensor_samples"] = {
+                "speed": len(self._speed),
+                "direction": len(self._direction),
+                "temperature": len(self._temperature),
+            }
+            fused["source"] = f"{weather_data.get('source', 'default')}+sensors"
+        return fused